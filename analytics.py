@@ -0,0 +1,212 @@
+"""Spaltenweise Auswertung großer Simulations-Korpora (NumPy, .npy-Shards).
+
+sim() spielt Partien mit batchsim (trace=True) und schreibt je Shard eine
+Datei pro Spalte — keine Python-Objekte pro Partie, alles per np.load
+(mmap_mode="r") wieder einlesbar:
+
+    korpus/meta.json                 Spieler, Regeln, Shards, Spalten
+    korpus/shard-00000/g.<spalte>.npy   je Partie: winner, turns, reshuffles,
+                                        start_card, start_hands (N, P), max_pending
+    korpus/shard-00000/m.<spalte>.npy   je Zug: batchsim.MOVE_COLUMNS
+                                        (nach Partie und Zug sortiert)
+
+Die Abfragen laufen Shard für Shard über die gemappten Spalten und summieren
+nur Zählwerte (np.bincount) — der Speicherbedarf hängt an der Shardgröße,
+nicht an der Zahl der Partien.
+
+    python analytics.py sim korpus --games 10000000 --shard 500000
+    python analytics.py report korpus
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+
+from batchsim import BatchSim, MOVE_COLUMNS, popcount
+from engine import RANK_MASK, RANKS, SUITS, CARD_STR, R7, RJ, WISHES, strategy
+
+GAME_COLUMNS = ("winner", "turns", "reshuffles", "start_card", "start_hands", "max_pending")
+
+
+# ---------- Schreiben ----------
+def write_shard(task):
+    """Einen Shard simulieren und spaltenweise speichern. Gibt (Index, Partien, Züge) zurück."""
+    path, index, n, players, play_drawn, bots, seed = task
+    sim = BatchSim(n, seed=[seed, index], players=players, play_drawn=play_drawn,
+                   orders=[strategy(b)[0] for b in bots], wishes=[strategy(b)[1] for b in bots], trace=True)
+    res = sim.run()
+    moves = sim.moves()
+    shard = os.path.join(path, f"shard-{index:05d}")
+    os.makedirs(shard, exist_ok=True)
+    for k in GAME_COLUMNS:
+        np.save(os.path.join(shard, f"g.{k}.npy"), res[k])
+    for k, v in moves.items():
+        np.save(os.path.join(shard, f"m.{k}.npy"), v)
+    return index, n, len(moves["game"])
+
+def sim(path, games, shard=500_000, players=3, play_drawn=True, bots=None, seed=0, workers=None):
+    """Korpus anlegen (vorhandene Shards werden überschrieben). Gibt die Zahl der Züge zurück."""
+    bots = bots or ["heuristic"] * players
+    os.makedirs(path, exist_ok=True)
+    sizes = [min(shard, games - s) for s in range(0, games, shard)]
+    tasks = [(path, i, n, players, play_drawn, bots, seed) for i, n in enumerate(sizes)]
+    with mp.Pool(workers) as pool:
+        moves = sum(m for _, _, m in pool.imap_unordered(write_shard, tasks))
+    meta = {"players": players, "bots": bots, "play_drawn": play_drawn, "seed": seed,
+            "shards": len(sizes), "games": games, "moves": moves,
+            "game_columns": list(GAME_COLUMNS), "move_columns": list(MOVE_COLUMNS)}
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=1)
+    return moves
+
+
+# ---------- Lesen ----------
+class Corpus:
+    """Gemappte Spalten eines Korpus; reduce() fasst eine Abfrage über alle Shards zusammen."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.players = self.meta["players"]
+
+    def column(self, shard, name):
+        """'g.winner' oder 'm.card' eines Shards, read-only gemappt."""
+        return np.load(os.path.join(self.path, f"shard-{shard:05d}", f"{name}.npy"), mmap_mode="r")
+
+    def reduce(self, fn, *names):
+        """Summe von fn(*spalten) über alle Shards (fn liefert Zählwerte gleicher Form)."""
+        total = None
+        for s in range(self.meta["shards"]):
+            part = fn(*(self.column(s, n) for n in names))
+            total = part if total is None else total + part
+        return total
+
+
+# ---------- Abfragen ----------
+def counts(x, n):
+    return np.bincount(np.asarray(x, dtype=np.intp), minlength=n)[:n]
+
+def win_rate_by_seat(c):
+    """Siegquote je Sitz; letzter Eintrag = Patt."""
+    p = c.players
+    wins = c.reduce(lambda w: counts(np.where(w < 0, p, w), p + 1), "g.winner")
+    return wins / max(wins.sum(), 1)
+
+def win_rate_by_start_card(c):
+    """(32, P+1): Siegquoten je Startkarte (Zeilen ohne Partien = NaN)."""
+    p = c.players
+    table = c.reduce(lambda w, sc: counts(sc.astype(np.intp) * (p + 1) + np.where(w < 0, p, w),
+                                          32 * (p + 1)).reshape(32, p + 1),
+                     "g.winner", "g.start_card")
+    with np.errstate(invalid="ignore"):
+        return table / table.sum(axis=1, keepdims=True)
+
+def win_rate_by_hand(c, mask, max_count=8):
+    """Siegquote eines Sitzes nach Zahl der Startkarten in mask (z. B. RANK_MASK[RJ]),
+    über alle Sitze. → (Sitz-Partien je Anzahl, Siegquote je Anzahl)."""
+    def part(w, hands):
+        k = np.minimum(popcount(hands & np.uint32(mask)), max_count).astype(np.intp)
+        won = w[:, None] == np.arange(hands.shape[1])
+        return np.stack([counts(k.ravel(), max_count + 1), counts(k[won], max_count + 1)])
+    seats, wins = c.reduce(part, "g.winner", "g.start_hands")
+    with np.errstate(invalid="ignore"):
+        return seats, wins / seats
+
+def stack_depths(c, max_depth=16):
+    """Wie tief +2-Stapel werden: Verteilung der Stapeltiefe (Zahl der 7en), wenn
+    jemand die Strafkarten nimmt, und die höchste Tiefe je Partie."""
+    taken = c.reduce(lambda pend, card: counts(
+        pend[(pend > 0) & ((card < 0) | ((card & 7) != R7))] // 2, max_depth + 1),
+        "m.pending", "m.card")
+    per_game = c.reduce(lambda top: counts(np.minimum(top // 2, max_depth), max_depth + 1), "g.max_pending")
+    return taken, per_game
+
+def reshuffle_stats(c, max_count=16):
+    """Verteilung der Mischvorgänge je Partie (letzter Eintrag = max_count und mehr)."""
+    hist = c.reduce(lambda r: counts(np.minimum(r, max_count), max_count + 1), "g.reshuffles")
+    return hist, hist[1:].sum() / max(hist.sum(), 1)
+
+def wish_stats(c):
+    """Züge mit offenem Wunsch: (Anzahl, bedient mit Wunschfarbe, Bube drauf, gezogen), je Farbe."""
+    def part(wished, card):
+        on = wished >= 0
+        w, cd = wished[on].astype(np.intp), card[on]
+        honoured = (cd >= 0) & ((cd & 7) != RJ) & ((cd >> 3) == w)
+        jack = (cd >= 0) & ((cd & 7) == RJ)
+        return np.stack([counts(w, 4), counts(w[honoured], 4), counts(w[jack], 4), counts(w[cd < 0], 4)])
+    return c.reduce(part, "m.wished", "m.card")
+
+
+# ---------- CLI ----------
+def report(c):
+    m = c.meta
+    print(f"{m['games']:,} Partien · {m['moves']:,} Züge · {m['players']} Spieler · {m['shards']} Shards")
+    rates = win_rate_by_seat(c)
+    print("Siegquote:", " · ".join(f"Sitz {i} {r:.2%}" for i, r in enumerate(rates[:-1])), f"· Patt {rates[-1]:.3%}")
+    by_card = win_rate_by_start_card(c)
+    best, worst = np.nanargmax(by_card[:, 0]), np.nanargmin(by_card[:, 0])
+    print(f"Startkarte (Sitz 0): beste {CARD_STR[best]} {by_card[best, 0]:.2%}, "
+          f"schlechteste {CARD_STR[worst]} {by_card[worst, 0]:.2%}")
+    for r in (RJ, R7):
+        seats, rate = win_rate_by_hand(c, RANK_MASK[r], 4)
+        print(f"Siegquote nach {RANKS[r]} auf der Starthand:",
+              " · ".join(f"{k}: {x:.2%}" for k, x in enumerate(rate) if seats[k]))
+    taken, per_game = stack_depths(c)
+    print("+2-Stapel beim Nehmen (Zahl der 7en):",
+          " · ".join(f"{d}: {n / max(taken.sum(), 1):.2%}" for d, n in enumerate(taken) if d and n))
+    hist, share = reshuffle_stats(c)
+    print(f"Mischen: {share:.2%} der Partien, Ø {np.dot(np.arange(len(hist)), hist) / max(hist.sum(), 1):.2f}")
+    n, honoured, jack, drew = wish_stats(c)
+    print(f"Wunsch bedient: {honoured.sum() / max(n.sum(), 1):.2%} (Bube {jack.sum() / max(n.sum(), 1):.2%}, "
+          f"gezogen {drew.sum() / max(n.sum(), 1):.2%}) ·",
+          " ".join(f"{SUITS[s]} {honoured[s] / max(n[s], 1):.1%}" for s in range(4)))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mau-Mau: Simulations-Korpus schreiben und auswerten")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("sim", help="Partien mit batchsim simulieren und als .npy-Shards speichern")
+    s.add_argument("path")
+    s.add_argument("--games", type=int, default=1_000_000)
+    s.add_argument("--shard", type=int, default=500_000, help="Partien pro Shard")
+    s.add_argument("--players", type=int, default=3)
+    s.add_argument("--bots", help="Strategie je Sitz, kommagetrennt (Wunsch nur 'most' oder 'linear')")
+    s.add_argument("--seed", type=int, default=0)
+    s.add_argument("--workers", type=int, default=os.cpu_count())
+    s.add_argument("--no-play-drawn", action="store_true",
+                   help="gezogene Karte nicht sofort legen (wie mau-mau.py)")
+    r = sub.add_parser("report", help="Standardfragen an einen Korpus")
+    r.add_argument("path")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "sim":
+        bots = args.bots.split(",") if args.bots else None
+        if bots and len(bots) != args.players:
+            ap.error("--bots braucht eine Strategie je Sitz")
+        for b in bots or ():
+            try:
+                order, wish = strategy(b)
+            except ValueError as e:
+                ap.error(str(e))
+            # wie tournament.py --batch: was batchsim nicht kann, nicht still ersetzen
+            if wish is not WISHES["most"] and not hasattr(wish, "batch"):
+                ap.error(f"sim unterstützt nur Wunsch 'most' oder 'linear': {b}")
+            if hasattr(order, "choose") and not hasattr(order, "batch"):
+                ap.error(f"sim unterstützt nur Score-Varianten und policy.py: {b}")
+        t = time.perf_counter()
+        moves = sim(args.path, args.games, args.shard, args.players, not args.no_play_drawn,
+                    bots, args.seed, args.workers)
+        dt = time.perf_counter() - t
+        print(f"{args.games:,} Partien, {moves:,} Züge in {dt:.1f}s ({args.games / dt:,.0f} Partien/s) → {args.path}")
+    else:
+        t = time.perf_counter()
+        report(Corpus(args.path))
+        print(f"({time.perf_counter() - t:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
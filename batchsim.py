@@ -0,0 +1,318 @@
+"""Vektorisierter Mau-Mau-Simulator: N unabhängige Partien im Gleichschritt.
+
+Jeder step() spielt für ALLE laufenden Partien genau einen Bot-Zug mit der
+Heuristik aus engine.bot_turn (7 zuerst, dann 8, dann Rest, Bube zuletzt;
+Wunsch = häufigste Farbe) — oder je Sitz mit einer Score-Variante bzw. einer
+gelernten Policy (policy.py, vektorisiert über batch()). Zustand als NumPy-Arrays:
+
+    hands      (N, P) uint32   Hand-Bitmasken (Kodierung wie engine.py)
+    pile       (N, 32) int8    Ziehstapel, oberste Karte bei pile_len-1
+    discards   (N, 32) int8    Ablage, oberste Karte bei disc_len-1
+    pending, skip, wished (-1 = kein Wunsch), current, winner (-1 = offen)
+
+Mit trace=True hält step() zusätzlich je Zug eine Zeile fest (MOVE_COLUMNS,
+spaltenweise, für analytics.py).
+
+Patt wie in engine.track_progress, ohne Hash: passen alle Spieler
+nacheinander (nichts gelegt, nichts gezogen), steht die Partie; ebenso nach
+NO_PROGRESS_TURNS Zügen ohne neue kleinste Hand. Beides → winner = -1.
+
+    python batchsim.py 100000 --seed 1
+"""
+import argparse
+import time
+
+import numpy as np
+
+from engine import (
+    PLAY_MASK, SUIT_MASK, SEVENS, BOT_ORDER, START_CARDS, R7, R8, RJ, NO_PROGRESS_TURNS,
+)
+
+PLAY_MASK_NP = np.array(PLAY_MASK, dtype=np.uint32)
+SUIT_MASK_NP = np.array(SUIT_MASK, dtype=np.uint32)
+ONE = np.uint32(1)
+
+if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+    def popcount(x):
+        return np.bitwise_count(x).astype(np.int16)
+else:
+    _POP8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.int16)
+
+    def popcount(x):
+        b = np.ascontiguousarray(x, dtype=np.uint32).view(np.uint8).reshape(*np.shape(x), 4)
+        return _POP8[b].sum(axis=-1, dtype=np.int16)
+
+def lowbit_index(m):
+    """Index des niedrigsten gesetzten Bits (m != 0)."""
+    low = m & (~m + ONE)
+    return np.log2(low.astype(np.float64)).astype(np.int8)
+
+# Zug-Spalten mit trace=True: Partie (Index im Batch), Zugnummer, Sitz, gelegte
+# Karte (-1 = keine), gezogene Karten, Strafkarten/Wunsch/Handgröße zu Zugbeginn
+MOVE_COLUMNS = {
+    "game": np.uint32, "turn": np.uint16, "seat": np.uint8, "card": np.int8,
+    "drew": np.uint8, "pending": np.uint8, "wished": np.int8, "hand": np.uint8,
+}
+
+def per_seat(x, players):
+    """Einmal für alle (None, Score-Gruppen, Policy) oder schon je Sitz → Liste je Sitz."""
+    if x is None or not isinstance(x, (list, tuple)) or isinstance(x[0], int):
+        return [x] * players
+    return list(x)
+
+def order_table(orders, players):
+    """Score-Gruppen je Sitz → (P, K) uint32, mit Nullmasken aufgefüllt
+    (Policy-Sitze bekommen BOT_ORDER als Platzhalter)."""
+    orders = [o if o is not None and not hasattr(o, "batch") else BOT_ORDER for o in per_seat(orders, players)]
+    k = max(len(o) for o in orders)
+    return np.array([list(o) + [0] * (k - len(o)) for o in orders], dtype=np.uint32)
+
+
+class BatchSim:
+    """N Partien mit P Bots, ein Deck (uint32-Hände). orders: Score-Gruppen
+    (engine.score_groups) global oder je Sitz; wishes: Wunschfunktionen je Sitz.
+    Einträge mit batch() (policy.py) entscheiden vektorisiert selbst, alle
+    anderen Wünsche = häufigste Farbe."""
+
+    def __init__(self, n_games, seed=None, players=3, start_cards=START_CARDS,
+                 play_drawn=True, orders=None, wishes=None, trace=False):
+        self.rng = np.random.default_rng(seed)
+        self.n, self.p = n_games, players
+        self.play_drawn = play_drawn
+        self.order = order_table(orders, players)
+        self.policies = [(i, o) for i, o in enumerate(per_seat(orders, players)) if hasattr(o, "batch")]
+        self.wish_policies = [(i, w) for i, w in enumerate(per_seat(wishes, players)) if hasattr(w, "batch")]
+        n = n_games
+        if 32 - players * start_cards <= 4:  # wie engine.start_game: sonst evtl. nur Buben im Rest
+            raise ValueError(f"{players} Spieler à {start_cards} Karten: kein Rest zum Aufdecken")
+
+        deck = self.rng.permuted(np.tile(np.arange(32, dtype=np.int8), (n, 1)), axis=1)
+        dealt = players * start_cards
+        self.hands = np.zeros((n, players), dtype=np.uint32)
+        for i in range(dealt):  # wie engine.start_game: reihum von hinten
+            self.hands[:, i % players] |= ONE << deck[:, 31 - i].astype(np.uint32)
+
+        rest = 32 - dealt
+        # nicht mit Bube starten: Rest neu mischen, bis oben kein Bube liegt
+        bad = np.flatnonzero((deck[:, rest - 1] & 7) == RJ)
+        while bad.size:
+            deck[bad, :rest] = self.rng.permuted(deck[bad, :rest], axis=1)
+            bad = bad[(deck[bad, rest - 1] & 7) == RJ]
+
+        self.pile = np.full((n, 32), -1, dtype=np.int8)
+        self.pile[:, :rest - 1] = deck[:, :rest - 1]
+        self.pile_len = np.full(n, rest - 1, dtype=np.int16)
+        self.discards = np.full((n, 32), -1, dtype=np.int8)
+        self.discards[:, 0] = deck[:, rest - 1]
+        self.disc_len = np.ones(n, dtype=np.int16)
+        self.start_card = deck[:, rest - 1].copy()
+        self.start_hands = self.hands.copy()
+
+        self.pending = np.zeros(n, dtype=np.int16)
+        self.wished = np.full(n, -1, dtype=np.int8)
+        self.current = np.zeros(n, dtype=np.int8)
+        self.winner = np.full(n, -1, dtype=np.int8)
+        self.done = np.zeros(n, dtype=bool)
+        self.turns = np.zeros(n, dtype=np.int32)
+        self.reshuffles = np.zeros(n, dtype=np.int32)
+        self.passes = np.zeros(n, dtype=np.int16)  # Passen in Folge
+        self.low = np.full(n, start_cards, dtype=np.int16)  # kleinste Hand bisher
+        self.stall = np.zeros(n, dtype=np.int32)  # Züge seit der letzten neuen kleinsten Hand
+        self.max_pending = np.zeros(n, dtype=np.int16)  # höchster +2-Stapel der Partie
+        self.trace = {k: [] for k in MOVE_COLUMNS} if trace else None
+
+    # ---------- Stapel ----------
+    def _reshuffle(self, g):
+        """Ablage (ohne oberste Karte) in den leeren Ziehstapel mischen."""
+        g = g[(self.pile_len[g] == 0) & (self.disc_len[g] > 1)]
+        if not g.size:
+            return
+        k = self.disc_len[g] - 1
+        keys = self.rng.random((g.size, 32))
+        keys[np.arange(32) >= k[:, None]] = np.inf  # ungültige Plätze ans Ende
+        perm = np.argsort(keys, axis=1)
+        top = self.discards[g, k]
+        self.pile[g] = np.take_along_axis(self.discards[g], perm, axis=1)
+        self.pile_len[g] = k
+        self.discards[g] = -1
+        self.discards[g, 0] = top
+        self.disc_len[g] = 1
+        self.reshuffles[g] += 1
+
+    def _draw(self, g, who, n):
+        """Spieler who zieht n Karten (je Partie). Gibt die letzte Karte zurück (-1 = keine)."""
+        n = np.broadcast_to(n, g.shape)
+        last = np.full(g.size, -1, dtype=np.int8)
+        for k in range(int(n.max(initial=0))):
+            sel = np.flatnonzero(n > k)
+            self._reshuffle(g[sel])
+            sel = sel[self.pile_len[g[sel]] > 0]
+            gg = g[sel]
+            self.pile_len[gg] -= 1
+            card = self.pile[gg, self.pile_len[gg]]
+            self.hands[gg, who[sel]] |= ONE << card.astype(np.uint32)
+            last[sel] = card
+        return last
+
+    # ---------- Zug ----------
+    def _choose(self, pm, cur, g, key):
+        """Erste Karte der ersten nicht-leeren Score-Gruppe (je Sitz); Policy-Sitze
+        bekommen Hand, Handgröße des nächsten Spielers und Farbe."""
+        chosen = np.zeros(pm.size, dtype=np.uint32)
+        for k in range(self.order.shape[1]):
+            m = pm & self.order[cur, k]
+            take = (chosen == 0) & (m != 0)
+            chosen[take] = m[take]
+        card = lowbit_index(chosen)
+        for seat, pol in self.policies:
+            sel = np.flatnonzero(cur == seat)
+            if sel.size:
+                gg, k = g[sel], key[sel]
+                suit = np.where(k >= 32, k - 32, k >> 3)
+                card[sel] = pol.batch(self.hands[gg, seat], pm[sel],
+                                      popcount(self.hands[gg, (seat + 1) % self.p]), suit)
+        return card
+
+    def _choose_wish(self, hands, cur):
+        counts = popcount(hands[:, None] & SUIT_MASK_NP[None, :])
+        wish = np.argmax(counts + self.rng.random(counts.shape) * 0.5, axis=1).astype(np.int8)
+        for seat, pol in self.wish_policies:
+            sel = np.flatnonzero(cur == seat)
+            if sel.size:
+                wish[sel] = pol.batch(hands[sel], self.rng)
+        return wish
+
+    def step(self):
+        """Ein Bot-Zug in allen laufenden Partien. Gibt die Zahl laufender Partien zurück."""
+        g = np.flatnonzero(~self.done)
+        if not g.size:
+            return 0
+        cur = self.current[g].astype(np.intp)
+        top = self.discards[g, self.disc_len[g] - 1]
+        wished = self.wished[g]
+        key = np.where(wished >= 0, 32 + wished.astype(np.int16), top)
+        before = self.hands[g, cur]
+        pending = self.pending[g]
+        pm = before & PLAY_MASK_NP[key]
+        card = np.full(g.size, -1, dtype=np.int8)
+
+        # 1) Strafkarten, wenn keine 7 gestapelt werden kann
+        forced = (pending > 0) & ((pm & SEVENS) == 0)
+        if forced.any():
+            f = g[forced]
+            self._draw(f, cur[forced], self.pending[f])
+            self.pending[f] = 0
+
+        # 2) legen nach Score-Reihenfolge (unter Strafkarten nur 7en, wie engine.pending_playable)
+        pm = np.where(pending > 0, pm & SEVENS, pm)
+        has = ~forced & (pm != 0)
+        if has.any():
+            card[has] = self._choose(pm[has], cur[has], g[has], key[has])
+
+        # 3) sonst eine Karte ziehen (optional gleich legen)
+        need = ~forced & (pm == 0)
+        if need.any():
+            drawn = self._draw(g[need], cur[need], 1)
+            if self.play_drawn:
+                ok = drawn >= 0
+                legal = (PLAY_MASK_NP[key[need]] >> np.maximum(drawn, 0).astype(np.uint32)) & ONE
+                card[np.flatnonzero(need)[ok & (legal == 1)]] = drawn[ok & (legal == 1)]
+
+        skip = np.zeros(g.size, dtype=np.int8)
+        played = card >= 0
+        if played.any():
+            pg, pc, pcur = g[played], card[played], cur[played]
+            self.hands[pg, pcur] &= ~(ONE << pc.astype(np.uint32))
+            self.discards[pg, self.disc_len[pg]] = pc
+            self.disc_len[pg] += 1
+            self.wished[pg] = -1
+            rank = pc & 7
+            self.pending[pg] += 2 * (rank == R7)
+            self.max_pending[pg] = np.maximum(self.max_pending[pg], self.pending[pg])
+
+            won = self.hands[pg, pcur] == 0
+            self.done[pg[won]] = True
+            self.winner[pg[won]] = pcur[won]
+
+            jack = (rank == RJ) & ~won
+            if jack.any():
+                self.wished[pg[jack]] = self._choose_wish(self.hands[pg[jack], pcur[jack]], pcur[jack])
+            skip[played] = (rank == R8) & ~won
+
+        if self.trace is not None:
+            self._record(g, cur, card, before, pending, wished, played)
+        self.turns[g] += 1
+        self.current[g] = (cur + 1 + skip) % self.p
+        self._track(g, cur, before, played)
+        return int((~self.done[g]).sum())
+
+    def _record(self, g, cur, card, before, pending, wished, played):
+        """Zug-Zeilen anhängen (nur mit trace=True)."""
+        size = popcount(before)
+        cols = {"game": g, "turn": self.turns[g], "seat": cur, "card": card,
+                "drew": popcount(self.hands[g, cur]) - size + played, "pending": pending,
+                "wished": wished, "hand": size}
+        for k, v in cols.items():
+            self.trace[k].append(v.astype(MOVE_COLUMNS[k]))
+
+    def moves(self):
+        """Gesammelte Zug-Spalten als zusammenhängende Arrays (nach Partie, dann Zug sortiert)."""
+        cols = {k: np.concatenate(v) if v else np.zeros(0, MOVE_COLUMNS[k]) for k, v in self.trace.items()}
+        order = np.lexsort((cols["turn"], cols["game"]))
+        return {k: v[order] for k, v in cols.items()}
+
+    def _track(self, g, cur, before, played):
+        """Patt-Erkennung nach dem Zug (siehe Moduldoku)."""
+        after = self.hands[g, cur]
+        passed = ~played & (after == before)
+        self.passes[g] = np.where(passed, self.passes[g] + 1, 0)
+        size = popcount(after)
+        better = size < self.low[g]
+        self.low[g] = np.minimum(self.low[g], size)
+        self.stall[g] = np.where(better, 0, self.stall[g] + 1)
+        stuck = g[~self.done[g] & ((self.passes[g] >= self.p) | (self.stall[g] >= NO_PROGRESS_TURNS))]
+        self.done[stuck] = True
+
+    def run(self, max_turns=None):
+        """Bis alle Partien fertig sind (Patt: winner = -1; optional nach max_turns abbrechen)."""
+        turns = 0
+        while self.step():
+            turns += 1
+            if max_turns is not None and turns >= max_turns:
+                break
+        self.done[:] = True
+        return self.results()
+
+    def results(self):
+        return {"winner": self.winner, "turns": self.turns,
+                "reshuffles": self.reshuffles, "start_card": self.start_card,
+                "start_hands": self.start_hands, "max_pending": self.max_pending}
+
+
+def simulate(n_games, seed=None, max_turns=None, **kw):
+    return BatchSim(n_games, seed=seed, **kw).run(max_turns)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Mau-Mau Batch-Simulation (NumPy, Gleichschritt)")
+    ap.add_argument("games", type=int, nargs="?", default=100_000)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--players", type=int, default=3)
+    ap.add_argument("--no-play-drawn", action="store_true",
+                    help="gezogene Karte nicht sofort legen (wie mau-mau.py)")
+    args = ap.parse_args()
+
+    t = time.perf_counter()
+    res = simulate(args.games, seed=args.seed, players=args.players,
+                   play_drawn=not args.no_play_drawn)
+    dt = time.perf_counter() - t
+    wins = np.bincount(res["winner"] + 1, minlength=args.players + 1)
+    print(f"{args.games} Partien in {dt:.2f}s ({args.games / dt:,.0f} Partien/s)")
+    for p in range(args.players):
+        print(f"  Sitz {p}: {wins[p + 1] / args.games:.3%}")
+    print(f"  Patt: {wins[0] / args.games:.3%}  Ø Züge: {res['turns'].mean():.1f}  "
+          f"Ø Mischen: {res['reshuffles'].mean():.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Reproduzierbare Benchmarks für Engine- und Render-Hotpaths.
+
+Jeder Benchmark ist eine Setup-Funktion: sie bekommt ein geseedetes
+random.Random, baut ihre Eingaben auf und gibt (fn, ops) zurück; gemessen
+wird nur fn(). Ergebnis = bester Lauf in ns/op. Varianten "maumau" und
+"mau-mau" decken die Logik beider Front-ends ab (gezogene Karte sofort
+legen ja/nein, jeweiliges Karten- und Verlaufs-HTML).
+
+    python bench.py                  # messen und mit Baseline vergleichen
+    python bench.py --save           # aktuelle Werte als Baseline speichern
+    python bench.py -k render        # nur Benchmarks mit "render" im Namen
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from engine import (
+    HUMAN, SUITS, can_play, start_game, playable_cards, play_card, draw_cards,
+    play_headless, run_bots_until_human, iter_cards, current_player, bot_turn,
+    snapshot, restore, strategy, playable_mask, bot_choose_card,
+)
+from render import (
+    card_html, chip_html, hand_html, suit_badge_html, log_entry_html, bubble_html, emoji_suit,
+    history,
+)
+
+SEED = 20240601
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+BENCHES = {}
+
+
+def bench(name, mutates=False):
+    """mutates=True: fn() verbraucht seine Eingaben → nur einmal pro Setup messen."""
+    def deco(setup):
+        BENCHES[name] = (setup, mutates)
+        return setup
+    return deco
+
+def new_state(rng, players=("Du", "Bot 1", "Bot 2")):
+    state = {}
+    start_game(state, players, seed=rng.getrandbits(64))
+    return state
+
+def random_log(rng, n):
+    """Verlauf wie im Spiel (nur die Felder, die render.history braucht):
+    Mischung aus Legen, Ziehen, Wünschen und Aussetzen."""
+    out = []
+    for _ in range(n):
+        k = rng.randrange(4)
+        seat = rng.randrange(3)
+        if k == 0:
+            out.append(("play", seat, rng.randrange(32), None, None))
+        elif k == 1:
+            out.append(("wish", seat, None, None, rng.randrange(4)))
+        elif k == 2:
+            out.append(("draw", seat, None, 1, None))
+        else:
+            out.append(("skip", seat, None, (seat + 1) % 3, None))
+    return {"players": ["Du", "Spieler 1", "Spieler 2"], "seed": rng.getrandbits(64),
+            "log": out, "events": n}
+
+
+# ---------- Mikro ----------
+@bench("micro/can_play")
+def _(rng):
+    args = [(rng.randrange(32), rng.randrange(32), rng.choice([None, None, None, 0, 1, 2, 3]))
+            for _ in range(10_000)]
+    def fn():
+        for c, t, w in args:
+            can_play(c, t, w)
+    return fn, len(args)
+
+@bench("micro/playable_list")
+def _(rng):
+    states = [new_state(rng) for _ in range(500)]
+    def fn():
+        for s in states:
+            playable_cards(s, HUMAN)
+    return fn, len(states)
+
+def bot_choose(spec):
+    """ns pro Kartenwahl eines Bots (ohne Zugausführung) in Stellungen aus der Mitte der Partie."""
+    def setup(rng):
+        order = strategy(spec)[0]
+        jobs = [(s, current_player(s)) for s in midgame_states(rng, 500) if not s["game_over"]]
+        if type(order) is list:
+            def fn():
+                for s, p in jobs:
+                    bot_choose_card(playable_mask(s, p), order)
+        else:
+            def fn():
+                for s, p in jobs:
+                    order.choose(s, p, playable_mask(s, p))
+        return fn, len(jobs)
+    return setup
+
+bench("micro/bot_choose[heuristic]")(bot_choose("heuristic"))
+bench("micro/bot_choose[linear]")(bot_choose("linear"))
+
+@bench("micro/play_card", mutates=True)
+def _(rng):
+    jobs = []
+    for _ in range(2000):
+        s = new_state(rng)
+        jobs.append((s, rng.choice(list(iter_cards(s["hands"][HUMAN])))))
+    def fn():
+        for s, c in jobs:
+            play_card(s, HUMAN, c)
+    return fn, len(jobs)
+
+@bench("micro/draw_cards_reshuffle", mutates=True)
+def _(rng):
+    states = []
+    for _ in range(1000):
+        s = new_state(rng)
+        s["discards"] = s["discards"] + s["draw_pile"]  # leerer Ziehstapel → Mischen
+        s["draw_pile"] = []
+        states.append(s)
+    def fn():
+        for s in states:
+            draw_cards(s, HUMAN, 2)
+    return fn, len(states)
+
+
+# ---------- Makro ----------
+def full_games(play_drawn, quiet=False):
+    def setup(rng):
+        seeds = [rng.getrandbits(64) for _ in range(200)]
+        def fn():
+            for sd in seeds:
+                s = {"quiet": quiet}
+                start_game(s, ["Bot 0", "Bot 1", "Bot 2"], seed=sd)
+                play_headless(s, play_drawn)
+        return fn, len(seeds)
+    return setup
+
+bench("macro/full_game[maumau]")(full_games(True))
+bench("macro/full_game[mau-mau]")(full_games(False))
+bench("macro/full_game[quiet]")(full_games(True, quiet=True))
+
+def table_turns(players, decks):
+    """ns pro Bot-Zug auf großen Tischen: soll flach bleiben, egal wie viele Hände/Karten."""
+    def setup(rng):
+        names = [f"Bot {i}" for i in range(players)]
+        seeds = [rng.getrandbits(64) for _ in range(100)]
+        states, turns = [], 0
+        for sd in seeds:
+            for run in (0, 1):  # erst zählen (gleicher Seed → gleiche Partie), dann messen
+                s = {"decks": decks}
+                start_game(s, names, seed=sd)
+                if run:
+                    states.append(s)
+                else:
+                    turns += play_headless(s)
+        def fn():
+            for s in states:
+                play_headless(s)
+        return fn, turns
+    return setup
+
+bench("macro/table_turn[3p1d]", mutates=True)(table_turns(3, 1))
+bench("macro/table_turn[10p2d]", mutates=True)(table_turns(10, 2))
+
+@bench("macro/run_bots_until_human[maumau]", mutates=True)
+def _(rng):
+    states = []
+    for _ in range(500):
+        s = new_state(rng)
+        s["current"] = 1  # Du hast gerade gezogen → zwei Bot-Züge
+        states.append(s)
+    def fn():
+        for s in states:
+            run_bots_until_human(s)
+    return fn, len(states)
+
+
+# ---------- Fork (Suche, Was-wäre-wenn, Undo) ----------
+def midgame_states(rng, n):
+    """Partien nach einigen Zügen, mit gefülltem Log wie in einer Session."""
+    states = []
+    for _ in range(n):
+        s = new_state(rng)
+        for _ in range(rng.randrange(5, 25)):
+            if s["game_over"]:
+                break
+            bot_turn(s, current_player(s))
+        states.append(s)
+    return states
+
+@bench("fork/snapshot")
+def _(rng):
+    states = midgame_states(rng, 200)
+    def fn():
+        for s in states:
+            snapshot(s)
+    return fn, len(states)
+
+@bench("fork/snapshot_play_restore")
+def _(rng):
+    states = midgame_states(rng, 200)
+    def fn():
+        for s in states:
+            snap = snapshot(s)
+            bot_turn(s, current_player(s))
+            restore(s, snap)
+    return fn, len(states)
+
+@bench("fork/deepcopy")
+def _(rng):
+    states = midgame_states(rng, 50)
+    def fn():
+        for s in states:
+            copy.deepcopy(s)
+    return fn, len(states)
+
+
+# ---------- Render ----------
+@bench("render/log160_hand[mau-mau]")
+def _(rng):
+    log = random_log(rng, 160)
+    hand = rng.sample(range(32), 12)
+    bg = {"Du": "#e7f0ff", "Spieler 1": "#e8f7ee", "Spieler 2": "#fff7d6", "System": "#f2f2f2"}
+    bd = {"Du": "#6aa0ff", "Spieler 1": "#45c08b", "Spieler 2": "#e5c300", "System": "#e0e0e0"}
+    def fn():
+        parts = []
+        for sp, msg, c, w in history(log):
+            badge = suit_badge_html(SUITS[w]) if w is not None else ""
+            parts.append(log_entry_html(sp, msg, badge, bg[sp], bd[sp]))
+        for c in hand:
+            parts.append(card_html(c, size="md"))
+        return parts
+    return fn, 1
+
+@bench("render/waiting_hand20[mau-mau]")
+def _(rng):
+    hand = sum(1 << c for c in rng.sample(range(32), 20))  # nach einigen +2-Stapeln
+    def fn():
+        return hand_html(iter_cards(hand), "sm")
+    return fn, 1
+
+@bench("render/log120_hand[maumau]")
+def _(rng):
+    log = random_log(rng, 120)
+    hand = rng.sample(range(32), 12)
+    def fn():
+        parts = []
+        for sp, line, c, w in history(log, quips=True):
+            wish_tag = f" {emoji_suit(SUITS[w])}" if w is not None else ""
+            parts.append(bubble_html(sp, line, wish_tag))
+            if c is not None:
+                parts.append(chip_html(c))
+        for c in hand:
+            parts.append(chip_html(c))
+        return parts
+    return fn, 1
+
+
+# ---------- Runner ----------
+def measure(setup, mutates, repeat, min_time=0.1):
+    """Bester Lauf in ns/op. Je Wiederholung ein geseedetes Setup; nicht-mutierende
+    Benchmarks laufen darauf mehrfach, bis min_time erreicht ist."""
+    best = float("inf")
+    for r in range(repeat):
+        fn, ops = setup(random.Random(f"{SEED}:{r}"))
+        loops, t = 0, 0.0
+        while t < min_time and not (loops and mutates):
+            t0 = time.perf_counter()
+            fn()
+            dt = time.perf_counter() - t0
+            best = min(best, dt * 1e9 / ops)
+            t += dt
+            loops += 1
+    return best
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mau-Mau Benchmarks")
+    ap.add_argument("-k", default="", help="nur Benchmarks, deren Name dies enthält")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--save", action="store_true", help="Ergebnisse als Baseline speichern")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--threshold", type=float, default=0.20,
+                    help="relative Verschlechterung, ab der eine Regression gemeldet wird")
+    args = ap.parse_args(argv)
+
+    base = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            base = json.load(f).get("results", {})
+
+    results, regressions = {}, []
+    for name, (setup, mutates) in BENCHES.items():
+        if args.k not in name:
+            continue
+        ns = measure(setup, mutates, args.repeat)
+        results[name] = round(ns, 1)
+        line = f"{name:38s} {ns:12,.0f} ns/op"
+        if name in base:
+            ratio = ns / base[name]
+            line += f"   {ratio:6.2f}x Baseline"
+            if ratio > 1 + args.threshold:
+                line += "  ← REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        merged = {**base, **results}
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "seed": SEED, "results": merged}, f, indent=2, sort_keys=True)
+        print(f"Baseline gespeichert: {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} Regression(en) > {args.threshold:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
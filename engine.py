@@ -0,0 +1,730 @@
+"""Mau-Mau-Engine (32-Karten Skatdeck) — ohne UI-Import.
+
+Gemeinsame Spielregeln für maumau.py, mau-mau.py und Headless-Worker.
+Hier darf nichts importiert werden, was den Kaltstart bremst (kein
+Streamlit, kein NumPy): ein Simulations-Worker soll in Millisekunden stehen.
+
+    python engine.py          # misst die Importzeit gegen IMPORT_BUDGET_MS
+"""
+import hashlib
+import os
+import random
+import sys
+from collections import deque
+
+# ---------- Spielkonfiguration ----------
+SUITS = ["♠", "♥", "♦", "♣"]
+RANKS = ["7", "8", "9", "10", "J", "Q", "K", "A"]
+PLAYERS = ["Du", "Spieler 1", "Spieler 2"]
+HUMAN = "Du"
+START_CARDS = 5
+DECKS = 1      # große Tische: state["decks"] (je Deck 32 Karten), bis MAX_DECKS
+MAX_DECKS = 8
+
+# Budget für den kalten Import dieses Moduls (frischer Interpreter)
+IMPORT_BUDGET_MS = 30.0
+
+# Session-Speicher: Log als Ringpuffer (so viel zeigt mau-mau.py an), ältere
+# Einträge optional gzip-komprimiert ins Archiv (MAUMAU_ARCHIVE_DIR).
+LOG_LIMIT = 160
+SPILL_BATCH = 32
+MEMORY_BUDGET = int(os.environ.get("MAUMAU_MEMORY_BUDGET", 256 * 1024))  # Bytes pro Session
+
+# Mau-Mau-Regeln (häufige Variante):
+# - Nach Farbe ODER Rang legen
+# - 7 = +2 ziehen (stapelbar)
+# - 8 = Aussetzen
+# - J = Bube → Wunschfarbe
+# - Stapel leer → Nachziehstapel wird aus Ablagestapel neu gemischt
+
+# ---------- Karten ----------
+# Karte = int 0–31 (Farbe * 8 + Rang), Hand = 32-Bit-Maske.
+# (Rang, Farbe)-Tupel gibt es nur noch an der UI-Grenze (card_str/card_html).
+CARDS = [(r, s) for s in SUITS for r in RANKS]
+CARD_STR = [f"{r}{s}" for r, s in CARDS]
+R7, R8, RJ = RANKS.index("7"), RANKS.index("8"), RANKS.index("J")
+
+def rank_of(card): return card & 7
+def suit_of(card): return card >> 3
+
+RANK_MASK = [sum(1 << (s * 8 + r) for s in range(4)) for r in range(8)]
+SUIT_MASK = [0xFF << (s * 8) for s in range(4)]
+SEVENS, EIGHTS, JACKS = RANK_MASK[R7], RANK_MASK[R8], RANK_MASK[RJ]
+FULL_MASK = (1 << 32) - 1
+
+# Legalitätstabelle: Zeile 0–31 = Ablagekarte ohne Wunsch, 32–35 = Wunschfarbe.
+# "Spielbare Karten auf der Hand" = hand & PLAY_MASK[legal_key(...)]
+PLAY_MASK = ([SUIT_MASK[suit_of(t)] | RANK_MASK[rank_of(t)] | JACKS for t in range(32)]
+             + [SUIT_MASK[w] | JACKS for w in range(4)])
+
+def legal_key(top_card, wished_suit):
+    return top_card if wished_suit is None else 32 + wished_suit
+
+def card_str(card):
+    return CARD_STR[card]
+
+def new_deck(decks=1):
+    return list(range(32)) * decks
+
+# Mehrere Decks: die Hand ist eine geschichtete Maske, Bit 32*k + c heißt
+# "mindestens k+1-mal Karte c". Schicht 0 (untere 32 Bit) ist die Menge der
+# vorhandenen Karten, darauf funktionieren PLAY_MASK & Co. unverändert.
+# Mit einem Deck gibt es nur Schicht 0 – dann ist alles wie gehabt.
+LAYER_REP = sum(1 << (32 * k) for k in range(MAX_DECKS))  # mask * LAYER_REP = mask in allen Schichten
+
+def add_card(hand, card):
+    bit = 1 << card
+    while hand & bit:
+        bit <<= 32
+    return hand | bit
+
+def copies(hand, card):
+    """Wie oft card auf der (geschichteten) Hand ist."""
+    return (hand >> card & LAYER_REP).bit_count()
+
+def remove_card(hand, card):
+    """Oberste Kopie von card entfernen (card muss auf der Hand sein)."""
+    bit = 1 << card
+    while hand & bit << 32:
+        bit <<= 32
+    return hand & ~bit
+
+def can_play(card, top_card, wished_suit):
+    return PLAY_MASK[legal_key(top_card, wished_suit)] >> card & 1 == 1
+
+def iter_cards(mask):
+    """Karten-IDs einer Maske, aufsteigend (geschichtete Hände: Schicht für Schicht)."""
+    while mask:
+        low = mask & -mask
+        yield (low.bit_length() - 1) & 31
+        mask ^= low
+
+
+# ---------- Ereignisse ----------
+# Die Engine formatiert nichts: state["log"] hält kompakte Ereignisse
+#   (Art, Sitz, Karte, Anzahl, Farbe)      Sitz -1 = System
+#   start   Karte = erste Ablage            play  Karte
+#   draw    Anzahl (0 = kann nicht ziehen)  wish  Farbe
+#   skip    Sitz = wer die 8 legte, Anzahl = ausgesetzter Sitz
+#   reshuffle                               stalemate  Anzahl = Grund (STALEMATE_*)
+# Text und Sprüche baut erst die UI beim Rendern (render.event_line, render.quip).
+# Mit state["quiet"] (Headless-Simulation) entstehen gar keine Ereignisse.
+STALEMATE_REPEAT, STALEMATE_STALL = 0, 1
+
+def event(state, kind, seat, card=None, amount=None, suit=None):
+    if state.get("quiet"):
+        return
+    entries = state["log"]
+    if len(entries) == entries.maxlen and state.get("log_archive"):
+        spill_log(state, SPILL_BATCH)
+    entries.append((kind, seat, card, amount, suit))
+    state["events"] += 1  # Nummer des nächsten Ereignisses in dieser Partie
+    state["log_seq"] = state.get("log_seq", 0) + 1  # Revision für UI-Caches
+
+def mark_last_action(state, player, card=None, action=None):
+    """Letzte Aktion je Spieler als (Karte, Art, Ereignisnummer) — den Spruch wählt die UI."""
+    if not state.get("quiet"):
+        state["last_action"][player] = (card, action, state["events"] - 1)
+
+
+# ---------- Zufall & Züge ----------
+# Jede Partie hat eigene Zufallsströme, abgeleitet aus ihrem Seed:
+#   rng      Mischen (Geben, Bube-Start, Ziehstapel)
+#   bot_rng  Bot-Entscheidungen (Wunsch-Gleichstand, wish_random)
+# Damit ist eine Partie aus (seed, moves) exakt nachspielbar (replay()).
+# Sprüche brauchen keinen Strom: render.quip leitet sie aus Seed und Ereignisnummer ab.
+# Seeds sind uint64 (records.HEAD); Text-Seeds wie "7:12" werden stabil darauf abgebildet.
+def seed_u64(seed):
+    if isinstance(seed, str):
+        return int.from_bytes(hashlib.blake2b(seed.encode(), digest_size=8).digest(), "little")
+    if not 0 <= seed < 1 << 64:
+        raise ValueError(f"Seed {seed} liegt nicht in 0 … 2**64-1")
+    return seed
+
+def game_rngs(seed):
+    return {k: random.Random(f"{seed}:{k}") for k in ("rng", "bot_rng")}
+
+def record(state, op, arg=None):
+    """Zug des aktuellen Spielers als (op, Sitz, Argument): play/wish Karte bzw. Farbe, draw/take/end."""
+    state["moves"].append((op, state["current"], arg))
+
+def end_turn(state, player):
+    """Zugende: ggf. Aussetzen (8), dann weiter zum nächsten Spieler."""
+    record(state, "end")
+    apply_skip(state, player)
+    advance_turn(state)
+    track_progress(state, player)
+
+def replay(seed, moves, players=None, state=None):
+    """Partie aus Seed und Zugliste (state["moves"]) nachspielen."""
+    state = {} if state is None else state
+    start_game(state, players, seed)
+    return apply_moves(state, moves)
+
+def apply_moves(state, moves):
+    """Züge auf einen laufenden Zustand anwenden (z. B. nach einem Snapshot)."""
+    for op, _, arg in moves:  # Sitz = aktueller Spieler, ergibt sich beim Nachspielen
+        player = current_player(state)
+        if op == "play":
+            play_card(state, player, arg)  # Mensch legt Bube → wartet auf Wunsch (wie human_play)
+            state["awaiting_wish"] = player == HUMAN and rank_of(arg) == RJ and not state["game_over"]
+        elif op == "wish":
+            set_wish(state, player, arg)
+            state["awaiting_wish"] = False
+        elif op == "draw":
+            draw_one(state, player)
+        elif op == "take":
+            take_pending(state, player)
+        elif op == "end":
+            end_turn(state, player)
+        else:
+            raise ValueError(f"unbekannter Zug: {op}")
+    return state
+
+
+# ---------- State-Setup ----------
+def start_game(state, players=None, seed=None):
+    """Neue Partie. Ohne seed wird einer aus dem globalen random gezogen (und gemerkt)."""
+    players = list(players or state.get("players") or PLAYERS)
+    decks = state.get("decks", DECKS)
+    rest = 32 * decks - len(players) * START_CARDS  # muss mehr als alle Buben enthalten (Startkarte)
+    if not 2 <= len(players) or not 1 <= decks <= MAX_DECKS or rest <= 4 * decks:
+        raise ValueError(f"{len(players)} Spieler mit {decks} Deck(s) geht nicht")
+    if state.get("log") and state.get("log_archive"):
+        spill_log(state)  # Verlauf der alten Partie nicht verlieren
+    seed = random.getrandbits(64) if seed is None else seed_u64(seed)
+    rngs = game_rngs(seed)
+    deck = new_deck(decks)
+    rngs["rng"].shuffle(deck)
+
+    hands = {p: 0 for p in players}
+    for _ in range(START_CARDS):
+        for p in players:
+            hands[p] = add_card(hands[p], deck.pop())
+
+    top = deck.pop()
+    while rank_of(top) == RJ:  # nicht mit Bube starten
+        deck.insert(0, top)
+        rngs["rng"].shuffle(deck)
+        top = deck.pop()
+
+    state.update(dict(
+        seed=seed, moves=[], **rngs,
+        players=players,
+        hands=hands, draw_pile=deck, discards=[top],
+        current=0, wished_suit=None, pending_draw=0, skip_next=False,
+        winner=None, game_over=False, reshuffles=0,
+        log=deque(maxlen=state.get("log_limit", LOG_LIMIT)), events=0,
+        log_seq=state.get("log_seq", 0) + 1, undo=deque(maxlen=UNDO_LIMIT),
+        awaiting_wish=False,
+        last_action={p: None for p in players},
+    ))
+    event(state, "start", -1, top)
+    reset_tracking(state)
+
+
+# ---------- Regeln ----------
+def current_player(state):
+    return state["players"][state["current"]]
+
+def next_player_index(state, i):
+    return (i + 1) % len(state["players"])
+
+def advance_turn(state):
+    state["current"] = next_player_index(state, state["current"])
+
+def hand_size(state, player):
+    return state["hands"][player].bit_count()
+
+def reshuffle_if_needed(state):
+    if not state["draw_pile"]:
+        if len(state["discards"]) <= 1:
+            return
+        pool = state["discards"]  # ohne Kopie: oberste Karte abheben, Rest mischen
+        top = pool.pop()
+        state["rng"].shuffle(pool)
+        state["draw_pile"] = pool
+        state["discards"] = [top]
+        state["reshuffles"] += 1
+        state["seen"].clear()  # neue Stapelreihenfolge: alte Stellungen kommen nicht wieder
+        event(state, "reshuffle", -1)
+
+def draw_cards(state, player, n):
+    for _ in range(n):
+        reshuffle_if_needed(state)
+        if not state["draw_pile"]:
+            break
+        set_hand(state, player, add_card(state["hands"][player], state["draw_pile"].pop()))
+
+def draw_one(state, player):
+    """Eine Karte ziehen (mit Log). Gibt die Karte zurück oder None."""
+    reshuffle_if_needed(state)
+    if not state["draw_pile"]:
+        record(state, "draw")
+        event(state, "draw", state["current"], amount=0)
+        return None
+    card = state["draw_pile"].pop()
+    set_hand(state, player, add_card(state["hands"][player], card))
+    record(state, "draw")
+    event(state, "draw", state["current"], amount=1)
+    mark_last_action(state, player, None, "draw")
+    return card
+
+def playable_mask(state, player):
+    key = legal_key(state["discards"][-1], state["wished_suit"])
+    return state["hands"][player] & PLAY_MASK[key]
+
+def pending_playable(playable, pending):
+    """Liegen +2-Strafkarten an, darf nur eine 7 gestapelt werden — eine Regel für alle Bots."""
+    return playable & SEVENS if pending else playable
+
+def bot_playable_mask(state, player):
+    return pending_playable(playable_mask(state, player), state["pending_draw"])
+
+def playable_cards(state, player):
+    return list(iter_cards(playable_mask(state, player)))
+
+def end_if_winner(state, player):
+    if not state["hands"][player]:
+        state["winner"] = player
+        state["game_over"] = True
+        return True
+    return False
+
+def play_card(state, player, card):
+    set_hand(state, player, remove_card(state["hands"][player], card))
+    state["discards"].append(card)
+    state["wished_suit"] = None
+    record(state, "play", card)
+    event(state, "play", state["current"], card)
+    rank = rank_of(card)
+    if rank == R7:
+        state["pending_draw"] += 2
+    elif rank == R8:
+        state["skip_next"] = True
+    # J: Wunsch folgt separat
+    end_if_winner(state, player)
+
+def set_wish(state, player, suit):
+    state["wished_suit"] = suit
+    record(state, "wish", suit)
+    event(state, "wish", state["current"], suit=suit)
+    mark_last_action(state, player, None, "wish")
+
+def must_take_pending(state, player):
+    """True, wenn +2-Strafkarten anstehen und keine 7 gestapelt werden kann."""
+    return state["pending_draw"] > 0 and not playable_mask(state, player) & SEVENS
+
+def take_pending(state, player):
+    n = state["pending_draw"]
+    record(state, "take")
+    draw_cards(state, player, n)
+    event(state, "draw", state["current"], amount=n)
+    mark_last_action(state, player, None, "draw")
+    state["pending_draw"] = 0
+
+def enforce_pending_draw(state):
+    cur = current_player(state)
+    if must_take_pending(state, cur):
+        take_pending(state, cur)
+        return True
+    return False
+
+def apply_skip(state, player):
+    """8 gelegt → nächster Spieler setzt aus."""
+    if state["skip_next"] and not state["game_over"]:
+        event(state, "skip", state["current"], amount=next_player_index(state, state["current"]))
+        mark_last_action(state, player, None, "skip")
+        advance_turn(state)
+        state["skip_next"] = False
+
+
+# ---------- Patt-Erkennung ----------
+# Zobrist-Hash der Hände: ein Zufallsschlüssel je Sitz und Bit der (geschichteten)
+# Hand, jede Kartenbewegung ist ein XOR (set_hand). Zu Zugbeginn kommen Stapelhöhe,
+# Ablage (legal_key), Strafkarten und Sitz dazu. Zwischen zwei Mischvorgängen wird
+# der Stapel nur abgetragen, die Höhe legt ihn also fest → gleicher Hash heißt
+# gleiche Stellung; beim Mischen wird "seen" geleert. Alles O(1) pro Zug.
+REPEAT_LIMIT = 3         # dieselbe Stellung so oft zu Zugbeginn → Patt
+NO_PROGRESS_TURNS = 400  # so viele Züge ohne neue kleinste Hand → Patt
+
+_ZRNG = random.Random(0x4D61754D6175)
+Z_HAND = []  # je Sitz 32 * MAX_DECKS Schlüssel, bei Bedarf erweitert
+Z_PILE = [_ZRNG.getrandbits(64) for _ in range(32 * MAX_DECKS + 1)]
+Z_TOP = [_ZRNG.getrandbits(64) for _ in range(36)]
+Z_PENDING = [_ZRNG.getrandbits(64) for _ in range(8 * MAX_DECKS + 1)]
+Z_SEAT = []
+
+def _zseat(seat):
+    while len(Z_HAND) <= seat:
+        Z_HAND.append([_ZRNG.getrandbits(64) for _ in range(32 * MAX_DECKS)])
+        Z_SEAT.append(_ZRNG.getrandbits(64))
+    return Z_HAND[seat]
+
+def set_hand(state, player, hand):
+    """Hand ersetzen und den Hash nachführen (eine Karte mehr/weniger = ein XOR)."""
+    diff = state["hands"][player] ^ hand
+    state["hands"][player] = hand
+    z = Z_HAND[state["players"].index(player)]
+    while diff:
+        low = diff & -diff
+        state["zhash"] ^= z[low.bit_length() - 1]
+        diff ^= low
+
+def hand_hash(state):
+    h = 0
+    for seat, p in enumerate(state["players"]):
+        z, m = _zseat(seat), state["hands"][p]
+        while m:
+            low = m & -m
+            h ^= z[low.bit_length() - 1]
+            m ^= low
+    return h
+
+def position_hash(state):
+    """Stellung zu Zugbeginn (Hände, Stapelhöhe, Ablage/Wunsch, Strafkarten, Sitz)."""
+    return (state["zhash"] ^ Z_PILE[len(state["draw_pile"])]
+            ^ Z_TOP[legal_key(state["discards"][-1], state["wished_suit"])]
+            ^ Z_PENDING[state["pending_draw"] // 2] ^ Z_SEAT[state["current"]])
+
+def reset_tracking(state):
+    """Hash neu berechnen, Wiederholungen und Fortschritt zurücksetzen (neue Partie, Determinisierung)."""
+    state["zhash"] = hand_hash(state)
+    state["seen"] = {}
+    state["low"] = min(h.bit_count() for h in state["hands"].values())
+    state["stall"] = 0
+
+def stalemate(state, reason):
+    state["game_over"] = True
+    state["winner"] = None
+    event(state, "stalemate", -1, amount=reason)
+
+def track_progress(state, player):
+    """Nach jedem Zug: Stellung wiederholt oder zu lange kein Fortschritt → Patt."""
+    size = state["hands"][player].bit_count()
+    if size < state["low"]:
+        state["low"], state["stall"] = size, 0
+    else:
+        state["stall"] += 1
+        if state["stall"] >= NO_PROGRESS_TURNS:
+            return stalemate(state, STALEMATE_STALL)
+    h = position_hash(state)
+    seen = state["seen"]
+    seen[h] = n = seen.get(h, 0) + 1
+    if n >= REPEAT_LIMIT:
+        stalemate(state, STALEMATE_REPEAT)
+
+
+# ---------- Bots ----------
+def bot_score(card):
+    """Reihenfolge: 7 zuerst, dann 8, dann Rest, Bube zuletzt."""
+    rank = rank_of(card)
+    if rank == R7: return 0
+    if rank == R8: return 1
+    if rank == RJ: return 3
+    return 2
+
+def score_groups(score):
+    """score(card) → Kartenmasken je Punktwert, aufsteigend sortiert."""
+    groups = {}
+    for c in range(32):
+        groups[score(c)] = groups.get(score(c), 0) | 1 << c
+    return [groups[k] for k in sorted(groups)]
+
+BOT_ORDER = score_groups(bot_score)
+
+def bot_choose_card(playable, order=BOT_ORDER):
+    """Erste Karte der ersten nicht-leeren Gruppe aus order."""
+    for group in order:
+        m = playable & group
+        if m:
+            return (m & -m).bit_length() - 1
+    return None
+
+def bot_choose_wish(hand, rng=random):
+    counts = [(hand & m).bit_count() for m in SUIT_MASK]
+    return max(range(4), key=lambda s: (counts[s], rng.random()))
+
+# ---------- Bot-Varianten (Turniere) ----------
+# Strategie = "score[:wunsch]", z. B. "heuristic", "eights_first:random".
+def score_eights_first(card):
+    """8 vor 7, sonst wie bot_score."""
+    return {R7: 1, R8: 0}.get(rank_of(card), bot_score(card))
+
+def score_jacks_early(card):
+    """Bube wie jede andere Karte (kein Aufsparen)."""
+    return 2 if rank_of(card) == RJ else bot_score(card)
+
+def score_high_first(card):
+    """Wie bot_score, innerhalb des Rests hohe Ränge zuerst abwerfen."""
+    s = bot_score(card)
+    return s * 8 + (7 - rank_of(card)) if s == 2 else s * 8
+
+def wish_random(hand, rng=random):
+    return rng.randrange(4)
+
+def wish_most_no_jacks(hand, rng=random):
+    """Häufigste Farbe ohne Buben (die passen ohnehin immer)."""
+    return bot_choose_wish(hand & ~JACKS or hand, rng)
+
+SCORES = {
+    "heuristic": bot_score,
+    "eights_first": score_eights_first,
+    "jacks_early": score_jacks_early,
+    "high_first": score_high_first,
+}
+WISHES = {
+    "most": bot_choose_wish,
+    "random": wish_random,
+    "most_no_jacks": wish_most_no_jacks,
+}
+DEFAULT_BOT = "heuristic"
+# Zustandsabhängige Strategien: SCORES[name] darf statt score(card) ein Objekt mit
+# choose(state, player, playable) → Karte sein (z. B. policy.py). Solche Module
+# werden erst beim ersten Gebrauch importiert und tragen sich selbst ein.
+PLUGIN_STRATEGIES = {"linear": "policy"}
+_STRATEGIES = {}
+# Bots mit eigener Zugfunktion (z. B. ismcts.py), registriert beim Import:
+# BOT_TURNS[name] = fn(state, player, play_drawn)
+BOT_TURNS = {}
+# Endspiel-Haken (solver.py): fn(state, player, play_drawn) → True, wenn gezogen wurde.
+# Greift nur mit state["endgame"] (True oder Menge von Spielern).
+ENDGAME = None
+
+def strategy(spec):
+    """'score[:wunsch]' → (Score-Gruppen, Wunschfunktion), pro Prozess gecacht."""
+    if spec not in _STRATEGIES:
+        score, _, wish = spec.partition(":")
+        for name in (score, wish):
+            if name in PLUGIN_STRATEGIES and name not in SCORES:
+                __import__(PLUGIN_STRATEGIES[name])
+        if score not in SCORES or (wish or "most") not in WISHES:
+            raise ValueError(f"unbekannte Bot-Strategie: {spec!r}")
+        order = SCORES[score]
+        _STRATEGIES[spec] = (order if hasattr(order, "choose") else score_groups(order), WISHES[wish or "most"])
+    return _STRATEGIES[spec]
+
+def bot_turn(state, player, play_drawn=True):
+    """Ein kompletter Bot-Zug. play_drawn: gezogene Karte sofort legen, falls passend."""
+    if state["game_over"]:
+        return
+    if ENDGAME is not None and state.get("endgame") and ENDGAME(state, player, play_drawn):
+        return
+    spec = state.get("bots", {}).get(player, DEFAULT_BOT)
+    if spec in BOT_TURNS:
+        BOT_TURNS[spec](state, player, play_drawn)
+        return
+    if enforce_pending_draw(state):
+        end_turn(state, player)
+        return
+
+    order, choose_wish = strategy(spec)
+    playable = bot_playable_mask(state, player)
+    chosen = bot_choose_card(playable, order) if type(order) is list else order.choose(state, player, playable)
+    if chosen is None:
+        drawn = draw_one(state, player)
+        if play_drawn and drawn is not None and can_play(drawn, state["discards"][-1], state["wished_suit"]):
+            chosen = drawn
+
+    if chosen is not None:
+        play_card(state, player, chosen)
+        mark_last_action(state, player, chosen, "play")
+        if state["game_over"]:
+            return
+        if rank_of(chosen) == RJ:
+            set_wish(state, player, choose_wish(state["hands"][player], state["bot_rng"]))
+
+    end_turn(state, player)
+
+def do_one_bot_step(state):
+    """Genau EINEN Bot-Schritt (manuell per Button)."""
+    if state["game_over"]:
+        return
+    player = current_player(state)
+    if player == HUMAN:
+        return
+    bot_turn(state, player, play_drawn=False)
+
+def run_bots_until_human(state, play_drawn=True):
+    """Bots ziehen lassen, bis der Mensch dran ist (endet spätestens per Patt-Erkennung)."""
+    while not state["game_over"] and current_player(state) != HUMAN:
+        bot_turn(state, current_player(state), play_drawn)
+
+def play_headless(state, play_drawn=True, max_turns=None):
+    """Nur Bots: spielen bis Spielende oder Patt (optional nach max_turns abbrechen).
+    Gibt die Zugzahl zurück."""
+    turns = 0
+    while not state["game_over"] and (max_turns is None or turns < max_turns):
+        bot_turn(state, current_player(state), play_drawn)
+        turns += 1
+    return turns
+
+
+# ---------- Menschliche Züge ----------
+def human_play(state, card):
+    """Karte legen. Bei Bube wartet der Zug auf human_wish()."""
+    play_card(state, HUMAN, card)
+    if state["game_over"]:
+        return
+    mark_last_action(state, HUMAN, card, "play")
+    if rank_of(card) == RJ:
+        state["awaiting_wish"] = True
+        return
+    end_turn(state, HUMAN)
+
+def human_wish(state, suit):
+    set_wish(state, HUMAN, suit)
+    state["awaiting_wish"] = False  # wichtig: nicht hängen bleiben
+    end_turn(state, HUMAN)
+
+def human_take_pending(state):
+    take_pending(state, HUMAN)
+    end_turn(state, HUMAN)
+
+def human_draw(state):
+    draw_one(state, HUMAN)
+    end_turn(state, HUMAN)
+
+
+# ---------- Snapshots & Undo ----------
+# Hände sind ints, Stapel höchstens 32 Karten: ein Snapshot kopiert nur ein
+# paar Skalare, zwei kurze Tupel und die RNG-Zustände — unabhängig von Log
+# und Archiv. Log und Zugliste werden beim Zurückspringen nur gekürzt.
+SNAP_KEYS = ("current", "wished_suit", "pending_draw", "skip_next", "winner", "game_over",
+             "reshuffles", "awaiting_wish", "low", "stall", "events")
+UNDO_LIMIT = 20
+
+def snapshot(state):
+    return (tuple(state[k] for k in SNAP_KEYS), tuple(state["hands"].values()),
+            tuple(state["draw_pile"]), tuple(state["discards"]),
+            state["rng"].getstate(), state["bot_rng"].getstate(),
+            len(state["moves"]), dict(state["last_action"]))
+
+def restore(state, snap):
+    """Spielstand aus snapshot() zurückholen."""
+    values, hands, pile, discards, rng, bot_rng, n_moves, last = snap
+    newer = state["events"]  # seit dem Snapshot neue Ereignisse = so viele Log-Einträge weg
+    state.update(zip(SNAP_KEYS, values))
+    state["hands"] = dict(zip(state["players"], hands))
+    state["zhash"] = hand_hash(state)
+    state["seen"] = {}
+    state["draw_pile"], state["discards"] = list(pile), list(discards)
+    state["rng"].setstate(rng)
+    state["bot_rng"].setstate(bot_rng)
+    del state["moves"][n_moves:]
+    entries = state["log"]
+    for _ in range(min(newer - state["events"], len(entries))):
+        entries.pop()  # schon archivierte Einträge bleiben im Archiv
+    state["log_seq"] = state.get("log_seq", 0) + 1  # Revision bleibt monoton (UI-Caches)
+    state["undo_rev"] = state.get("undo_rev", 0) + 1  # journal.sync erkennt daran ein Undo
+    state["last_action"] = last
+
+def push_undo(state):
+    """Vor einer Aktion aufrufen; hält höchstens UNDO_LIMIT Schritte."""
+    stack = state.setdefault("undo", deque(maxlen=UNDO_LIMIT))
+    snap = snapshot(state)
+    if stack:  # unveränderte RNG-Zustände (je ~25 kB) mit dem Vorgänger teilen
+        prev = stack[-1]
+        snap = (*snap[:4], *(p if p == n else n for p, n in zip(prev[4:6], snap[4:6])), *snap[6:])
+    stack.append(snap)
+
+def undo(state):
+    """Letzte Aktion zurücknehmen. False, wenn nichts zurückzunehmen ist."""
+    if not state.get("undo"):
+        return False
+    restore(state, state["undo"].pop())
+    return True
+
+
+# ---------- Speicher ----------
+def log_archive_path(session_id):
+    """Archivdatei für eine Session, falls MAUMAU_ARCHIVE_DIR gesetzt ist."""
+    base = os.environ.get("MAUMAU_ARCHIVE_DIR")
+    if not base:
+        return None
+    os.makedirs(base, exist_ok=True)
+    return os.path.join(base, f"{session_id}.jsonl.gz")
+
+def spill_log(state, n=None):
+    """Älteste n Logeinträge (Standard: alle) entfernen und ans Archiv anhängen."""
+    import gzip
+    import json
+
+    entries = state["log"]
+    n = len(entries) if n is None else min(n, len(entries))
+    batch = [entries.popleft() for _ in range(n)]
+    path = state.get("log_archive")
+    if path and batch:
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            f.writelines(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n"
+                         for e in batch)
+    state["log_archived"] = state.get("log_archived", 0) + n
+    return n
+
+def read_log_archive(path):
+    """Archivierte Logeinträge in Originalreihenfolge."""
+    import gzip
+    import json
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+def state_bytes(state):
+    """Ungefährer Speicherbedarf einer Session (rekursiv, jedes Objekt einmal)."""
+    seen, stack, total = set(), [state], 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, deque, set)):
+            stack.extend(obj)
+    return total
+
+def compact_state(state):
+    """Kompaktieren: halbes Log ins Archiv (bzw. verwerfen), ältere Hälfte der Undo-Schritte
+    verwerfen, Stapel-Listen neu anlegen."""
+    spill_log(state, len(state["log"]) // 2)
+    undo = state.get("undo") or ()
+    for _ in range((len(undo) + 1) // 2):
+        undo.popleft()
+    state["draw_pile"] = list(state["draw_pile"])
+    state["discards"] = list(state["discards"])
+
+def enforce_memory_budget(state, budget=MEMORY_BUDGET):
+    """Kompaktiert, solange die Session über dem Budget liegt. Gibt die Bytes zurück."""
+    size = state_bytes(state)
+    while size > budget and (len(state["log"]) > 1 or state.get("undo")):
+        compact_state(state)
+        size = state_bytes(state)
+    return size
+
+
+# ---------- Importzeit ----------
+def measure_import_ms(module="engine", runs=7):
+    """Median der kalten Importzeit (ms) in frischen Interpretern."""
+    import statistics
+    import subprocess
+
+    code = ("import sys, time; t = time.perf_counter(); import {m}; "
+            "dt = (time.perf_counter() - t) * 1000; "
+            "assert 'streamlit' not in sys.modules, 'UI-Import in {m}'; print(dt)").format(m=module)
+    here = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=here,
+                             capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout))
+    return statistics.median(samples)
+
+
+if __name__ == "__main__":
+    ms = measure_import_ms()
+    ok = ms <= IMPORT_BUDGET_MS
+    print(f"import engine: {ms:.2f} ms (Budget {IMPORT_BUDGET_MS:.0f} ms) {'OK' if ok else 'ZU LANGSAM'}")
+    sys.exit(0 if ok else 1)
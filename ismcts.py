@@ -0,0 +1,288 @@
+"""ISMCTS-Bot: Monte-Carlo-Baumsuche über Informationsmengen.
+
+Jede Iteration verteilt die unbekannten Karten (alles außer eigener Hand und
+Ablage) zufällig auf die Gegnerhände (passend zu deren Kartenzahl) und den
+Ziehstapel, steigt im gemeinsamen Baum ab (UCB, nur Züge, die in dieser
+Verteilung legal sind) und spielt mit der Heuristik zu Ende
+(Single-Observer-ISMCTS). Züge sind Karte legen — Bube je Wunschfarbe
+getrennt —, eine Karte ziehen oder +2-Strafkarten nehmen.
+
+Budget pro Zug: Millisekunden und/oder Rollouts. Mit workers > 1 suchen
+mehrere Prozesse unabhängig (Root-Parallelisierung) und die Besuchszahlen
+werden addiert. Beim Import registriert sich der Bot als engine.BOT_TURNS["ismcts"]:
+
+    state["bots"] = {"Spieler 1": "ismcts"}; state["ismcts"] = {"ms": 200, "workers": 2}
+
+    python ismcts.py --games 300 --ms 50      # Stärke gegen die Heuristik
+"""
+import argparse
+import atexit
+import math
+import multiprocessing as mp
+import random
+import sys
+import time
+
+import engine
+from engine import (
+    RJ, rank_of, iter_cards, current_player, playable_mask, pending_playable, add_card, remove_card,
+    can_play, play_card, set_wish, draw_one, take_pending, end_turn,
+    SUIT_MASK, mark_last_action, bot_choose_card, bot_choose_wish, start_game, play_headless,
+    reset_tracking,
+)
+
+DEFAULT_BUDGET = {"ms": 200, "rollouts": None, "workers": 1}
+UCB_C = 0.7
+PRIOR = (20, 0.5, 0.3)  # virtuelle Besuche, Siegquote für den Heuristik-Zug, für alle anderen
+ROLLOUT_TURNS = 300  # danach zählt die Simulation als Patt
+
+
+# ---------- Züge ----------
+def legal_actions(state, player):
+    """("play", Karte, Wunsch|None), ("draw",) oder ("take",)."""
+    pm = pending_playable(playable_mask(state, player), state["pending_draw"])
+    if state["pending_draw"]:
+        return [("play", c, None) for c in iter_cards(pm)] + [("take",)]
+    acts = []
+    for c in iter_cards(pm):
+        if rank_of(c) == RJ:
+            acts.extend(("play", c, s) for s in range(4))
+        else:
+            acts.append(("play", c, None))
+    acts.append(("draw",))
+    return acts
+
+def heuristic_action(state, player):
+    """Der Zug, den engine.bot_turn (Standard-Heuristik) wählen würde."""
+    pm = pending_playable(playable_mask(state, player), state["pending_draw"])
+    if state["pending_draw"] and not pm:
+        return ("take",)
+    card = bot_choose_card(pm)
+    if card is None:
+        return ("draw",)
+    if rank_of(card) == RJ:
+        counts = [(remove_card(state["hands"][player], card) & m).bit_count() for m in SUIT_MASK]
+        return ("play", card, counts.index(max(counts)))
+    return ("play", card, None)
+
+def apply_action(state, player, action, play_drawn=True):
+    """Kompletter Zug wie engine.bot_turn, nur mit vorgegebener Entscheidung."""
+    kind = action[0]
+    if kind == "take":
+        take_pending(state, player)
+    else:
+        if kind == "draw":
+            card = draw_one(state, player)
+            if not (play_drawn and card is not None
+                    and can_play(card, state["discards"][-1], state["wished_suit"])):
+                end_turn(state, player)
+                return
+            wish = None  # gezogene Bube: Wunsch wie die Heuristik
+        else:
+            card, wish = action[1], action[2]
+        play_card(state, player, card)
+        mark_last_action(state, player, card, "play")
+        if state["game_over"]:
+            return
+        if rank_of(card) == RJ:
+            set_wish(state, player, bot_choose_wish(state["hands"][player], state["bot_rng"])
+                     if wish is None else wish)
+    end_turn(state, player)
+
+
+# ---------- Determinisierung ----------
+OBSERVATION_KEYS = ("players", "hands", "discards", "current", "wished_suit", "pending_draw")
+
+def observation(state):
+    """Nur was determinize() braucht — klein zu pickeln (ohne Undo, RNGs, Log, Journal).
+    Fremde Hände gehen nur über ihre Kartenzahl ein."""
+    obs = {k: state[k] for k in OBSERVATION_KEYS}
+    obs["decks"] = state.get("decks", 1)
+    return obs
+
+def determinize(state, me, rng):
+    """Leichte Kopie mit zufällig verteilten unbekannten Karten (Sicht von me)."""
+    discards = list(state["discards"])
+    left = [state.get("decks", 1)] * 32  # noch unbekannte Exemplare je Karte
+    for c in discards:
+        left[c] -= 1
+    for c in iter_cards(state["hands"][me]):
+        left[c] -= 1
+    unknown = [c for c in range(32) for _ in range(left[c])]
+    rng.shuffle(unknown)
+    hands = {}
+    for p in state["players"]:
+        if p == me:
+            hands[p] = state["hands"][p]
+            continue
+        m = 0
+        for _ in range(state["hands"][p].bit_count()):
+            m = add_card(m, unknown.pop())
+        hands[p] = m
+    sim = {
+        "players": state["players"], "decks": state.get("decks", 1), "hands": hands, "draw_pile": unknown, "discards": discards,
+        "current": state["current"], "wished_suit": state["wished_suit"],
+        "pending_draw": state["pending_draw"], "skip_next": False,
+        "winner": None, "game_over": False, "reshuffles": 0, "moves": [],
+        "quiet": True,  # keine Ereignisse/Sprüche in Rollouts
+        "rng": rng, "bot_rng": rng,  # beide Ströme aus dem Such-RNG
+    }
+    reset_tracking(sim)
+    return sim
+
+
+# ---------- Suche ----------
+class Node:
+    __slots__ = ("children", "player", "visits", "wins", "avail")
+
+    def __init__(self, player=None, prior=0.0):
+        self.children = {}
+        self.player = player  # wer den Zug zu diesem Knoten gemacht hat
+        self.visits, self.wins = PRIOR[0], PRIOR[0] * prior  # Heuristik als Vorwissen
+        self.avail = 1
+
+    def ucb(self):
+        return self.wins / self.visits + UCB_C * math.sqrt(math.log(self.avail) / self.visits)
+
+def search(state, me, ms=None, rollouts=None, seed=None, play_drawn=True):
+    """Einzelprozess-Suche. Gibt ({Zug: Besuche}, Rollouts) zurück."""
+    rng = random.Random(seed)
+    root = Node()
+    deadline = time.perf_counter() + ms / 1000 if ms else math.inf
+    n = 0
+    while (rollouts is None or n < rollouts) and (n == 0 or time.perf_counter() < deadline):
+        sim = determinize(state, me, rng)
+        node, path = root, [root]
+        while not sim["game_over"]:
+            p = current_player(sim)
+            legal = legal_actions(sim, p)
+            kids = node.children
+            for a in legal:
+                if a in kids:
+                    kids[a].avail += 1
+            untried = [a for a in legal if a not in kids]
+            if untried:
+                h = heuristic_action(sim, p)
+                a = h if h in untried else rng.choice(untried)
+                node = kids[a] = Node(p, PRIOR[1] if a == h else PRIOR[2])
+                path.append(node)
+                apply_action(sim, p, a, play_drawn)
+                break
+            a = max(legal, key=lambda a: kids[a].ucb())
+            node = kids[a]
+            path.append(node)
+            apply_action(sim, p, a, play_drawn)
+        play_headless(sim, play_drawn, ROLLOUT_TURNS)
+        winner = sim["winner"]
+        for nd in path:
+            nd.visits += 1
+            if winner is not None and nd.player == winner:
+                nd.wins += 1
+        n += 1
+    return {a: k.visits - PRIOR[0] for a, k in root.children.items()}, n
+
+def _search_task(args):
+    return search(*args)
+
+_POOL = None
+
+def pool(workers):
+    """Prozess-Pool für Root-Parallelisierung: erst beim ersten Gebrauch angelegt,
+    per spawn (kein fork aus dem Streamlit-Server mit seinen Threads), bei
+    Prozessende geschlossen."""
+    global _POOL
+    if _POOL is None or _POOL._processes != workers:
+        close_pool()
+        _POOL = mp.get_context("spawn").Pool(workers)
+    return _POOL
+
+def close_pool():
+    global _POOL
+    if _POOL is not None:
+        _POOL.terminate()
+        _POOL.join()
+        _POOL = None
+
+atexit.register(close_pool)
+
+def choose(state, me, ms=None, rollouts=None, workers=1, play_drawn=True):
+    """Bester Zug für me (meistbesucht) und Zahl der Rollouts."""
+    legal = legal_actions(state, me)
+    if len(legal) == 1:
+        return legal[0], 0
+    seed = state["bot_rng"].getrandbits(64)
+    if workers > 1:
+        per = None if rollouts is None else -(-rollouts // workers)
+        obs = observation(state)
+        tasks = [(obs, me, ms, per, f"{seed}:{w}", play_drawn) for w in range(workers)]
+        results = pool(workers).map(_search_task, tasks)
+    else:
+        results = [search(state, me, ms, rollouts, seed, play_drawn)]
+    visits, n = {}, 0
+    for v, k in results:
+        n += k
+        for a, c in v.items():
+            visits[a] = visits.get(a, 0) + c
+    return max(legal, key=lambda a: visits.get(a, 0)), n
+
+def ismcts_turn(state, player, play_drawn=True):
+    """engine.BOT_TURNS-Eintrag; Budget aus state["ismcts"] (sonst DEFAULT_BUDGET)."""
+    budget = {**DEFAULT_BUDGET, **state.get("ismcts", {})}
+    action, n = choose(state, player, budget["ms"], budget["rollouts"], budget["workers"], play_drawn)
+    state["ismcts_rollouts"] = n
+    apply_action(state, player, action, play_drawn)
+
+engine.BOT_TURNS["ismcts"] = ismcts_turn
+
+
+# ---------- Stärke-Messung ----------
+def eval_game(task):
+    """Partie mit ISMCTS auf Sitz seat gegen Heuristiken, dazu dieselbe Partie nur mit Heuristiken."""
+    g, seed, seat, budget = task
+    players = [f"Bot {i}" for i in range(3)]
+    result = []
+    for bots in ({players[seat]: "ismcts"}, {}):
+        state = {"bots": bots, "ismcts": budget}
+        start_game(state, players, seed=f"{seed}:{g}")
+        rollouts = secs = 0
+        while not state["game_over"]:
+            p = current_player(state)
+            t = time.perf_counter()
+            engine.bot_turn(state, p)
+            if p == players[seat] and bots:
+                secs += time.perf_counter() - t
+                rollouts += state.pop("ismcts_rollouts", 0)
+        result.append((state["winner"] == players[seat], rollouts, secs))
+    return result
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="ISMCTS-Bot gegen die Heuristik (3 Spieler, Sitz rotiert)")
+    ap.add_argument("--games", type=int, default=200)
+    ap.add_argument("--ms", type=float, default=50, help="Zeitbudget pro Zug")
+    ap.add_argument("--rollouts", type=int, default=None, help="Rollout-Budget pro Zug")
+    ap.add_argument("--workers", type=int, default=mp.cpu_count(), help="Partien parallel")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    budget = {"ms": args.ms, "rollouts": args.rollouts, "workers": 1}
+    tasks = [(g, args.seed, g % 3, budget) for g in range(args.games)]
+    wins = base = rollouts = 0
+    secs = 0.0
+    with mp.Pool(args.workers) as p:
+        for i, ((w, r, s), (b, _, _)) in enumerate(p.imap_unordered(eval_game, tasks), 1):
+            wins += w
+            base += b
+            rollouts += r
+            secs += s
+            print(f"\r{i}/{args.games} Partien · ISMCTS {wins / i:.1%} · Heuristik {base / i:.1%}",
+                  end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+    n = args.games
+    se = math.sqrt(max(wins / n * (1 - wins / n), 1e-9) / n)
+    print(f"ISMCTS-Siegquote {wins / n:.1%} ± {1.96 * se:.1%} "
+          f"(dieselben Partien nur Heuristik: {base / n:.1%}, Zufall 33.3%)")
+    print(f"Rollouts/s {rollouts / max(secs, 1e-9):,.0f} pro Prozess · Ø {rollouts / max(n, 1):,.0f} je Partie")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Absturzsicheres Zug-Journal pro Session (SQLite im WAL-Modus).
+
+Nur aktiv, wenn MAUMAU_JOURNAL auf eine Datenbankdatei zeigt. Statt den
+ganzen Zustand bei jedem Zug zu serialisieren, hängt sync() nur die neuen
+Einträge aus state["moves"] an — alle Züge eines Reruns (inkl. Bot-Züge) in
+einer Transaktion. Alle SNAPSHOT_EVERY Züge kommt ein Snapshot (Pickle des
+Zustands ohne Undo-Stapel und Zugliste) dazu. load() nimmt den letzten
+Snapshot und spielt nur den kurzen Rest nach (engine.apply_moves).
+
+    games      (session, game) → seed, Spieler, Decks
+    moves      (session, game, ply) → op, Sitz, Argument
+    snapshots  (session, game, ply) → Pickle
+
+Undo (state["undo_rev"], von engine.restore hochgezählt) und neue Partien
+(anderer Seed) erkennt sync() selbst.
+Nach dem Laden stimmen Karten, Stapel und Mischzufall exakt; Bot- und
+Spruch-Zufall laufen ab dem Snapshot weiter (nur Kosmetik/Bot-Gleichstände).
+
+    MAUMAU_JOURNAL=maumau.db streamlit run mau-mau.py   # Reload mit ?sid=… setzt fort
+"""
+import json
+import os
+import pickle
+import sqlite3
+import threading
+from collections import deque
+
+from engine import UNDO_LIMIT, start_game, apply_moves
+from records import OPS, OP_CODE
+
+DB_PATH = os.environ.get("MAUMAU_JOURNAL")
+ENABLED = bool(DB_PATH)
+SNAPSHOT_EVERY = 64
+SKIP_KEYS = ("undo", "moves", "journal")  # nicht im Snapshot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    session TEXT, game INTEGER, seed TEXT, players TEXT, decks INTEGER,
+    PRIMARY KEY (session, game)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS moves (
+    session TEXT, game INTEGER, ply INTEGER, op INTEGER, seat INTEGER, arg INTEGER,
+    PRIMARY KEY (session, game, ply)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    session TEXT, game INTEGER, ply INTEGER, data BLOB,
+    PRIMARY KEY (session, game, ply)) WITHOUT ROWID;
+"""
+
+_db = None
+_lock = threading.Lock()
+
+
+def db():
+    """Eine Verbindung pro Prozess (Streamlit-Sessions laufen in Threads → Lock)."""
+    global _db
+    if _db is None:
+        _db = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        _db.execute("PRAGMA journal_mode=WAL")
+        _db.execute("PRAGMA synchronous=NORMAL")  # WAL: Commit ohne fsync, trotzdem konsistent
+        _db.executescript(SCHEMA)
+    return _db
+
+
+# ---------- Schreiben ----------
+def sync(state, session):
+    """Neue Züge seit dem letzten Aufruf anhängen (eine Transaktion). Gibt die Zahl zurück."""
+    if not ENABLED:
+        return 0
+    moves = state["moves"]
+    j = state.get("journal")
+    with _lock:
+        c = db()
+        c.execute("BEGIN")
+        try:
+            if j is None or j["seed"] != state["seed"]:  # neue Partie
+                game = c.execute("SELECT COALESCE(MAX(game), -1) + 1 FROM games WHERE session = ?",
+                                 (session,)).fetchone()[0]
+                c.execute("INSERT INTO games VALUES (?, ?, ?, ?, ?)",
+                          (session, game, json.dumps(state["seed"]), json.dumps(state["players"]),
+                           state.get("decks", 1)))
+                j = state["journal"] = {"game": game, "seed": state["seed"], "ply": 0, "snap": 0,
+                                          "rev": state.get("undo_rev", 0)}
+            key = (session, j["game"])
+            if j["rev"] != state.get("undo_rev", 0):
+                # Undo: Journal auf den gemeinsamen Anfang mit state["moves"] kürzen
+                keep = 0
+                for op, seat, arg in c.execute("SELECT op, seat, arg FROM moves WHERE session = ? "
+                                               "AND game = ? ORDER BY ply", key).fetchall():
+                    if keep == len(moves) or moves[keep] != (OPS[op], seat, arg):
+                        break
+                    keep += 1
+                c.execute("DELETE FROM moves WHERE session = ? AND game = ? AND ply >= ?", (*key, keep))
+                c.execute("DELETE FROM snapshots WHERE session = ? AND game = ? AND ply > ?", (*key, keep))
+                j["ply"], j["snap"], j["rev"] = keep, min(j["snap"], keep), state.get("undo_rev", 0)
+            new = moves[j["ply"]:]
+            c.executemany("INSERT INTO moves VALUES (?, ?, ?, ?, ?, ?)",
+                          [(*key, j["ply"] + i, OP_CODE[op], seat, arg) for i, (op, seat, arg) in enumerate(new)])
+            j["ply"] = len(moves)
+            if j["ply"] - j["snap"] >= SNAPSHOT_EVERY:
+                c.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)", (*key, j["ply"], dumps(state)))
+                j["snap"] = j["ply"]
+            c.execute("COMMIT")
+        except BaseException:
+            c.execute("ROLLBACK")
+            state.pop("journal", None)  # beim nächsten Mal als neue Partie schreiben
+            raise
+    return len(new)
+
+def dumps(state):
+    return pickle.dumps({k: v for k, v in state.items() if k not in SKIP_KEYS}, pickle.HIGHEST_PROTOCOL)
+
+
+# ---------- Laden ----------
+def load(session, state):
+    """Letzte Partie der Session in state laden. False, wenn es keine gibt."""
+    if not ENABLED:
+        return False
+    with _lock:
+        c = db()
+        row = c.execute("SELECT game, seed, players, decks FROM games WHERE session = ? "
+                        "ORDER BY game DESC LIMIT 1", (session,)).fetchone()
+        if row is None:
+            return False
+        game, seed, players, decks = row
+        key = (session, game)
+        moves = [(OPS[op], seat, arg) for op, seat, arg in c.execute(
+            "SELECT op, seat, arg FROM moves WHERE session = ? AND game = ? ORDER BY ply", key)]
+        snap = c.execute("SELECT ply, data FROM snapshots WHERE session = ? AND game = ? "
+                         "ORDER BY ply DESC LIMIT 1", key).fetchone()
+    keep = {k: state[k] for k in ("log_archive", "log_limit") if k in state}
+    if snap:
+        ply, data = snap
+        state.update(pickle.loads(data), **keep)
+        state["moves"] = moves[:ply]
+        state["undo"] = deque(maxlen=UNDO_LIMIT)
+    else:
+        ply = 0
+        state["decks"] = decks
+        start_game(state, json.loads(players), json.loads(seed))
+    apply_moves(state, moves[ply:])
+    state["journal"] = {"game": game, "seed": state["seed"], "ply": len(moves), "snap": ply,
+                        "rev": state.get("undo_rev", 0)}
+    return True
@@ -0,0 +1,112 @@
+"""Lastgenerator für server.py: viele Tische, zufällige legale Züge, Latenz-Perzentile.
+
+Jede Verbindung betreut tables/conns Tische reihum und schickt je Tisch einen
+legalen Zug (Karte, Wunsch, Ziehen oder Strafkarten); ist ein Spiel vorbei,
+wird am selben Tisch neu gegeben. Gemessen wird die Antwortzeit pro Zug
+(Client-Sicht, inkl. der Bot-Züge auf dem Server). Tische pro Kern =
+Tische / CPU-Auslastung des Servers, aus dessen "stats".
+
+    python loadgen.py --spawn --tables 2000 --conns 50 --duration 10
+    python loadgen.py --port 8765 --tables 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+
+async def call(reader, writer, msg):
+    writer.write(json.dumps(msg).encode() + b"\n")
+    reply = json.loads(await reader.readline())
+    if "error" in reply:
+        raise RuntimeError(reply["error"])
+    return reply
+
+def pick_move(view, rng):
+    """Zufälliger legaler Zug aus der Server-Sicht."""
+    tid = view["table"]
+    if view["game_over"]:
+        return {"op": "new", "table": tid}
+    if view["awaiting_wish"]:
+        return {"op": "wish", "table": tid, "suit": rng.randrange(4)}
+    if view["must_take"]:
+        return {"op": "take", "table": tid}
+    cards = [c for c in range(32) if view["playable"] >> c & 1]
+    if cards:
+        return {"op": "play", "table": tid, "card": rng.choice(cards)}
+    return {"op": "take" if view["pending"] else "draw", "table": tid}
+
+async def connection(host, port, n_tables, deadline, lat, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 16)
+    views = [await call(reader, writer, {"op": "join"}) for _ in range(n_tables)]
+    games = 0
+    while time.perf_counter() < deadline:
+        for i, view in enumerate(views):
+            msg = pick_move(view, rng)
+            games += msg["op"] == "new"
+            t0 = time.perf_counter()
+            views[i] = await call(reader, writer, msg)
+            lat.append(time.perf_counter() - t0)
+    for view in views:
+        await call(reader, writer, {"op": "leave", "table": view["table"]})
+    writer.close()
+    return games
+
+def percentile(xs, q):
+    return xs[min(len(xs) - 1, int(q * len(xs)))] if xs else float("nan")
+
+async def run(args):
+    per = [args.tables // args.conns + (i < args.tables % args.conns) for i in range(args.conns)]
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    before = await call(reader, writer, {"op": "stats"})
+    lat = []
+    t0 = time.perf_counter()
+    deadline = t0 + args.duration
+    games = await asyncio.gather(*(connection(args.host, args.port, n, deadline, lat, f"{args.seed}:{i}")
+                                   for i, n in enumerate(per) if n))
+    wall = time.perf_counter() - t0
+    after = await call(reader, writer, {"op": "stats"})
+    writer.close()
+
+    lat.sort()
+    cpu = (after["cpu_s"] - before["cpu_s"]) / (after["wall_s"] - before["wall_s"])
+    print(f"{args.tables} Tische über {args.conns} Verbindungen, {wall:.1f}s")
+    print(f"  Züge: {len(lat):,} ({len(lat) / wall:,.0f}/s), Partien beendet: {sum(games):,}")
+    print(f"  Latenz p50 {percentile(lat, .5) * 1e3:.2f} ms · p99 {percentile(lat, .99) * 1e3:.2f} ms"
+          f" · max {lat[-1] * 1e3:.2f} ms" if lat else "  keine Züge")
+    print(f"  Server-CPU {cpu:.0%} · Tische pro Kern ≈ {args.tables / max(cpu, 1e-9):,.0f}"
+          f" · Züge pro CPU-Sekunde {(after['moves'] - before['moves']) / max(after['cpu_s'] - before['cpu_s'], 1e-9):,.0f}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Lastgenerator für den Mau-Mau-Tischserver")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--tables", type=int, default=1000)
+    ap.add_argument("--conns", type=int, default=50)
+    ap.add_argument("--duration", type=float, default=10.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--spawn", action="store_true", help="server.py als Unterprozess starten")
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        server = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+        proc = subprocess.Popen([sys.executable, server, "--host", args.host, "--port", str(args.port)],
+                                stdout=subprocess.PIPE, text=True)
+        proc.stdout.readline()  # wartet auf "Mau-Mau-Server auf …"
+    try:
+        asyncio.run(run(args))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
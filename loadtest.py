@@ -0,0 +1,214 @@
+"""Lasttest für die Streamlit-Apps über streamlit.testing (AppTest), ganz ohne Netz.
+
+Jeder Worker-Prozess hält --sessions AppTest-Sessions einer App und klickt
+reihum in jeder einen zufälligen erlaubten Knopf (Legen, Ziehen, Wunsch,
+Strafkarten, "▶ Nächster Zug", nach Spielende "Neues Spiel"). So läuft
+pro Prozess immer genau ein Rerun → die CPU-Zeit des Prozesses in dieser
+Zeit ist die CPU pro Interaktion. Mehrere Prozesse (--procs) teilen sich
+die Kerne wie gleichzeitige Nutzer auf einem Host; die Latenz enthält also
+das Warten auf CPU.
+
+Ausgewertet wird je App: Rerun-Latenz (p50/p90/p99/max), CPU pro
+Interaktion, aufgeschlüsselt nach Aktion, Handgröße und Loglänge (wächst
+beides, wird jeder Rerun teurer?), und Speicher pro Session (RSS-Zuwachs
+des Prozesses ab der ersten Session, engine.state_bytes des Spielzustands,
+optional tracemalloc — das bremst Python aber spürbar). Zum Schluss eine
+grobe Kapazität: Sessions pro Kern bei --think Sekunden Bedenkzeit je Klick.
+
+    python loadtest.py                                   # beide Apps, 1 Prozess × 4 Sessions
+    python loadtest.py mau-mau.py --procs 4 --sessions 8 --duration 60 -o samples.jsonl
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import time
+import tracemalloc
+
+from engine import HUMAN, hand_size, state_bytes
+from loadgen import percentile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APPS = ("maumau.py", "mau-mau.py")
+TIMEOUT = 60  # s pro Rerun, bevor AppTest aufgibt
+HAND_BUCKETS = (0, 6, 11, 16, 21)     # Untergrenzen
+LOG_BUCKETS = (0, 40, 80, 120, 160)
+
+
+# ---------- Session ----------
+def rss_bytes():
+    """Resident Set Size des Prozesses (Linux: /proc/self/statm)."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+def classify(button):
+    """Knopf → Aktionsart (None = nicht Teil des Lastmix, z. B. Undo)."""
+    key, label = button.key or "", button.label
+    if key.startswith("play_"):
+        return "play"
+    if key.startswith("wish_"):
+        return "wish"
+    if label.startswith("▶"):
+        return "step"
+    if "1 Karte ziehen" in label:
+        return "draw"
+    if label.startswith("😬"):
+        return "take"
+    if "Neues Spiel" in label:
+        return "new"
+    return None
+
+def pick(at, rng, draw_prob):
+    """Nächster Klick wie ein Mensch: Wunsch/Strafkarten zuerst, sonst meist legen."""
+    options = {}
+    for b in at.button:
+        kind = classify(b)
+        if kind and not b.disabled:
+            options.setdefault(kind, []).append(b)
+    if at.session_state.state["game_over"]:
+        order = ("new",)
+    elif "wish" in options or "take" in options:
+        order = ("wish", "take")
+    elif "play" in options and rng.random() >= draw_prob:
+        order = ("play",)
+    else:
+        order = ("draw", "step", "play")
+    for kind in order:
+        if kind in options:
+            return kind, rng.choice(options[kind])
+    return None, None
+
+def interact(at, rng, draw_prob):
+    """Ein Klick + Rerun. → Messzeile oder None, wenn nichts klickbar ist."""
+    state = at.session_state.state
+    hand, log_len = hand_size(state, HUMAN), len(state["log"])
+    kind, button = pick(at, rng, draw_prob)
+    if button is None:
+        return None
+    t0, c0 = time.perf_counter(), time.process_time()
+    button.click().run(timeout=TIMEOUT)
+    lat, cpu = time.perf_counter() - t0, time.process_time() - c0
+    return {"action": kind, "ms": lat * 1e3, "cpu_ms": cpu * 1e3, "hand": hand, "log": log_len,
+            "state_kb": state_bytes(at.session_state.state) / 1024, "error": bool(at.exception)}
+
+
+# ---------- Worker ----------
+def run_worker(task):
+    """n Sessions einer App bis zur Deadline reihum bedienen → (Messzeilen, Speicher)."""
+    from streamlit.testing.v1 import AppTest
+
+    app, n, duration, seed, draw_prob, trace = task
+    rng = random.Random(seed)
+    samples, sessions = [], []
+    for i in range(n):
+        t0, c0 = time.perf_counter(), time.process_time()
+        sessions.append(AppTest.from_file(os.path.join(HERE, app), default_timeout=TIMEOUT).run())
+        samples.append({"action": "open", "ms": (time.perf_counter() - t0) * 1e3,
+                        "cpu_ms": (time.process_time() - c0) * 1e3, "hand": None, "log": None,
+                        "state_kb": None, "error": bool(sessions[-1].exception)})
+        if i == 0:  # Basislinie erst nach Importen, Kompilieren und Caches der ersten Session
+            rss0 = rss_bytes()
+            if trace:
+                tracemalloc.start()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        for i, at in enumerate(sessions):
+            row = interact(at, rng, draw_prob)
+            if row is None or row["error"]:  # festgefahren oder Fehler: Session neu öffnen
+                sessions[i] = AppTest.from_file(os.path.join(HERE, app), default_timeout=TIMEOUT).run()
+            if row is not None:
+                samples.append(row)
+    per = max(n - 1, 1)  # Zuwachs durch die übrigen Sessions (plus Wachstum der ersten)
+    mem = {"rss_kb": (rss_bytes() - rss0) / 1024 / per,
+           "state_kb": [state_bytes(at.session_state.state) / 1024 for at in sessions]}
+    if trace:
+        mem["traced_kb"] = tracemalloc.get_traced_memory()[0] / 1024 / per
+        tracemalloc.stop()
+    return samples, mem
+
+
+# ---------- Auswertung ----------
+def bucket(value, bounds):
+    """Index der Klasse und Beschriftung, z. B. (1, "6–10")."""
+    i = max((k for k, lo in enumerate(bounds) if value >= lo), default=0)
+    hi = bounds[i + 1] if i + 1 < len(bounds) else None
+    return i, f"{bounds[i]}–{hi - 1}" if hi else f"{bounds[i]}+"
+
+def stats_line(rows):
+    lat = sorted(r["ms"] for r in rows)
+    cpu = sum(r["cpu_ms"] for r in rows) / len(rows)
+    return (f"n {len(rows):>6,} · p50 {percentile(lat, .5):7.1f} · p90 {percentile(lat, .9):7.1f} · "
+            f"p99 {percentile(lat, .99):7.1f} · max {lat[-1]:7.1f} ms · CPU Ø {cpu:6.1f} ms")
+
+def grouped(rows, key):
+    groups = {}
+    for r in rows:
+        groups.setdefault(key(r), []).append(r)
+    return sorted(groups.items())
+
+def report(app, args, samples, mems, wall):
+    moves = [r for r in samples if r["action"] != "open"]
+    opens = [r for r in samples if r["action"] == "open"]
+    errors = sum(r["error"] for r in samples)
+    print(f"{app} · {args.procs} Prozess(e) × {args.sessions} Sessions · {len(moves):,} Interaktionen "
+          f"in {wall:.1f}s ({len(moves) / wall:,.1f}/s) · Fehler {errors}")
+    if not moves:
+        return
+    print(f"  alle        {stats_line(moves)}")
+    print(f"  öffnen      {stats_line(opens)}")
+    print("  nach Aktion:")
+    for kind, rows in grouped(moves, lambda r: r["action"]):
+        print(f"    {kind:<10}{stats_line(rows)}")
+    print("  nach Handgröße (Karten vor dem Klick):")
+    for (_, label), rows in grouped(moves, lambda r: bucket(r["hand"], HAND_BUCKETS)):
+        print(f"    {label:<10}{stats_line(rows)}")
+    print("  nach Loglänge (Einträge im Ringpuffer):")
+    for (_, label), rows in grouped(moves, lambda r: bucket(r["log"], LOG_BUCKETS)):
+        kb = sum(r["state_kb"] for r in rows) / len(rows)
+        print(f"    {label:<10}{stats_line(rows)} · Zustand Ø {kb:5.1f} kB")
+    states = sorted(kb for m in mems for kb in m["state_kb"])
+    line = (f"  Speicher je Session: RSS +{sum(m['rss_kb'] for m in mems) / len(mems):,.0f} kB · "
+            f"Spielzustand p50 {percentile(states, .5):.1f} kB, max {states[-1]:.1f} kB")
+    if args.tracemalloc:
+        line += f" · tracemalloc {sum(m['traced_kb'] for m in mems) / len(mems):,.0f} kB"
+    print(line)
+    cpu = sum(r["cpu_ms"] for r in moves) / len(moves) / 1e3
+    print(f"  Kapazität ≈ {args.think / max(cpu, 1e-9):,.0f} Sessions pro Kern "
+          f"(ein Klick alle {args.think:g}s, CPU-gebunden, ohne Netz/Browser)")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mau-Mau: Streamlit-Apps mit vielen Sessions belasten (AppTest)")
+    ap.add_argument("apps", nargs="*", default=list(APPS), help="App-Dateien (Standard: beide)")
+    ap.add_argument("--procs", type=int, default=1, help="Worker-Prozesse (gleichzeitige Last)")
+    ap.add_argument("--sessions", type=int, default=4, help="Sessions pro Prozess")
+    ap.add_argument("--duration", type=float, default=20.0, help="Sekunden pro App")
+    ap.add_argument("--draw-prob", type=float, default=0.3,
+                    help="ziehen statt legen (größere Hände, längere Partien)")
+    ap.add_argument("--think", type=float, default=5.0, help="Bedenkzeit je Klick für die Kapazität")
+    ap.add_argument("--tracemalloc", action="store_true", help="Python-Speicher exakt (langsamer)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("-o", "--out", help="alle Messzeilen als JSONL")
+    args = ap.parse_args(argv)
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    try:
+        for app in args.apps:
+            tasks = [(app, args.sessions, args.duration, f"{args.seed}:{app}:{p}", args.draw_prob,
+                      args.tracemalloc) for p in range(args.procs)]
+            t0 = time.perf_counter()
+            with mp.Pool(args.procs) as pool:
+                results = pool.map(run_worker, tasks)
+            wall = time.perf_counter() - t0
+            samples = [r for rows, _ in results for r in rows]
+            report(app, args, samples, [m for _, m in results], wall)
+            if out:
+                out.writelines(json.dumps({"app": app, **r}) + "\n" for r in samples)
+    finally:
+        if out:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
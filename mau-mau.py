@@ -1,216 +1,115 @@
-import random
-import time
 import html
 import os
+import time
 import streamlit as st
 
-# ---------- Rerun-Wrapper ----------
-def RERUN():
-    if hasattr(st, "rerun"):
-        st.rerun()
-    else:
-        st.experimental_rerun()
+from engine import (
+    SUITS, HUMAN, LAYER_REP, card_str, start_game, current_player,
+    hand_size, iter_cards, copies, playable_mask,
+    must_take_pending, do_one_bot_step, run_bots_until_human,
+    log_archive_path, enforce_memory_budget, MEMORY_BUDGET,
+    human_play, human_wish, human_take_pending, human_draw, push_undo, undo,
+)
+from render import emoji_suit, card_html, suit_badge_html, log_entry_html, css_html, hand_html, history, last_quip
+from st_helpers import RERUN, timed_fragment, timings_caption, mark_run_start, mark_run_end, avatar_thumb, session_id
+import journal
+import profiler
+import solver  # registriert engine.ENDGAME: Bots spielen Endspiele exakt (state["endgame"])
+profiler.install(globals())  # nur mit MAUMAU_PROFILE: Engine-Aufrufe mitzählen
 
 # ---------- Spielkonfiguration ----------
-SUITS = ["♠", "♥", "♦", "♣"]
-RANKS = ["7", "8", "9", "10", "J", "Q", "K", "A"]
-PLAYERS = ["Du", "Spieler 1", "Spieler 2"]
-START_CARDS = 5
-
-# Farben & Bilder
-PLAYER_BG = {"Du":"#e7f0ff","Spieler 1":"#e8f7ee","Spieler 2":"#fff7d6","System":"#f2f2f2"}
-PLAYER_BORDER = {"Du":"#6aa0ff","Spieler 1":"#45c08b","Spieler 2":"#e5c300","System":"#e0e0e0"}
-PLAYER_IMG = {"Du":None, "Spieler 1":"spieler.png", "Spieler 2":"spielerin.png"}
-
-# ---------- Darstellung ----------
-def emoji_suit(s): return {"♥":"♥️","♦":"♦️","♠":"♠","♣":"♣"}[s]
-def suit_color(s): return "#d00" if s in ("♥","♦") else "#111"
-def card_str(card): r,s=card; return f"{r}{s}"
-
-def card_html(card, size="md"):
-    r,s = card
-    col = suit_color(s)
-    pads = {"sm":"8px 12px","md":"12px 16px","lg":"16px 22px","xl":"26px 34px"}
-    fonts = {"sm":"1.05rem","md":"1.25rem","lg":"1.5rem","xl":"1.95rem"}
-    brds = {"sm":"2px","md":"3px","lg":"4px","xl":"5px"}
-    return f"""
-    <div style="
-      display:inline-block;padding:{pads[size]};margin:6px 6px 10px 0;
-      border:{brds[size]} solid {col};border-radius:16px;font-weight:900;
-      font-size:{fonts[size]};letter-spacing:.2px;
-      font-family: ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Helvetica,Arial;
-      color:{col};background:#fff;box-shadow:0 2px 6px rgba(0,0,0,.12);user-select:none;">
-      {html.escape(r)}{emoji_suit(s)}
-    </div>
-    """
-
-def suit_badge_html(s):
-    col=suit_color(s)
-    return f"<span style='border:2px solid {col};color:{col};padding:2px 10px;border-radius:10px;font-weight:900;background:#fff;margin-left:8px'>{emoji_suit(s)}</span>"
+# Regeln & Bots liegen in engine.py (ohne Streamlit-Import).
+MAX_BOTS, MAX_DECKS, PANELS_PER_ROW = 9, 4, 5
+AUTOPLAY_PACE = 0.6  # Sekunden pro Bot-Zug
+SLOTS = {}  # st.empty-Platzhalter von Spielfeld und Verlauf (für Autoplay)
+
+def table_players(bots):
+    return [HUMAN, *(f"Spieler {i}" for i in range(1, bots + 1))]
+
+PLAYERS = table_players(2)
+
+# Farben & Bilder (Spieler 1, 2, … reihum)
+_PALETTE = [("#e8f7ee","#45c08b"), ("#fff7d6","#e5c300"), ("#fde8ec","#e0607e"),
+            ("#efe8fd","#8a6ae0"), ("#e6f6fb","#3bb0d0")]
+_HERE = os.path.dirname(os.path.abspath(__file__))
+PLAYER_BG = {"Du":"#e7f0ff","System":"#f2f2f2"}
+PLAYER_BORDER = {"Du":"#6aa0ff","System":"#e0e0e0"}
+PLAYER_IMG = {"Du":None}
+for _i, _p in enumerate(table_players(MAX_BOTS)[1:]):
+    PLAYER_BG[_p], PLAYER_BORDER[_p] = _PALETTE[_i % len(_PALETTE)]
+    PLAYER_IMG[_p] = os.path.join(_HERE, "spielerin.png" if _i % 2 else "spieler.png")
 
 # ---------- State-Setup ----------
 def init_session():
     st.session_state.initialized=True
-    st.session_state.state={}
-    start_game(st.session_state.state)
-
-def new_deck(): return [(r,s) for s in SUITS for r in RANKS]
-
-def start_game(state):
-    deck=new_deck(); random.shuffle(deck)
-    hands={p:[] for p in PLAYERS}
-    for _ in range(START_CARDS):
-        for p in PLAYERS: hands[p].append(deck.pop())
-    top=deck.pop()
-    while top[0]=="J":
-        deck.insert(0,top); random.shuffle(deck); top=deck.pop()
-    state.update(dict(
-        hands=hands, draw_pile=deck, discards=[top],
-        current=0, wished_suit=None, pending_draw=0, skip_next=False,
-        winner=None, game_over=False,
-        log=[("System", f"Start {card_str(top)}", top, None)],
-        awaiting_wish=False,
-        last_action={p: {"card":None,"quip":None,"ts":0.0} for p in PLAYERS},
-    ))
-
-# ---------- Engine ----------
-def reshuffle_if_needed(state):
-    if not state["draw_pile"]:
-        if len(state["discards"])<=1: return
-        top=state["discards"][-1]; pool=state["discards"][:-1]
-        random.shuffle(pool); state["draw_pile"]=pool; state["discards"]=[top]
-        state["log"].append(("System","Ziehstapel gemischt",None,None))
-
-def draw_cards(state, player, n):
-    for _ in range(n):
-        reshuffle_if_needed(state)
-        if not state["draw_pile"]: break
-        state["hands"][player].append(state["draw_pile"].pop())
-
-def can_play(card, top_card, wished_suit):
-    r,s=card
-    if wished_suit: return r=="J" or s==wished_suit
-    return r=="J" or r==top_card[0] or s==top_card[1]
-
-def end_if_winner(state, player):
-    if len(state["hands"][player])==0:
-        state["winner"]=player; state["game_over"]=True; return True
-    return False
-
-def quip(action):
-    return random.choice({
-        "play":["Taktische Eleganz.","Nur Statistik.","Kalkuliert. Irgendwie.","Elegant wie ein Presslufthammer 😎"],
-        "draw":["Sammelkartenmodus.","Ich liebe Überraschungen 🎁","Nur eine — was soll schiefgehen?"],
-        "skip":["Nur kurz raus.","Kein Timing, ehrlich."],
-        "wish":["Ich wünsche mir … genau das.","Wunsch frei, Realität folgt."],
-    }[action])
-
-def mark_last_action(state, player, card=None, q=None):
-    state["last_action"][player]={"card":card,"quip":q,"ts":time.time()}
-
-def play_card(state, player, card):
-    state["hands"][player].remove(card)
-    state["discards"].append(card)
-    state["wished_suit"]=None
-    state["log"].append((player, f"legt {card_str(card)}", card, None))
-    if card[0]=="7": state["pending_draw"]+=2
-    elif card[0]=="8": state["skip_next"]=True
-    end_if_winner(state, player)
-
-def enforce_pending_draw(state):
-    cur=PLAYERS[state["current"]]
-    if state["pending_draw"]>0:
-        top=state["discards"][-1]
-        can_stack=any((c[0]=="7") and can_play(c,top,state["wished_suit"]) for c in state["hands"][cur])
-        if not can_stack:
-            draw_cards(state,cur,state["pending_draw"])
-            state["log"].append((cur,f"zieht {state['pending_draw']}",None,None))
-            mark_last_action(state,cur,None,quip("draw"))
-            state["pending_draw"]=0
-            return True
-    return False
-
-def advance_turn(state): state["current"]=(state["current"]+1)%len(PLAYERS)
-
-def bot_choose_wish(hand):
-    suit_counts={s:0 for s in SUITS}
-    for r,s in hand: suit_counts[s]+=1
-    return max(suit_counts.items(), key=lambda x:(x[1],random.random()))[0]
-
-def do_one_bot_step(state):
-    """Genau EINEN Bot-Schritt (manuell per Button)."""
-    if state["game_over"]: return
-    player = PLAYERS[state["current"]]
-    if player=="Du": return
-
-    if enforce_pending_draw(state):
-        advance_turn(state); return
-
-    hand=state["hands"][player]; top=state["discards"][-1]
-    playable=[c for c in hand if can_play(c,top,state["wished_suit"])]
-
-    if not playable:
-        reshuffle_if_needed(state)
-        if state["draw_pile"]:
-            drawn=state["draw_pile"].pop(); hand.append(drawn)
-            state["log"].append((player,"zieht 1",None,None))
-            mark_last_action(state,player,None,quip("draw"))
-        else:
-            state["log"].append((player,"kann nicht ziehen",None,None))
-        advance_turn(state)
-        return
-
-    def score(c):
-        if c[0]=="7": return 0
-        if c[0]=="8": return 1
-        if c[0]=="J": return 3
-        return 2
-    playable.sort(key=score)
-    chosen=playable[0]
-    play_card(state, player, chosen)
-    mark_last_action(state,player,chosen,quip("play"))
-
-    if state["game_over"]:
-        if state["winner"]=="Du":
-            try: st.balloons()
-            except: pass
-        else:
-            try: st.snow()
-            except: pass
-        return
-
-    if chosen[0]=="J":
-        wish=bot_choose_wish(hand)
-        state["wished_suit"]=wish
-        state["log"].append((player,"wünscht",None,wish))
-        mark_last_action(state, player, None, quip("wish"))
-
-    if state["skip_next"]:
-        nxt=PLAYERS[(state["current"]+1)%len(PLAYERS)]
-        state["log"].append(("System",f"{nxt} aussetzen",None,None))
-        mark_last_action(state, player, None, quip("skip"))
-        advance_turn(state)
-        state["skip_next"]=False
-    advance_turn(state)
+    st.session_state.sid = session_id(journal.ENABLED)
+    st.session_state.state={"log_limit":160, "log_archive":log_archive_path(st.session_state.sid),
+                            "endgame":True}  # Bots wechseln im Endspiel auf solver.py
+    if not journal.load(st.session_state.sid, st.session_state.state):  # Reload/Neustart: weiterspielen
+        start_game(st.session_state.state, PLAYERS)
 
 # ---------- UI ----------
 st.set_page_config(page_title="Mau-Mau (32 Karten)", page_icon="🃏", layout="wide")
-st.title("🃏 Mau-Mau · 32 Karten (Skat) — 2 Spieler + Du")
+mark_run_start()
 
 if "initialized" not in st.session_state: init_session()
 state = st.session_state.state
+st.title(f"🃏 Mau-Mau · 32 Karten (Skat) — {len(state['players']) - 1} Spieler + Du")  # Gegnerzahl ist einstellbar
+st.markdown(css_html(), unsafe_allow_html=True)  # Karten-Klassen (render.CARD_CSS)
+mem_bytes = enforce_memory_budget(state)
+
+def act(action, *args):
+    """Aktion ausführen, dann neu zeichnen (jede Aktion ändert Tisch, Verlauf und Undo)."""
+    push_undo(state)
+    action(state, *args)
+    journal.sync(state, st.session_state.sid)  # st.rerun() bricht ab, das Skriptende kommt nicht
+    RERUN()
 
 left, right = st.columns([5,3], gap="large")
 
 with left:
     with st.sidebar:
         st.header("Spielkontrolle")
+        with st.expander("Tisch"):
+            n_bots = st.number_input("Gegner", 2, MAX_BOTS, len(state["players"]) - 1)
+            n_decks = st.number_input("Decks (je 32 Karten)", 1, MAX_DECKS, state.get("decks", 1))
         if st.button("🔁 Neues Spiel", use_container_width=True):
-            start_game(state); RERUN()
+            old = state.get("decks", 1)
+            state["decks"] = n_decks
+            try:
+                start_game(state, table_players(n_bots)); RERUN()
+            except ValueError as e:  # z. B. 9 Gegner mit einem Deck
+                state["decks"] = old
+                st.error(f"{e} – mehr Decks wählen.")
+        if st.button("↩️ Rückgängig", use_container_width=True, disabled=not state.get("undo")):
+            undo(state); RERUN()
         st.caption("Regeln: 7=+2, 8=Aussetzen, J=Bube wünscht Farbe.")
+        st.caption(f"Session-Speicher: {mem_bytes/1024:.1f} / {MEMORY_BUDGET/1024:.0f} kB")
+        timings_caption()
+
+        # Bot-Stärke: ismcts.py/policy.py erst bei Bedarf importieren (Kaltstart)
+        kinds = {"Heuristik": None, "Gelernt": "linear:linear", "ISMCTS": "ismcts"}
+        current = next(iter(state.get("bots", {}).values()), None)
+        specs = list(kinds.values())
+        kind = st.radio("🧠 Bots", list(kinds), index=specs.index(current) if current in specs else 0, horizontal=True)
+        if kinds[kind] == "ismcts":
+            import ismcts  # registriert engine.BOT_TURNS["ismcts"]
+            ms = st.slider("Bedenkzeit pro Bot-Zug (ms)", 50, 1000, state.get("ismcts", {}).get("ms", 200), step=50)
+            state["ismcts"] = {"ms": ms, "workers": min(4, os.cpu_count() or 1)}
+            if state.get("ismcts_rollouts"):
+                st.caption(f"Letzter Bot-Zug: {state['ismcts_rollouts']:,} Rollouts")
+        if kinds[kind]:
+            state["bots"] = {p: kinds[kind] for p in state["players"] if p != HUMAN}
+        else:
+            state.pop("bots", None)
+        # Endspiel-Tipp: solver.py rechnet die letzten Karten für dich durch (Bots tun das immer)
+        if st.toggle("♟️ Endspiel-Tipp (exakt)", value=state.get("endgame_hint", False)):
+            state["endgame_hint"] = True
+        else:
+            state.pop("endgame_hint", None)
 
         # Step-Button in der Farbe des aktuellen Spielers
-        cur = PLAYERS[state["current"]]
+        cur = current_player(state)
         bg = PLAYER_BG.get(cur, "#fff")
         bd = PLAYER_BORDER.get(cur, "#999")
         st.markdown(
@@ -221,160 +120,185 @@ with left:
         step_clicked = st.button(label, use_container_width=True, type="primary", disabled=(cur=="Du"))
         st.markdown("</div>", unsafe_allow_html=True)
         if step_clicked:
+            push_undo(state)
             do_one_bot_step(state)
             RERUN()
+        if st.button("⏭ Bis ich dran bin", use_container_width=True, disabled=(cur=="Du" or state["game_over"])):
+            push_undo(state)  # alle Bot-Züge in einem Update, ein Undo-Schritt
+            run_bots_until_human(state, play_drawn=False)
+            RERUN()
+        if st.toggle("⏩ Autoplay", key="autoplay"):
+            st.slider("Tempo (s pro Bot-Zug)", 0.0, 2.0, AUTOPLAY_PACE, 0.1, key="autoplay_pace")
+
+    def table_view():
+        # Zentrale große Ablage (oben, groß)
+        st.markdown("<div style='height:6px'></div>", unsafe_allow_html=True)
+        center = st.columns([1,1,1])
+        with center[1]:
+            st.markdown(card_html(state["discards"][-1], size="xl"), unsafe_allow_html=True)
+
+        # Statuszeile
+        cols=st.columns(4)
+        cols[0].markdown(f"<div style='font-size:1.15rem'><b>Aktuell:</b> {html.escape(current_player(state))}</div>", unsafe_allow_html=True)
+        cols[1].markdown(f"<div style='font-size:1.15rem'><b>Wunsch:</b> {SUITS[state['wished_suit']] if state['wished_suit'] is not None else '—'}</div>", unsafe_allow_html=True)
+        cols[2].markdown(f"<div style='font-size:1.15rem'><b>Ziehstapel:</b> {len(state['draw_pile'])}</div>", unsafe_allow_html=True)
+        cols[3].markdown(f"<div style='font-size:1.15rem'><b>Abwurf:</b> {len(state['discards'])}</div>", unsafe_allow_html=True)
+
+        # Spielerfelder mit Farbe & Bild (Thumbnail aus dem Cache, via st.image), bis zu 5 pro Reihe
+        players = state["players"]
+        per_row = min(len(players), PANELS_PER_ROW)
+        with profiler.section("Spielerfelder"):
+            for row in range(0, len(players), per_row):
+                for col, p in zip(st.columns(per_row), players[row:row + per_row]):
+                    with col:
+                        player_panel(p)
+
+    @timed_fragment("Spielfeld")
+    def table_pane():
+        SLOTS["table"] = st.empty()  # Autoplay zeichnet hier neu, ohne Rerun
+        with SLOTS["table"].container():
+            table_view()
+
+    def player_panel(p):
+        """Ein Spielerfeld: Name, Kartenzahl, Avatar, letzte Karte und Spruch."""
+        bg=PLAYER_BG[p]; bd=PLAYER_BORDER[p]
+        with st.container(border=True):
+            st.markdown(
+                f"<div style='background:{bg};border:3px solid {bd};border-radius:12px;padding:10px'>",
+                unsafe_allow_html=True
+            )
+            top_row = st.columns([1,3]) if PLAYER_IMG[p] else st.columns([1])
+            if PLAYER_IMG[p]:
+                thumb = avatar_thumb(PLAYER_IMG[p])  # einmal pro Prozess verkleinert
+                if thumb:
+                    top_row[0].image(thumb, width=72)
+            with top_row[-1]:
+                st.markdown(f"<div style='font-weight:900;font-size:1.2rem'>{html.escape(p)}</div>", unsafe_allow_html=True)
+                st.markdown(f"<div style='font-size:1.1rem'>Karten: <b>{hand_size(state, p)}</b></div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        la = state["last_action"].get(p)
+        if la and la[0] is not None:
+            st.markdown(card_html(la[0], size="lg"), unsafe_allow_html=True)
+        q = last_quip(state, p)  # erst hier formuliert (render.quip)
+        if q:
+            st.markdown(f"<div style='font-size:1.15rem;opacity:.95'><em>{html.escape(q)}</em></div>", unsafe_allow_html=True)
+
+    def show_hint():
+        """Endspiel-Tipp (solver.py), gecacht je Stellung."""
+        cached = st.session_state.get("hint")
+        if not cached or cached[0] != state["log_seq"]:
+            cached = (state["log_seq"], solver.hint(state, HUMAN, play_drawn=False))
+            st.session_state["hint"] = cached
+        if cached[1]:
+            st.info(f"💡 Endspiel-Tipp: {cached[1]}")
+
+    @timed_fragment("Hand")
+    def hand_pane():
+        # --- Dein Zug nur wenn du dran bist ---
+        is_your_turn = (current_player(state) == HUMAN)
+
+        # Wunschfarbe nach Bube – nur wenn du dran bist
+        if state.get("awaiting_wish"):
+            if is_your_turn:
+                st.info("Du hast einen Buben gespielt. Wähle eine Wunschfarbe:")
+                wc = st.columns(4)
+                for i,s in enumerate(SUITS):
+                    if wc[i].button(emoji_suit(s), key=f"wish_{s}"): act(human_wish, i)
+            else:
+                st.info("Wunschfarbe folgt – du bist gleich dran.")
+            return
 
-    # Zentrale große Ablage (oben, groß)
-    st.markdown("<div style='height:6px'></div>", unsafe_allow_html=True)
-    center = st.columns([1,1,1])
-    with center[1]:
-        st.markdown(card_html(state["discards"][-1], size="xl"), unsafe_allow_html=True)
-
-    # Statuszeile
-    cols=st.columns(4)
-    cols[0].markdown(f"<div style='font-size:1.15rem'><b>Aktuell:</b> {html.escape(PLAYERS[state['current']])}</div>", unsafe_allow_html=True)
-    cols[1].markdown(f"<div style='font-size:1.15rem'><b>Wunsch:</b> {html.escape(state['wished_suit'] or '—')}</div>", unsafe_allow_html=True)
-    cols[2].markdown(f"<div style='font-size:1.15rem'><b>Ziehstapel:</b> {len(state['draw_pile'])}</div>", unsafe_allow_html=True)
-    cols[3].markdown(f"<div style='font-size:1.15rem'><b>Abwurf:</b> {len(state['discards'])}</div>", unsafe_allow_html=True)
-
-    # Spielerfelder mit Farbe & Bild (ohne file://, via st.image)
-    pc = st.columns(3)
-    for col, p in zip(pc, PLAYERS):
-        with col:
-            bg=PLAYER_BG[p]; bd=PLAYER_BORDER[p]
-            with st.container(border=True):
-                st.markdown(
-                    f"<div style='background:{bg};border:3px solid {bd};border-radius:12px;padding:10px'>",
-                    unsafe_allow_html=True
-                )
-                top_row = st.columns([1,3]) if PLAYER_IMG[p] else st.columns([1])
-                if PLAYER_IMG[p]:
-                    img_path = os.path.join(os.getcwd(), PLAYER_IMG[p])
-                    if os.path.exists(img_path):
-                        top_row[0].image(img_path, width=72)
-                with top_row[-1]:
-                    st.markdown(f"<div style='font-weight:900;font-size:1.2rem'>{html.escape(p)}</div>", unsafe_allow_html=True)
-                    st.markdown(f"<div style='font-size:1.1rem'>Karten: <b>{len(state['hands'][p])}</b></div>", unsafe_allow_html=True)
-                st.markdown("</div>", unsafe_allow_html=True)
-
-            la = state["last_action"].get(p, {})
-            if la.get("card"):
-                st.markdown(card_html(la["card"], size="lg"), unsafe_allow_html=True)
-            if la.get("quip"):
-                st.markdown(f"<div style='font-size:1.15rem;opacity:.95'><em>{html.escape(la['quip'])}</em></div>", unsafe_allow_html=True)
-
-    st.divider()
-
-    # --- Dein Zug nur wenn du dran bist ---
-    is_your_turn = (PLAYERS[state["current"]] == "Du")
+        hand = state["hands"][HUMAN]
 
-    # Wunschfarbe nach Bube – nur wenn du dran bist
-    if state.get("awaiting_wish"):
         if is_your_turn:
-            st.info("Du hast einen Buben gespielt. Wähle eine Wunschfarbe:")
-            wc = st.columns(4); picked=None
-            for i,s in enumerate(SUITS):
-                if wc[i].button(emoji_suit(s), key=f"wish_{s}"): picked=s
-            if picked:
-                state["wished_suit"]=picked
-                state["log"].append(("Du","wünscht",None,picked))
-                state["last_action"]["Du"]={"card":None,"quip":quip("wish"),"ts":time.time()}
-                state["awaiting_wish"]=False  # wichtig: nicht hängen bleiben
-                advance_turn(state); RERUN()
-            st.stop()
-        else:
-            st.info("Wunschfarbe folgt – du bist gleich dran.")
-            st.stop()
+            st.subheader("🧑 Deine Karten (du bist dran)")
+            if state.get("endgame_hint"):
+                show_hint()
 
-    hand = state["hands"]["Du"]
-    top = state["discards"][-1]
-
-    if is_your_turn:
-        st.subheader("🧑 Deine Karten (du bist dran)")
-
-        # Pflichtziehen (7) – falls nicht stapelbar
-        if state["pending_draw"]>0:
-            can_stack = any((c[0]=="7") and can_play(c, top, state["wished_suit"]) for c in hand)
-            if not can_stack:
+            # Pflichtziehen (7) – falls nicht stapelbar
+            if must_take_pending(state, HUMAN):
                 if st.button(f"😬 {state['pending_draw']} Karten ziehen", type="primary"):
-                    draw_cards(state,"Du",state["pending_draw"])
-                    state["log"].append(("Du",f"zieht {state['pending_draw']}",None,None))
-                    state["last_action"]["Du"]={"card":None,"quip":quip("draw"),"ts":time.time()}
-                    state["pending_draw"]=0
-                    advance_turn(state); RERUN()
-
-        playable=[c for c in hand if can_play(c, top, state["wished_suit"])]
-        unplayable=[c for c in hand if c not in playable]
-
-        grid = st.columns(6)
-        for idx,c in enumerate(playable):
-            with grid[idx%6]:
-                st.markdown(card_html(c, size="md"), unsafe_allow_html=True)
-                if st.button(f"🂡 Legen: {card_str(c)}", key=f"play_{c[0]}_{c[1]}_{idx}"):
-                    play_card(state,"Du",c)
-                    if state["game_over"]:
-                        try: st.balloons()
-                        except: pass
-                        RERUN()
-                    state["last_action"]["Du"]={"card":c,"quip":quip("play"),"ts":time.time()}
-                    if c[0]=="J":
-                        state["awaiting_wish"]=True
-                        RERUN()
-                    if state["skip_next"]:
-                        nxt=PLAYERS[(state["current"]+1)%len(PLAYERS)]
-                        state["log"].append(("System",f"{nxt} aussetzen",None,None))
-                        state["last_action"]["Du"]={"card":None,"quip":quip("skip"),"ts":time.time()}
-                        advance_turn(state); state["skip_next"]=False
-                    advance_turn(state); RERUN()
-
-        if unplayable:
-            st.caption("Nicht spielbar:")
-            ugrid=st.columns(6)
-            for idx,c in enumerate(unplayable):
-                with ugrid[idx%6]:
-                    st.markdown(card_html(c, size="sm"), unsafe_allow_html=True)
-
-        if st.button("🂠 1 Karte ziehen", disabled=(state["pending_draw"]>0)):
-            reshuffle_if_needed(state)
-            if state["draw_pile"]:
-                drawn=state["draw_pile"].pop(); state["hands"]["Du"].append(drawn)
-                state["log"].append(("Du","zieht 1",None,None))
-                state["last_action"]["Du"]={"card":None,"quip":quip("draw"),"ts":time.time()}
-            else:
-                state["log"].append(("System","Ziehstapel leer",None,None))
-            advance_turn(state); RERUN()
-    else:
-        st.subheader("🧑 Deine Karten (warte auf deinen Zug)")
-        grid = st.columns(6)
-        for idx,c in enumerate(hand):
-            with grid[idx%6]:
-                st.markdown(card_html(c, size="sm"), unsafe_allow_html=True)
-        st.caption("Du bist nicht am Zug. Nutze in der Sidebar: **▶ Nächster Zug**.")
+                    act(human_take_pending)
+
+            pmask=playable_mask(state, HUMAN)
+            playable=list(iter_cards(pmask))  # je Karte ein Button, auch bei mehreren Exemplaren
+            unplayable=sorted(iter_cards(hand & ~(pmask * LAYER_REP)))
+
+            with profiler.section("Handraster"):
+                grid = st.columns(6)
+                for idx,c in enumerate(playable):
+                    with grid[idx%6]:
+                        st.markdown(card_html(c, size="md"), unsafe_allow_html=True)
+                        n = copies(hand, c)
+                        if st.button(f"🂡 Legen: {card_str(c)}" + (f" (×{n})" if n > 1 else ""), key=f"play_{c}"):
+                            act(human_play, c)  # Spielende: Ballons im Verlauf
+
+                if unplayable:
+                    st.caption("Nicht spielbar:")
+                    st.markdown(hand_html(unplayable, "sm"), unsafe_allow_html=True)
+
+            if st.button("🂠 1 Karte ziehen", disabled=(state["pending_draw"]>0)):
+                act(human_draw)
+        else:
+            st.subheader("🧑 Deine Karten (warte auf deinen Zug)")
+            st.markdown(hand_html(sorted(iter_cards(hand)), "sm"), unsafe_allow_html=True)
+            st.caption("Du bist nicht am Zug. Nutze in der Sidebar: **▶ Nächster Zug**, **⏭ Bis ich dran bin** oder **⏩ Autoplay**.")
 
-with right:
-    st.subheader("🗒️ Verlauf (neueste oben)")
-    for entry in reversed(state["log"][-160:]):
-        sp,msg,c,w=("System","",None,None)
-        if isinstance(entry,(list,tuple)):
-            if len(entry)>=1: sp=entry[0]
-            if len(entry)>=2: msg=entry[1]
-            if len(entry)>=3: c=entry[2]
-            if len(entry)>=4: w=entry[3]
-        bg=PLAYER_BG.get(sp,"#fff"); bd=PLAYER_BORDER.get(sp,"#ccc")
-        line=f"{html.escape(sp)}: {html.escape(msg)}"
-        badge = suit_badge_html(w) if w in SUITS else ""
-        st.markdown(
-            f"<div style='border:3px solid {bd};border-radius:14px;padding:10px 12px;margin-bottom:10px;background:{bg};font-size:1.15rem'>{line}{badge}</div>",
-            unsafe_allow_html=True
-        )
+    table_pane()
+    st.divider()
+    hand_pane()
 
-    if state["game_over"]:
-        if state["winner"]=="Du":
-            st.success(f"🏁 {state['winner']} gewinnt! 🎉"); 
-            try: st.balloons()
-            except: pass
-        else:
-            st.error(f"🏁 {state['winner']} gewinnt. 😢"); 
-            try: st.snow()
-            except: pass
-        st.stop()
+with right:
+    def history_view():
+        # Ein HTML-Block statt eines Elements pro Eintrag, gecacht je Log-Revision
+        with profiler.section("Verlauf"):
+            seq = state.get("log_seq", 0)
+            cached = st.session_state.get("history_html")
+            if not cached or cached[0] != seq:
+                parts = []
+                for sp,msg,c,w in history(state):  # Texte entstehen erst hier
+                    bg=PLAYER_BG.get(sp,"#fff"); bd=PLAYER_BORDER.get(sp,"#ccc")
+                    badge = suit_badge_html(SUITS[w]) if w is not None else ""
+                    parts.append(log_entry_html(sp, msg, badge, bg, bd))
+                cached = (seq, "".join(parts))
+                st.session_state["history_html"] = cached
+            st.markdown(cached[1], unsafe_allow_html=True)
+
+    @timed_fragment("Verlauf")
+    def history_pane():
+        st.subheader("🗒️ Verlauf (neueste oben)")
+        SLOTS["history"] = st.empty()
+        with SLOTS["history"].container():
+            history_view()
+
+        if state["game_over"]:
+            if state["winner"] is None:
+                st.warning("🏁 Patt – die Partie kommt nicht mehr voran. 🤝")
+            elif state["winner"]==HUMAN:
+                st.success(f"🏁 {state['winner']} gewinnt! 🎉"); 
+                try: st.balloons()
+                except: pass
+            else:
+                st.error(f"🏁 {state['winner']} gewinnt. 😢"); 
+                try: st.snow()
+                except: pass
+
+    history_pane()
+
+# ---------- Autoplay ----------
+# Bot-Züge im selben Skriptlauf: Spielfeld und Verlauf in ihren Platzhaltern
+# neu zeichnen, dazwischen pausieren. Erst wenn du dran bist, ein voller Rerun.
+if st.session_state.get("autoplay") and not state["game_over"] and current_player(state) != HUMAN:
+    while not state["game_over"] and current_player(state) != HUMAN:
+        time.sleep(st.session_state.get("autoplay_pace", AUTOPLAY_PACE))
+        push_undo(state)
+        do_one_bot_step(state)
+        with SLOTS["table"].container():
+            table_view()
+        with SLOTS["history"].container():
+            history_view()
+    RERUN()
+
+journal.sync(state, st.session_state.sid)  # neue Züge dieses Reruns in einer Transaktion
+mark_run_end()
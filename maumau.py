@@ -1,263 +1,63 @@
-import random
 import streamlit as st
 
-# --- Kompatibler Rerun-Wrapper (neu/alt Streamlit) ---
-def RERUN():
-    if hasattr(st, "rerun"):
-        st.rerun()
-    else:
-        st.experimental_rerun()
+from engine import (
+    SUITS, HUMAN, LAYER_REP, card_str, start_game, current_player,
+    hand_size, iter_cards, copies, playable_mask, must_take_pending, run_bots_until_human,
+    log_archive_path, enforce_memory_budget, MEMORY_BUDGET,
+    human_play, human_wish, human_take_pending, human_draw, push_undo, undo,
+)
+from render import emoji_suit, chip_html as card_html, bubble_html, css_html, hand_html, history
+from st_helpers import RERUN, timed_fragment, timings_caption, mark_run_start, mark_run_end, session_id
+import journal
+import profiler
+import solver  # registriert engine.ENDGAME: Bots spielen Endspiele exakt (state["endgame"])
+profiler.install(globals())  # nur mit MAUMAU_PROFILE: Engine-Aufrufe mitzählen
 
 # -------------- Game Config (Mau-Mau, 32-Karten Skatdeck) -----------------
-SUITS = ["♠", "♥", "♦", "♣"]  # Logik-Symbole (schwarz/rot Darstellung separat)
-RANKS = ["7", "8", "9", "10", "J", "Q", "K", "A"]
-PLAYERS = ["Du", "Bot 1", "Bot 2"]
-START_CARDS = 5
+# Regeln & Bots liegen in engine.py (ohne Streamlit-Import).
+MAX_BOTS, MAX_DECKS = 9, 4
 
-# Mau-Mau-Regeln (häufige Variante):
-# - Nach Farbe ODER Rang legen
-# - 7 = +2 ziehen (stapelbar)
-# - 8 = Aussetzen
-# - J = Bube → Wunschfarbe
-# - Stapel leer → Nachziehstapel wird aus Ablagestapel neu gemischt
+def table_players(bots):
+    return [HUMAN, *(f"Bot {i}" for i in range(1, bots + 1))]
 
-
-# -------------- Hilfsfunktionen -------------------------------------------
-
-def emoji_suit(s):
-    # Für Darstellung: Herz/Karo rot (Emoji), Pik/Kreuz schwarz
-    return {"♥": "♥️", "♦": "♦️", "♠": "♠", "♣": "♣"}[s]
-
-def card_str(card):
-    r, s = card
-    return f"{r}{s}"
-
-def card_html(card):
-    """Gerahmte Card-UI mit Farbe (♥/♦ rot, ♣/♠ schwarz)."""
-    r, s = card
-    suit = emoji_suit(s)
-    color = "#d00" if s in ("♥", "♦") else "#111"
-    border = f"2px solid {color}"
-    return f"""
-    <div style="
-        display:inline-block;
-        padding:6px 10px;
-        margin:4px;
-        border:{border};
-        border-radius:10px;
-        font-weight:700;
-        font-family: ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial;
-        color:{color};
-        background:#fff;
-        box-shadow: 0 1px 2px rgba(0,0,0,.06);
-        user-select:none;
-        ">
-        {r}{suit}
-    </div>
-    """
-
-def can_play(card, top_card, wished_suit):
-    r, s = card
-    if wished_suit:
-        return r == "J" or s == wished_suit
-    return r == "J" or r == top_card[0] or s == top_card[1]
-
-def new_deck():
-    return [(r, s) for s in SUITS for r in RANKS]
-
-def reshuffle_if_needed(state):
-    if not state["draw_pile"]:
-        if len(state["discards"]) <= 1:
-            return
-        top = state["discards"][-1]
-        pool = state["discards"][:-1]
-        random.shuffle(pool)
-        state["draw_pile"] = pool
-        state["discards"] = [top]
-        state["log"].append(("System", "🔄 Ziehstapel neu gemischt.", None))
-
-def draw_cards(state, player, n):
-    for _ in range(n):
-        reshuffle_if_needed(state)
-        if not state["draw_pile"]:
-            break
-        state["hands"][player].append(state["draw_pile"].pop())
-
-def next_player_index(i):
-    return (i + 1) % len(PLAYERS)
-
-def start_game(state):
-    deck = new_deck()
-    random.shuffle(deck)
-
-    hands = {p: [] for p in PLAYERS}
-    for _ in range(START_CARDS):
-        for p in PLAYERS:
-            hands[p].append(deck.pop())
-
-    top = deck.pop()
-    while top[0] == "J":  # nicht mit Bube starten
-        deck.insert(0, top)
-        random.shuffle(deck)
-        top = deck.pop()
-
-    state.update(dict(
-        hands=hands,
-        draw_pile=deck,
-        discards=[top],
-        current=0,
-        wished_suit=None,
-        pending_draw=0,
-        skip_next=False,
-        winner=None,
-        game_over=False,
-        log=[("System", f"🃏 Startkarte: {card_str(top)}", top)],
-        awaiting_wish=False,
-    ))
-
-def say(player, line):
-    """Fügt eine witzige Dialogzeile in den Log ein."""
-    state["log"].append((player, line, None))
-
-def quip_after_action(player, action, card=None):
-    """Kleine Sprüche nach Aktionen."""
-    jokes_play = [
-        "Dezent wie ein Presslufthammer 😎",
-        "Ich nenne das: taktische Eleganz.",
-        "Hoffentlich war das nicht dein Lieblingsanzug.",
-        "Nichts Persönliches. Nur Statistik.",
-        "Das war kalkuliert. Irgendwie.",
-    ]
-    jokes_draw = [
-        "Zieh ich halt. Sammelkartenmodus aktiviert.",
-        "Ich liebe Überraschungen 🎁",
-        "Deck, enttäusch mich nicht!",
-        "Nur eine. Was soll schon passieren?",
-    ]
-    jokes_skip = [
-        "Ups, da fliegt jemand aus der Runde. Nur kurz!",
-        "Ich schwöre, das war kein Timing.",
-    ]
-    jokes_wish = [
-        "Und ich wünsche mir… genau diese Farbe.",
-        "Wunsch frei, Realität folgt.",
-    ]
-    if action == "play":
-        say(player, random.choice(jokes_play))
-    elif action == "draw":
-        say(player, random.choice(jokes_draw))
-    elif action == "skip":
-        say(player, random.choice(jokes_skip))
-    elif action == "wish":
-        say(player, random.choice(jokes_wish))
-
-def play_card(state, player, card):
-    state["hands"][player].remove(card)
-    state["discards"].append(card)
-    state["log"].append((player, f"▶️ spielt {card_str(card)}", card))
-    state["wished_suit"] = None
-
-    rank = card[0]
-    if rank == "7":
-        state["pending_draw"] += 2
-    elif rank == "8":
-        state["skip_next"] = True
-    # J: Wunsch folgt separat
-
-    if len(state["hands"][player]) == 0:
-        state["winner"] = player
-        state["game_over"] = True
-
-def enforce_pending_draw(state):
-    cur = PLAYERS[state["current"]]
-    if state["pending_draw"] > 0:
-        top = state["discards"][-1]
-        can_stack = any((c[0] == "7") and can_play(c, top, state["wished_suit"])
-                        for c in state["hands"][cur])
-        if not can_stack:
-            draw_cards(state, cur, state["pending_draw"])
-            state["log"].append((cur, f"😬 zieht {state['pending_draw']} Karten.", None))
-            quip_after_action(cur, "draw")
-            state["pending_draw"] = 0
-            return True
-    return False
-
-def advance_turn(state):
-    state["current"] = next_player_index(state["current"])
-
-
-def bot_choose_wish(hand):
-    suit_counts = {s: 0 for s in SUITS}
-    for r, s in hand:
-        suit_counts[s] += 1
-    return max(suit_counts.items(), key=lambda x: (x[1], random.random()))[0]
-
-def bot_turn(state, player):
-    if state["game_over"]:
-        return
-    if enforce_pending_draw(state):
-        advance_turn(state)
-        return
-
-    hand = state["hands"][player]
-    top = state["discards"][-1]
-    playable = [c for c in hand if can_play(c, top, state["wished_suit"])]
-
-    if not playable:
-        reshuffle_if_needed(state)
-        if state["draw_pile"]:
-            drawn = state["draw_pile"].pop()
-            hand.append(drawn)
-            state["log"].append((player, "🂠 zieht 1 Karte.", None))
-            quip_after_action(player, "draw")
-            if can_play(drawn, top, state["wished_suit"]):
-                play_card(state, player, drawn)
-                quip_after_action(player, "play", drawn)
-                if drawn[0] == "J" and not state["game_over"]:
-                    wish = bot_choose_wish(hand)
-                    state["wished_suit"] = wish
-                    state["log"].append((player, f"🎯 wünscht {wish}", None))
-                    quip_after_action(player, "wish")
-        else:
-            state["log"].append((player, "🂠 kann nicht ziehen (leer).", None))
-    else:
-        def score(c):
-            if c[0] == "7": return 0
-            if c[0] == "8": return 1
-            if c[0] == "J": return 3
-            return 2
-        playable.sort(key=score)
-        chosen = playable[0]
-        play_card(state, player, chosen)
-        quip_after_action(player, "play", chosen)
-        if chosen[0] == "J" and not state["game_over"]:
-            wish = bot_choose_wish(hand)
-            state["wished_suit"] = wish
-            state["log"].append((player, f"🎯 wünscht {wish}", None))
-            quip_after_action(player, "wish")
-
-    if state["skip_next"] and not state["game_over"]:
-        nxt = PLAYERS[next_player_index(state["current"])]
-        state["log"].append(("System", f"⏭️ {nxt} wird übersprungen.", None))
-        quip_after_action(player, "skip")
-        advance_turn(state)
-        state["skip_next"] = False
-
-    if not state["game_over"]:
-        advance_turn(state)
+PLAYERS = table_players(2)
 
 
 # -------------- Streamlit UI ----------------------------------------------
 
 st.set_page_config(page_title="Mau-Mau (32 Karten)", page_icon="🃏", layout="wide")
-st.title("🃏 Mau-Mau · 32 Karten (Skat) — 2 Bots + Du")
+mark_run_start()
 
 # Session init
 if "initialized" not in st.session_state:
     st.session_state.initialized = True
-    st.session_state.state = {}
-    start_game(st.session_state.state)
+    st.session_state.sid = session_id(journal.ENABLED)
+    st.session_state.state = {
+        "quips_in_log": True,  # Sprüche erscheinen im Verlauf
+        "log_limit": 120,      # Ringpuffer: so viel zeigt der Verlauf
+        "log_archive": log_archive_path(st.session_state.sid),
+        "endgame": True,       # Bots wechseln im Endspiel auf solver.py
+    }
+    if not journal.load(st.session_state.sid, st.session_state.state):  # Reload/Neustart: weiterspielen
+        start_game(st.session_state.state, PLAYERS)
 state = st.session_state.state
+st.title(f"🃏 Mau-Mau · 32 Karten (Skat) — {len(state['players']) - 1} Bots + Du")  # Botzahl ist einstellbar
+st.markdown(css_html(), unsafe_allow_html=True)  # Karten-Klassen (render.CARD_CSS)
+mem_bytes = enforce_memory_budget(state)
+
+# Bots vorziehen bis du dran bist
+run_bots_until_human(state)
+
+
+def act(action, *args):
+    """Deine Aktion, danach ziehen die Bots; dann neu zeichnen."""
+    push_undo(state)  # Rückgängig nimmt deinen Zug samt Bot-Antworten zurück
+    action(state, *args)
+    if not state["game_over"] and not state["awaiting_wish"]:
+        run_bots_until_human(state)
+    journal.sync(state, st.session_state.sid)  # st.rerun() bricht ab, das Skriptende kommt nicht
+    RERUN()
+
 
 # Layout: 2 Spalten — links Spielfeld, rechts Spielverlauf (neueste oben)
 left, right = st.columns([2, 1], gap="large")
@@ -265,142 +65,136 @@ left, right = st.columns([2, 1], gap="large")
 with left:
     with st.sidebar:
         st.header("Spielkontrolle")
+        with st.expander("Tisch"):
+            n_bots = st.number_input("Bots", 2, MAX_BOTS, len(state["players"]) - 1)
+            n_decks = st.number_input("Decks (je 32 Karten)", 1, MAX_DECKS, state.get("decks", 1))
         if st.button("🔁 Neues Spiel", use_container_width=True):
-            start_game(state)
+            old = state.get("decks", 1)
+            state["decks"] = n_decks
+            try:
+                start_game(state, table_players(n_bots))
+                RERUN()
+            except ValueError as e:  # z. B. 9 Bots mit einem Deck
+                state["decks"] = old
+                st.error(f"{e} – mehr Decks wählen.")
+        if st.button("↩️ Rückgängig", use_container_width=True, disabled=not state.get("undo")):
+            undo(state)
             RERUN()
         st.caption("Regeln: 7=+2, 8=Aussetzen, J=Bube wünscht Farbe. "
                    "Passend nach Farbe oder Rang; bei Wunschfarbe nur diese Farbe oder J.")
+        st.caption(f"Session-Speicher: {mem_bytes / 1024:.1f} / {MEMORY_BUDGET / 1024:.0f} kB")
+        timings_caption()
+        # Endspiel-Tipp: solver.py rechnet die letzten Karten für dich durch (Bots tun das immer)
+        if st.toggle("♟️ Endspiel-Tipp (exakt)", value=state.get("endgame_hint", False)):
+            state["endgame_hint"] = True
+        else:
+            state.pop("endgame_hint", None)
+
+    @timed_fragment("Status")
+    def status_pane():
+        # Statuszeile
+        cols = st.columns(4)
+        cols[0].markdown(f"**Aktueller Spieler:** {current_player(state)}")
+        cols[1].markdown(f"**Ablage oben:** {card_str(state['discards'][-1])}")
+        cols[2].markdown(f"**Wunschfarbe:** {SUITS[state['wished_suit']] if state['wished_suit'] is not None else '—'}")
+        cols[3].markdown(f"**Zugstapel:** {len(state['draw_pile'])} Karten")
+
+        # Gegner-Infos (bis zu 5 pro Reihe)
+        with profiler.section("Spielerfelder"):
+            bots = [p for p in state["players"] if p != HUMAN]
+            for row in range(0, len(bots), 5):
+                for oc, p in zip(st.columns(min(len(bots), 5)), bots[row:row + 5]):
+                    oc.subheader(f"🤖 {p}")
+                    oc.markdown(f"Karten: **{hand_size(state, p)}**")
+
+    def show_hint():
+        """Endspiel-Tipp (solver.py), gecacht je Stellung."""
+        cached = st.session_state.get("hint")
+        if not cached or cached[0] != state["log_seq"]:
+            cached = (state["log_seq"], solver.hint(state, HUMAN, play_drawn=True))
+            st.session_state["hint"] = cached
+        if cached[1]:
+            st.info(f"💡 Endspiel-Tipp: {cached[1]}")
+
+    @timed_fragment("Hand")
+    def hand_pane():
+        # Wunsch-Auswahl nach deinem Buben
+        if state.get("awaiting_wish"):
+            st.info("Du hast einen Buben gespielt. Wähle eine Wunschfarbe:")
+            wish_cols = st.columns(4)
+            for i, s in enumerate(SUITS):
+                label = emoji_suit(s)
+                if wish_cols[i].button(label, key=f"wish_{s}"):
+                    act(human_wish, i)
+            return
 
-    # Statuszeile
-    cols = st.columns(4)
-    cols[0].markdown(f"**Aktueller Spieler:** {PLAYERS[state['current']]}")
-    cols[1].markdown(f"**Ablage oben:** {card_str(state['discards'][-1])}")
-    cols[2].markdown(f"**Wunschfarbe:** {state['wished_suit'] or '—'}")
-    cols[3].markdown(f"**Zugstapel:** {len(state['draw_pile'])} Karten")
-
-    # Gegner-Infos
-    oc1, oc2 = st.columns(2)
-    oc1.subheader("🤖 Bot 1")
-    oc1.markdown(f"Karten: **{len(state['hands']['Bot 1'])}**")
-    oc2.subheader("🤖 Bot 2")
-    oc2.markdown(f"Karten: **{len(state['hands']['Bot 2'])}**")
-
-    st.divider()
-
-    # Bots vorziehen bis du dran bist
-    def run_bots_until_human(state):
-        safety = 0
-        while not state["game_over"] and PLAYERS[state["current"]] != "Du" and safety < 200:
-            bot_turn(state, PLAYERS[state["current"]])
-            safety += 1
-
-    # Wunsch-Auswahl nach deinem Buben
-    if state.get("awaiting_wish"):
-        st.info("Du hast einen Buben gespielt. Wähle eine Wunschfarbe:")
-        wish_cols = st.columns(4)
-        for i, s in enumerate(SUITS):
-            label = emoji_suit(s)
-            if wish_cols[i].button(label, key=f"wish_{s}"):
-                state["wished_suit"] = s
-                state["log"].append(("Du", f"🎯 wünscht {s}", None))
-                quip_after_action("Du", "wish")
-                state["awaiting_wish"] = False
-                advance_turn(state)
-                run_bots_until_human(state)
-                RERUN()
-        st.stop()
-
-    run_bots_until_human(state)
-
-    # Deine Karten (mit farbigen Rahmenchips + Play-Buttons)
-    st.subheader("🧑 Deine Karten")
+        # Deine Karten (mit farbigen Rahmenchips + Play-Buttons)
+        st.subheader("🧑 Deine Karten")
 
-    hand = state["hands"]["Du"]
-    top = state["discards"][-1]
+        hand = state["hands"][HUMAN]
+        your_turn = current_player(state) == HUMAN
+        if your_turn and state.get("endgame_hint"):
+            show_hint()
 
-    # Pending draw (7-Stack) — wenn nicht stapelbar: ziehen
-    if PLAYERS[state["current"]] == "Du" and state["pending_draw"] > 0:
-        can_stack = any((c[0] == "7") and can_play(c, top, state["wished_suit"]) for c in hand)
-        if not can_stack:
+        # Pending draw (7-Stack) — wenn nicht stapelbar: ziehen
+        if your_turn and must_take_pending(state, HUMAN):
             if st.button(f"😬 {state['pending_draw']} Karten ziehen", type="primary"):
-                draw_cards(state, "Du", state["pending_draw"])
-                state["log"].append(("Du", f"😬 zieht {state['pending_draw']} Karten.", None))
-                quip_after_action("Du", "draw")
-                state["pending_draw"] = 0
-                advance_turn(state)
-                run_bots_until_human(state)
-                RERUN()
-
-    playable = [c for c in hand if can_play(c, top, state["wished_suit"])]
-    unplayable = [c for c in hand if c not in playable]
-
-    # Kartenraster: Für jede Karte zeigen wir oben die farbige Karte (HTML),
-    # darunter den eigentlichen Spiel-Button.
-    grid = st.columns(8)
-    for idx, c in enumerate(playable):
-        with grid[idx % 8]:
-            st.markdown(card_html(c), unsafe_allow_html=True)
-            if st.button(f"legen · {card_str(c)}", key=f"play_{card_str(c)}_{random.random()}"):
-                play_card(state, "Du", c)
-                quip_after_action("Du", "play", c)
-                if c[0] == "J" and not state["game_over"]:
-                    state["awaiting_wish"] = True
-                    RERUN()
-                if state["skip_next"] and not state["game_over"]:
-                    nxt = PLAYERS[next_player_index(state["current"])]
-                    state["log"].append(("System", f"⏭️ {nxt} wird übersprungen.", None))
-                    quip_after_action("Du", "skip")
-                    advance_turn(state)
-                    state["skip_next"] = False
-                if not state["game_over"]:
-                    advance_turn(state)
-                    run_bots_until_human(state)
-                RERUN()
-
-    if unplayable:
-        st.caption("Nicht spielbar:")
-        ugrid = st.columns(8)
-        for idx, c in enumerate(unplayable):
-            with ugrid[idx % 8]:
-                st.markdown(card_html(c), unsafe_allow_html=True)
-
-    draw_disabled = state["pending_draw"] > 0 and PLAYERS[state["current"]] == "Du"
-    if st.button("🂠 1 Karte ziehen", disabled=draw_disabled):
-        reshuffle_if_needed(state)
-        if state["draw_pile"]:
-            drawn = state["draw_pile"].pop()
-            state["hands"]["Du"].append(drawn)
-            state["log"].append(("Du", "🂠 zieht 1 Karte.", None))
-            quip_after_action("Du", "draw")
-        else:
-            state["log"].append(("System", "🂠 Ziehstapel leer.", None))
-        advance_turn(state)
-        run_bots_until_human(state)
-        RERUN()
+                act(human_take_pending)
+
+        pmask = playable_mask(state, HUMAN)
+        playable = list(iter_cards(pmask))  # je Karte ein Button, auch bei mehreren Exemplaren
+        unplayable = sorted(iter_cards(hand & ~(pmask * LAYER_REP)))
+
+        # Kartenraster: Für jede Karte zeigen wir oben die farbige Karte (HTML),
+        # darunter den eigentlichen Spiel-Button.
+        with profiler.section("Handraster"):
+            grid = st.columns(8)
+            for idx, c in enumerate(playable):
+                with grid[idx % 8]:
+                    st.markdown(card_html(c), unsafe_allow_html=True)
+                    n = copies(hand, c)
+                    label = f"legen · {card_str(c)}" + (f" ×{n}" if n > 1 else "")
+                    if st.button(label, key=f"play_{card_str(c)}"):
+                        act(human_play, c)
+
+            if unplayable:
+                st.caption("Nicht spielbar:")
+                st.markdown(hand_html(unplayable, "chip"), unsafe_allow_html=True)
+
+        draw_disabled = state["pending_draw"] > 0 and your_turn
+        if st.button("🂠 1 Karte ziehen", disabled=draw_disabled):
+            act(human_draw)
+
+    status_pane()
+    st.divider()
+    hand_pane()
 
 with right:
-    st.subheader("🗒️ Spielverlauf (neueste oben)")
-    # Neueste oben: reverse iterieren
-    for speaker, line, c in reversed(state["log"][-120:]):
-        # Kleine Sprechblasen-Optik + ggf. Karte rendern
-        bubble_bg = "#f6f6f6" if speaker in ("System",) else "#fff"
-        speaker_tag = f"<strong>{speaker}:</strong> " if speaker not in ("System",) else ""
-        st.markdown(
-            f"""
-            <div style="
-                border:1px solid #e6e6e6;
-                border-radius:12px;
-                padding:8px 10px;
-                margin-bottom:8px;
-                background:{bubble_bg};
-                ">
-                {speaker_tag}{line}
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        if c:
-            st.markdown(card_html(c), unsafe_allow_html=True)
-
-    if state["game_over"]:
-        st.success(f"🏁 Spielende! **{state['winner']}** hat gewonnen.")
+    @timed_fragment("Verlauf")
+    def history_pane():
+        st.subheader("🗒️ Spielverlauf (neueste oben)")
+        # Ein HTML-Block (neueste oben), gecacht je Log-Revision
+        with profiler.section("Verlauf"):
+            seq = state.get("log_seq", 0)
+            cached = st.session_state.get("history_html")
+            if not cached or cached[0] != seq:
+                parts = []
+                for speaker, line, c, w in history(state, quips=state.get("quips_in_log")):
+                    # Kleine Sprechblasen-Optik + ggf. Karte rendern
+                    wish_tag = f" {emoji_suit(SUITS[w])}" if w is not None else ""
+                    parts.append(bubble_html(speaker, line, wish_tag))
+                    if c is not None:
+                        parts.append(card_html(c))
+                cached = (seq, "".join(parts))
+                st.session_state["history_html"] = cached
+            st.markdown(cached[1], unsafe_allow_html=True)
+
+        if state["game_over"] and state["winner"] is None:
+            st.warning("🏁 Spielende: Patt, die Partie kommt nicht mehr voran.")
+        elif state["game_over"]:
+            st.success(f"🏁 Spielende! **{state['winner']}** hat gewonnen.")
+
+    history_pane()
+
+journal.sync(state, st.session_state.sid)  # neue Züge dieses Reruns in einer Transaktion
+mark_run_end()
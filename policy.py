@@ -0,0 +1,257 @@
+"""Gelernte Bot-Policy: lineares Modell, als Nachschlagetabelle kompiliert.
+
+Kartenwahl: jede spielbare Karte c bekommt eine Punktzahl, gelegt wird die
+beste (bei Gleichstand die niedrigste Karten-ID, wie engine.bot_choose_card):
+
+    base[ctx][c]                       Rang-Gewicht + Angriff/Endspiel-Boni,
+                                       ctx = nächster Gegner ≤ SMALL Karten
+                                             + 2 · eigene Hand ≤ SMALL Karten
+  + suit_left   · (Karten der Farbe von c auf der Hand − 1)
+  + rank_left   · (Karten des Rangs von c auf der Hand − 1)
+  + suit_change · (c wechselt die Farbe gegenüber Ablage/Wunsch)
+
+Die kontextabhängigen Anteile stecken in base (4 × 32 Floats), zur Laufzeit
+bleiben drei Popcounts pro Kandidat — ein Zug kostet wenige µs. Die Masken
+kommen schon gefiltert an (engine.pending_playable: unter Strafkarten nur 7en).
+Wunsch nach einem Buben: Farbe mit der besten Summe aus w_count · Karten
+(ohne Buben), w_sevens · 7en, w_eights · 8en; Gleichstand per Zufall.
+
+Mit den Standardgewichten (DEFAULT_CARD/DEFAULT_WISH) spielt die Policy exakt
+wie die Heuristik (Wunsch wie "most_no_jacks"); policy.json enthält die per
+Selbstspiel gelernten Gewichte. Training: Cross-Entropy-Methode auf batchsim —
+jeder Kandidat spielt an Tischen mit 2, 3 und 4 Spielern auf jedem Sitz gegen
+den Mittelwert der Vorgeneration (Selbstspiel) und gegen die Heuristik, alle
+Kandidaten einer Generation mit denselben Partien (gemeinsame Zufallszahlen).
+
+Beim Import trägt sich das Modul als engine.SCORES["linear"] und
+engine.WISHES["linear"] ein (engine.strategy lädt es bei Bedarf):
+
+    state["bots"] = {"Spieler 1": "linear:linear"}
+
+    python policy.py train -o policy.json
+    python policy.py eval --games 200000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+import engine
+from batchsim import popcount, SUIT_MASK_NP
+from engine import (
+    SUIT_MASK, RANK_MASK, SEVENS, EIGHTS, JACKS, LAYER_REP, R7, R8, RJ,
+    next_player_index,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+POLICY_PATH = os.path.join(HERE, "policy.json")
+SMALL = 2  # "fast fertig": so viele Karten oder weniger
+
+RANK_FEATURES = ("r7", "r8", "r9", "r10", "rJ", "rQ", "rK", "rA")
+CARD_FEATURES = RANK_FEATURES + ("suit_left", "rank_left", "suit_change",
+                                 "attack7", "attack8", "attackJ", "lastJ")
+WISH_FEATURES = ("w_count", "w_sevens", "w_eights")
+DEFAULT_CARD = {"r7": 3.0, "r8": 2.0, "r9": 1.0, "r10": 1.0, "rJ": 0.0, "rQ": 1.0, "rK": 1.0, "rA": 1.0,
+                "suit_left": 0.0, "rank_left": 0.0, "suit_change": 0.0,
+                "attack7": 0.0, "attack8": 0.0, "attackJ": 0.0, "lastJ": 0.0}
+DEFAULT_WISH = {"w_count": 1.0, "w_sevens": 0.0, "w_eights": 0.0}
+
+# Masken über alle Schichten (mehrere Decks)
+SUIT_L = [m * LAYER_REP for m in SUIT_MASK]
+RANK_L = [m * LAYER_REP for m in RANK_MASK]
+WISH_L = [[(m & ~JACKS) * LAYER_REP, (m & SEVENS) * LAYER_REP, (m & EIGHTS) * LAYER_REP] for m in SUIT_MASK]
+
+CARD_SUIT = np.arange(32) >> 3
+CARD_RANK = np.arange(32) & 7
+BITS = np.arange(32, dtype=np.uint32)
+RANK_MASK_NP = np.array(RANK_MASK, dtype=np.uint32)
+WISH_NP = np.array([[m & 0xFFFFFFFF for m in row] for row in WISH_L], dtype=np.uint32)
+
+
+# ---------- Inferenz ----------
+class CardPolicy:
+    """Kartenwahl; choose() für engine.bot_turn, batch() für batchsim."""
+
+    def __init__(self, weights=None):
+        w = {**DEFAULT_CARD, **(weights or {})}
+        self.weights = w
+        self.suit_left, self.rank_left, self.suit_change = w["suit_left"], w["rank_left"], w["suit_change"]
+        base = np.empty((4, 32))
+        for ctx in range(4):
+            attack, last = ctx & 1, ctx >> 1
+            for c in range(32):
+                r = c & 7
+                base[ctx, c] = (w[RANK_FEATURES[r]]
+                                + attack * {R7: w["attack7"], R8: w["attack8"], RJ: w["attackJ"]}.get(r, 0.0)
+                                + last * (w["lastJ"] if r == RJ else 0.0))
+        self.base_np = base
+        self.base = base.tolist()
+
+    def choose(self, state, player, playable):
+        """Beste spielbare Karte (None = nichts spielbar)."""
+        if not playable:
+            return None
+        hand = state["hands"][player]
+        wished = state["wished_suit"]
+        suit = state["discards"][-1] >> 3 if wished is None else wished
+        nxt = state["players"][next_player_index(state, state["current"])]
+        base = self.base[(state["hands"][nxt].bit_count() <= SMALL) + 2 * (hand.bit_count() <= SMALL)]
+        a, b, d = self.suit_left, self.rank_left, self.suit_change
+        best = pick = None
+        while playable:
+            low = playable & -playable
+            c = low.bit_length() - 1
+            playable ^= low
+            score = (base[c] + a * ((hand & SUIT_L[c >> 3]).bit_count() - 1)
+                     + b * ((hand & RANK_L[c & 7]).bit_count() - 1) + d * (c >> 3 != suit))
+            if best is None or score > best:
+                best, pick = score, c
+        return pick
+
+    def batch(self, hands, playable, next_sizes, suit):
+        """Vektorisiert (ein Deck, uint32-Hände): Karten-ID je Zeile, wie choose()."""
+        ctx = (next_sizes <= SMALL) + 2 * (popcount(hands) <= SMALL)
+        suits = popcount(hands[:, None] & SUIT_MASK_NP)
+        ranks = popcount(hands[:, None] & RANK_MASK_NP)
+        score = (self.base_np[ctx] + self.suit_left * (suits[:, CARD_SUIT] - 1)
+                 + self.rank_left * (ranks[:, CARD_RANK] - 1) + self.suit_change * (CARD_SUIT != suit[:, None]))
+        score[(playable[:, None] >> BITS & 1) == 0] = -np.inf
+        return np.argmax(score, axis=1).astype(np.int8)
+
+
+class WishPolicy:
+    """Wunschfarbe nach einem Buben; Signatur wie engine.WISHES."""
+
+    def __init__(self, weights=None):
+        self.weights = {**DEFAULT_WISH, **(weights or {})}
+        self.w = [self.weights[k] for k in WISH_FEATURES]
+
+    def __call__(self, hand, rng=random):
+        wc, w7, w8 = self.w
+        scores = [wc * (hand & m).bit_count() + w7 * (hand & s).bit_count() + w8 * (hand & e).bit_count()
+                  for m, s, e in WISH_L]
+        return max(range(4), key=lambda s: (scores[s], rng.random()))
+
+    def batch(self, hands, rng):
+        """Vektorisiert: Wunschfarbe je Zeile (Gleichstand per Zufall aus rng)."""
+        wc, w7, w8 = self.w
+        scores = (wc * popcount(hands[:, None] & WISH_NP[:, 0]) + w7 * popcount(hands[:, None] & WISH_NP[:, 1])
+                  + w8 * popcount(hands[:, None] & WISH_NP[:, 2]))
+        best = scores == scores.max(axis=1, keepdims=True)
+        return np.argmax(best * (rng.random(best.shape) + 1), axis=1).astype(np.int8)
+
+
+def load(path=POLICY_PATH):
+    """(CardPolicy, WishPolicy) aus policy.json; ohne Datei die Standardgewichte."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+    return CardPolicy(data.get("card")), WishPolicy(data.get("wish"))
+
+engine.SCORES["linear"], engine.WISHES["linear"] = load()
+
+
+# ---------- Training ----------
+def split(x):
+    """Parametervektor → (Karten-, Wunschgewichte)."""
+    n = len(CARD_FEATURES)
+    return dict(zip(CARD_FEATURES, map(float, x[:n]))), dict(zip(WISH_FEATURES, map(float, x[n:])))
+
+def policies(x):
+    card, wish = split(x)
+    return CardPolicy(card), WishPolicy(wish)
+
+def vector(card, wish):
+    return np.array([card[k] for k in CARD_FEATURES] + [wish[k] for k in WISH_FEATURES])
+
+def win_rate(x, opponents, games, seed, players=3, play_drawn=True):
+    """Siegquote von x über alle Sitze; opponents = (orders, wishes) für die übrigen Sitze."""
+    from batchsim import simulate
+    card, wish = policies(x)
+    wins = 0
+    for seat in range(players):
+        orders, wishes = list(opponents[0]), list(opponents[1])
+        orders[seat], wishes[seat] = card, wish
+        res = simulate(games, seed=[seed, seat], players=players, play_drawn=play_drawn,
+                       orders=orders, wishes=wishes)
+        wins += int((res["winner"] == seat).sum())
+    return wins / (games * players)
+
+def lineups(mean, tables):
+    """Gegner für das Training je Tischgröße: Vorgeneration (Selbstspiel) und Heuristik."""
+    card, wish = policies(mean)
+    return [(p, ([card] * p, [wish] * p)) for p in tables] + [(p, ([None] * p, [None] * p)) for p in tables]
+
+def fitness(x, fights, games, seed):
+    """Siegquote relativ zum fairen Anteil (1.0 = so gut wie die Gegner), gemittelt."""
+    return np.mean([p * win_rate(x, opp, games, [*seed, k], p) for k, (p, opp) in enumerate(fights)])
+
+def train(generations=25, population=16, elite=4, games=2000, tables=(2, 3, 4), seed=0, sigma=1.0,
+          log=sys.stderr):
+    """Cross-Entropy-Methode über alle Tischgrößen; gibt den Mittelwert der letzten Generation zurück."""
+    rng = np.random.default_rng(seed)
+    mean = vector(DEFAULT_CARD, DEFAULT_WISH)
+    std = np.full(mean.size, sigma)
+    for gen in range(generations):
+        t = time.perf_counter()
+        pool = np.vstack([mean, mean + std * rng.standard_normal((population - 1, mean.size))])
+        fights = lineups(mean, tables)
+        fit = np.array([fitness(x, fights, games, (seed, gen)) for x in pool])
+        best = pool[np.argsort(fit)[::-1][:elite]]
+        noise = sigma * 0.2 * (1 - gen / generations)  # gegen zu frühes Zusammenfallen
+        mean, std = best.mean(axis=0), best.std(axis=0) + noise
+        print(f"Gen {gen + 1:>3}: Mittelwert der Vorgeneration {fit[0]:.4f} · "
+              f"bester {fit.max():.4f} · σ Ø {std.mean():.3f} ({time.perf_counter() - t:.1f}s)",
+              file=log, flush=True)
+    return mean
+
+def save(x, path, meta):
+    card, wish = split(x)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"card": {k: round(v, 4) for k, v in card.items()},
+                   "wish": {k: round(v, 4) for k, v in wish.items()}, "meta": meta}, f, indent=1)
+        f.write("\n")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mau-Mau: lineare Bot-Policy per Selbstspiel lernen und prüfen")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    t = sub.add_parser("train", help="Gewichte per Cross-Entropy-Methode auf batchsim lernen")
+    t.add_argument("--generations", type=int, default=25)
+    t.add_argument("--population", type=int, default=16)
+    t.add_argument("--elite", type=int, default=4)
+    t.add_argument("--games", type=int, default=2000, help="Partien je Kandidat, Sitz und Gegnerfeld")
+    t.add_argument("--players", default="2,3,4", help="Tischgrößen, kommagetrennt")
+    t.add_argument("--seed", type=int, default=0)
+    t.add_argument("-o", "--out", default=POLICY_PATH)
+    e = sub.add_parser("eval", help="Policy (Sitz für Sitz) gegen die Heuristik")
+    e.add_argument("--games", type=int, default=200_000, help="Partien je Sitz")
+    e.add_argument("--players", default="2,3,4", help="Tischgrößen, kommagetrennt")
+    e.add_argument("--seed", type=int, default=1)
+    e.add_argument("--policy", default=POLICY_PATH)
+    args = ap.parse_args(argv)
+    tables = [int(p) for p in args.players.split(",")]
+
+    if args.cmd == "train":
+        t0 = time.perf_counter()
+        x = train(args.generations, args.population, args.elite, args.games, tables, args.seed)
+        save(x, args.out, {"method": "cem", "generations": args.generations, "population": args.population,
+                           "games": args.games, "players": tables, "seed": args.seed})
+        print(f"→ {args.out} ({time.perf_counter() - t0:.0f}s)")
+    else:
+        card, wish = load(args.policy)
+        x = vector(card.weights, wish.weights)
+        for p in tables:
+            rate = win_rate(x, ([None] * p, [None] * p), args.games, args.seed, p)
+            print(f"{p} Spieler · Siegquote gegen {p - 1}× Heuristik: {rate:.2%} (fair: {1 / p:.2%}, "
+                  f"{args.games * p:,} Partien)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Optionaler Rerun-Profiler: Engine-Aufrufe und UI-Abschnitte pro Rerun timen.
+
+Nur aktiv, wenn MAUMAU_PROFILE gesetzt ist ("1" → maumau_profile.jsonl im
+Arbeitsverzeichnis, sonst der angegebene Pfad). Dann werden die Funktionen aus
+ENGINE_FUNCS im Modul engine (und per install(globals()) auch in der App)
+durch zählende Wrapper ersetzt. Gemessen wird nur, solange im Thread eine Messung
+hängt (attach) — Streamlit führt jede Session in eigenem Thread aus, andere
+Sessions und Headless-Code zahlen nur einen Funktionsaufruf extra.
+
+Pro Rerun eine JSONL-Zeile: Gesamtzeit, Engine-Zeit (äußerste Aufrufe, ohne
+Verschachtelung doppelt zu zählen), je Funktion [Aufrufe, ms inklusiv] und je
+UI-Abschnitt ms. Rest = Streamlit-Rendering und alles Ungemessene.
+
+    MAUMAU_PROFILE=1 streamlit run mau-mau.py
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import engine
+
+PROFILE_PATH = os.environ.get("MAUMAU_PROFILE")
+if PROFILE_PATH == "1":
+    PROFILE_PATH = "maumau_profile.jsonl"
+ENABLED = bool(PROFILE_PATH)
+
+ENGINE_FUNCS = (
+    "start_game", "play_card", "draw_one", "take_pending", "set_wish", "enforce_pending_draw",
+    "bot_turn", "run_bots_until_human", "do_one_bot_step",
+    "human_play", "human_wish", "human_take_pending", "human_draw",
+    "push_undo", "undo", "enforce_memory_budget",
+)
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def _wrap(name, fn):
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        prof = getattr(_local, "prof", None)
+        if prof is None:
+            return fn(*args, **kwargs)
+        prof["depth"] += 1
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            dt = time.perf_counter() - t0
+            prof["depth"] -= 1
+            f = prof["funcs"].setdefault(name, [0, 0.0])
+            f[0] += 1
+            f[1] += dt
+            if not prof["depth"]:
+                prof["engine"] += dt
+    timed.__profiled__ = fn
+    return timed
+
+def install(namespace=None):
+    """Engine-Funktionen einmal pro Prozess umhüllen; namespace (z. B. globals() der App)
+    bekommt die umhüllten Versionen für per from-import gebundene Namen."""
+    if not ENABLED:
+        return
+    for name in ENGINE_FUNCS:
+        fn = getattr(engine, name)
+        if not hasattr(fn, "__profiled__"):
+            setattr(engine, name, _wrap(name, fn))
+        if namespace is not None and name in namespace:
+            namespace[name] = getattr(engine, name)
+
+
+# ---------- Messung ----------
+def new():
+    """Frische Messung (None, wenn der Profiler aus ist)."""
+    if ENABLED:
+        return {"t0": time.perf_counter(), "funcs": {}, "sections": {}, "depth": 0, "engine": 0.0}
+
+def attach(prof):
+    """prof für den aktuellen Thread aktivieren (None = abmelden). Eine per
+    RERUN abgebrochene Messung kann so im nächsten Lauf weiterlaufen."""
+    _local.prof = prof
+    if prof is not None:
+        prof["depth"] = 0
+
+def active():
+    return getattr(_local, "prof", None) is not None
+
+@contextmanager
+def section(name):
+    """UI-Abschnitt timen (mehrfach je Rerun → aufsummiert), ohne darin ausgelöste Engine-Zeit."""
+    prof = getattr(_local, "prof", None)
+    if prof is None:
+        yield
+        return
+    t0, e0 = time.perf_counter(), prof["engine"]
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0 - (prof["engine"] - e0)
+        prof["sections"][name] = prof["sections"].get(name, 0.0) + dt
+
+def finish(prof, label, **extra):
+    """Messung abschließen, als JSONL-Zeile anhängen und die Zusammenfassung zurückgeben."""
+    if getattr(_local, "prof", None) is prof:
+        _local.prof = None
+    if prof is None:
+        return None
+    total = time.perf_counter() - prof["t0"]
+    ms = lambda s: round(s * 1000, 3)
+    row = {
+        "ts": round(time.time(), 3), "run": label, **extra,
+        "total_ms": ms(total), "engine_ms": ms(prof["engine"]),
+        "sections_ms": {k: ms(v) for k, v in prof["sections"].items()},
+        "funcs": {k: [n, ms(s)] for k, (n, s) in sorted(prof["funcs"].items(), key=lambda kv: -kv[1][1])},
+    }
+    row["rest_ms"] = round(row["total_ms"] - row["engine_ms"] - sum(row["sections_ms"].values()), 3)
+    with _write_lock, open(PROFILE_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return row
+
+def summary_lines(row, top=5):
+    """Kurzfassung für die Sidebar."""
+    if not row:
+        return []
+    lines = [f"{row['run']}: {row['total_ms']:.1f} ms gesamt · Engine {row['engine_ms']:.1f} ms · "
+             f"Rest (Streamlit) {row['rest_ms']:.1f} ms"]
+    lines += [f"▸ {k} {v:.1f} ms" for k, v in row["sections_ms"].items()]
+    lines += [f"· {k} ×{n} {s:.2f} ms" for k, (n, s) in list(row["funcs"].items())[:top]]
+    return lines
@@ -0,0 +1,194 @@
+"""Kompaktes Binärformat für Partien: ein Byte pro Zug, Millionen Partien pro Datei.
+
+Eine Partie ist durch (seed, Züge) vollständig bestimmt (engine.replay):
+Mischen und Ziehen folgen aus dem Seed, Aussetzen aus den gelegten 8ern.
+Gespeichert werden daher nur die Entscheidungen aus state["moves"].
+
+    Datei .mmr   b"MMR2", dann je Partie:
+                 Kopf  <QbBBI  seed (uint64, engine.seed_u64), Sieger-Sitz (-1 = Patt), Spieler, Decks, Zugzahl
+                 Züge  je 1 Byte: op << 5 | arg  (arg = Karte 0–31 bzw. Farbe 0–3)
+    Datei .idx   uint64-Offsets der Partien (little endian), für wahlfreien Zugriff
+
+    python records.py write games.mmr -n 1000000 --seed 1
+    python records.py info games.mmr
+    python records.py show games.mmr 123
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+
+from engine import start_game, play_headless, replay, seed_u64
+from render import history
+
+MAGIC = b"MMR2"
+HEAD = struct.Struct("<QbBBI")
+OFFSET = struct.Struct("<Q")
+OPS = ["play", "draw", "wish", "take", "end"]
+OP_CODE = {op: i for i, op in enumerate(OPS)}
+
+
+def encode_moves(moves):
+    """state["moves"] → bytes (Sitz entfällt: er ergibt sich beim Nachspielen)."""
+    return bytes(OP_CODE[op] << 5 | (arg or 0) for op, _, arg in moves)
+
+def decode_moves(data):
+    """bytes → [(op, None, arg)], direkt verwendbar für engine.replay()."""
+    return [(OPS[b >> 5], None, b & 31 if b >> 5 in (0, 2) else None) for b in data]
+
+
+# ---------- Schreiben ----------
+class RecordWriter:
+    """Hängt Partien an path (+ path.idx) an; Puffer werden beim close() geschrieben."""
+
+    def __init__(self, path):
+        new = not os.path.exists(path) or not os.path.getsize(path)
+        self.data = open(path, "ab", buffering=1 << 20)
+        self.idx = open(path + ".idx", "ab", buffering=1 << 16)
+        if new:
+            self.data.write(MAGIC)
+        self.offset = self.data.tell()
+
+    def write(self, seed, players, winner, moves, decks=1):
+        """moves = state["moves"] oder bereits kodierte bytes."""
+        body = moves if isinstance(moves, bytes) else encode_moves(moves)
+        self.idx.write(OFFSET.pack(self.offset))
+        self.data.write(HEAD.pack(seed_u64(seed), -1 if winner is None else winner, players, decks, len(body)))
+        self.data.write(body)
+        self.offset += HEAD.size + len(body)
+
+    def write_state(self, state):
+        winner = state["players"].index(state["winner"]) if state["winner"] else None
+        self.write(state["seed"], len(state["players"]), winner, state["moves"], state.get("decks", 1))
+
+    def close(self):
+        self.data.close()
+        self.idx.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------- Lesen ----------
+class RecordReader:
+    """Liest per mmap: weder Datei noch Index werden in den Speicher geladen."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:4] != MAGIC:
+            raise ValueError(f"{path}: kein Mau-Mau-Record")
+        self.idx = None
+        if os.path.exists(path + ".idx") and os.path.getsize(path + ".idx"):
+            with open(path + ".idx", "rb") as f:
+                self.idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        if self.idx is None:
+            return sum(1 for _ in self.offsets())
+        return len(self.idx) // OFFSET.size
+
+    def offsets(self):
+        """Offsets durch Scannen der Datei (ohne Index)."""
+        pos, end = len(MAGIC), len(self.data)
+        while pos < end:
+            yield pos
+            pos += HEAD.size + HEAD.unpack_from(self.data, pos)[4]
+
+    def game_at(self, pos):
+        """(seed, Sieger-Sitz oder None, Spieler, Decks, Zug-Bytes)."""
+        seed, winner, players, decks, n = HEAD.unpack_from(self.data, pos)
+        start = pos + HEAD.size
+        return seed, (None if winner < 0 else winner), players, decks, self.data[start:start + n]
+
+    def __getitem__(self, i):
+        if self.idx is None:
+            raise IndexError("kein Index (.idx) – nur sequentiell lesbar")
+        if i < 0:
+            i += len(self)
+        return self.game_at(OFFSET.unpack_from(self.idx, i * OFFSET.size)[0])
+
+    def __iter__(self):
+        for pos in self.offsets():
+            yield self.game_at(pos)
+
+    def replay(self, i):
+        """Partie i als vollständigen engine-Zustand nachspielen."""
+        seed, _, players, decks, body = self[i]
+        return replay(seed, decode_moves(body), [f"Bot {p}" for p in range(players)], {"decks": decks})
+
+    def close(self):
+        self.data.close()
+        if self.idx is not None:
+            self.idx.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------- CLI ----------
+def write_games(path, n, seed, players=3, play_drawn=True, decks=1):
+    """n Bot-Partien spielen und anhängen; Partie g bekommt den Seed seed * 2**32 + g."""
+    names = [f"Bot {p}" for p in range(players)]
+    with RecordWriter(path) as w:
+        for g in range(n):
+            state = {"decks": decks, "quiet": True}  # nur die Zugliste zählt
+            start_game(state, names, seed=(seed << 32) + g)
+            play_headless(state, play_drawn)
+            w.write_state(state)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mau-Mau Partie-Records (.mmr)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    w = sub.add_parser("write", help="Bot-Partien simulieren und anhängen")
+    w.add_argument("path")
+    w.add_argument("-n", "--games", type=int, default=100_000)
+    w.add_argument("--seed", type=int, default=0)
+    w.add_argument("--players", type=int, default=3)
+    w.add_argument("--decks", type=int, default=1)
+    w.add_argument("--no-play-drawn", action="store_true")
+    sub.add_parser("info", help="Zahl der Partien, Größe, Sieger").add_argument("path")
+    s = sub.add_parser("show", help="eine Partie nachspielen und ausgeben")
+    s.add_argument("path")
+    s.add_argument("index", type=int)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "write":
+        t = time.perf_counter()
+        write_games(args.path, args.games, args.seed, args.players, not args.no_play_drawn, args.decks)
+        dt = time.perf_counter() - t
+        print(f"{args.games} Partien in {dt:.1f}s ({args.games / dt:,.0f}/s) → {args.path}",
+              file=sys.stderr)
+        return
+    with RecordReader(args.path) as r:
+        if args.cmd == "info":
+            t = time.perf_counter()
+            wins, n, moves = {}, 0, 0
+            for _, winner, _, _, body in r:
+                wins[winner] = wins.get(winner, 0) + 1
+                n += 1
+                moves += len(body)
+            dt = time.perf_counter() - t
+            size = os.path.getsize(args.path)
+            print(f"{n} Partien, {size / 1e6:.1f} MB ({size / max(n, 1):.0f} B/Partie), "
+                  f"Ø {moves / max(n, 1):.1f} Züge, gelesen in {dt:.2f}s")
+            print("Sieger:", ", ".join(f"{'Patt' if k is None else f'Sitz {k}'} {v / n:.2%}"
+                                       for k, v in sorted(wins.items(), key=lambda kv: (kv[0] is None, kv[0]))))
+        else:
+            state = r.replay(args.index)
+            print(f"Seed {state['seed']} · Sieger {state['winner']}")
+            for speaker, msg, *_ in reversed(list(history(state))):
+                print(f"  {speaker}: {msg}")
+
+
+if __name__ == "__main__":
+    main()
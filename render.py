@@ -0,0 +1,155 @@
+"""HTML-Bausteine der Front-ends — ohne Streamlit-Import.
+
+Reine String-Funktionen, damit bench.py das Rendern messen kann, ohne eine
+Streamlit-Session zu starten. Karten kommen als IDs (engine.CARDS) herein;
+ihr HTML ist vorberechnet und braucht CARD_CSS auf der Seite (css_html()).
+Auch die Verlaufstexte und Sprüche entstehen erst hier (event_line, quip).
+"""
+import html
+import zlib
+
+from engine import CARDS, CARD_STR, STALEMATE_REPEAT, STALEMATE_STALL
+
+# ---------- Verlauf & Sprüche ----------
+QUIPS = {
+    "play": ["Taktische Eleganz.", "Nur Statistik.", "Kalkuliert. Irgendwie.",
+             "Elegant wie ein Presslufthammer 😎",
+             "Hoffentlich war das nicht dein Lieblingsanzug."],
+    "draw": ["Sammelkartenmodus.", "Ich liebe Überraschungen 🎁",
+             "Nur eine — was soll schiefgehen?", "Deck, enttäusch mich nicht!"],
+    "skip": ["Nur kurz raus.", "Kein Timing, ehrlich.",
+             "Ups, da fliegt jemand aus der Runde. Nur kurz!"],
+    "wish": ["Ich wünsche mir … genau das.", "Wunsch frei, Realität folgt."],
+}
+STALEMATE_TEXT = {STALEMATE_REPEAT: "Stellung wiederholt sich", STALEMATE_STALL: "kein Fortschritt"}
+
+def event_line(players, ev):
+    """Ereignis (engine.event) → (Sprecher, Text, Karte, Wunschfarbe)."""
+    kind, seat, card, n, suit = ev
+    who = players[seat] if seat >= 0 else "System"
+    if kind == "play":
+        return who, f"legt {CARD_STR[card]}", card, None
+    if kind == "draw":
+        return who, f"zieht {n}" if n else "kann nicht ziehen", None, None
+    if kind == "wish":
+        return who, "wünscht", None, suit
+    if kind == "skip":
+        return "System", f"{players[n]} aussetzen", None, None
+    if kind == "start":
+        return "System", f"Start {CARD_STR[card]}", card, None
+    if kind == "reshuffle":
+        return "System", "Ziehstapel gemischt", None, None
+    return "System", f"Patt: {STALEMATE_TEXT[n]}", None, None
+
+def quip(seed, action, number):
+    """Spruch zu Ereignis number — fest je (Seed, Nummer), also bei jedem Rerun derselbe."""
+    options = QUIPS[action]
+    return options[zlib.crc32(f"{seed}:{number}".encode()) % len(options)]
+
+def quip_action(ev):
+    """Welche Spruch-Art ein Ereignis auslöst (None = keine)."""
+    kind, _, _, n, _ = ev
+    if kind == "draw":
+        return "draw" if n else None
+    return kind if kind in ("play", "skip", "wish") else None
+
+def history(state, quips=False):
+    """Verlauf neueste zuerst als (Sprecher, Text, Karte, Wunschfarbe); quips=True
+    schiebt nach jedem Zug den Spruch des Spielers ein (wie früher quips_in_log)."""
+    players, seed, entries = state["players"], state["seed"], state["log"]
+    first = state["events"] - len(entries)  # Nummer des ältesten Eintrags
+    for i in range(len(entries) - 1, -1, -1):
+        ev = entries[i]
+        action = quips and quip_action(ev)
+        if action:
+            yield players[ev[1]], quip(seed, action, first + i), None, None
+        yield event_line(players, ev)
+
+def last_quip(state, player):
+    """Spruch zur letzten Aktion des Spielers (Spielerfeld in mau-mau.py)."""
+    la = state["last_action"].get(player)
+    return quip(state["seed"], la[1], la[2]) if la and la[1] else None
+
+# ---------- Farben ----------
+def emoji_suit(s):
+    # Für Darstellung: Herz/Karo rot (Emoji), Pik/Kreuz schwarz
+    return {"♥": "♥️", "♦": "♦️", "♠": "♠", "♣": "♣"}[s]
+
+def suit_color(s):
+    return "#d00" if s in ("♥", "♦") else "#111"
+
+
+# ---------- Karten-HTML (einmal pro Prozess) ----------
+# Gemeinsame CSS-Klassen statt Inline-Styles; jede Karte in jeder Größe wird
+# beim Import genau einmal gebaut. Die Seite bindet CARD_CSS einmal pro
+# Rerun ein (css_html()), danach ist eine Karte nur noch ein kurzes <div>.
+SIZES = {  # Größe: (Padding, Schrift, Rahmen)
+    "sm": ("8px 12px", "1.05rem", "2px"),
+    "md": ("12px 16px", "1.25rem", "3px"),
+    "lg": ("16px 22px", "1.5rem", "4px"),
+    "xl": ("26px 34px", "1.95rem", "5px"),
+}
+CARD_CSS = "".join([
+    ".mm-card{display:inline-block;margin:6px 6px 10px 0;border-style:solid;border-radius:16px;"
+    "font-weight:900;letter-spacing:.2px;"
+    "font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Helvetica,Arial;"
+    "background:#fff;box-shadow:0 2px 6px rgba(0,0,0,.12);user-select:none}",
+    *(f".mm-{k}{{padding:{p};font-size:{f};border-width:{b}}}" for k, (p, f, b) in SIZES.items()),
+    # maumau.py: kleinere Chips
+    ".mm-chip{display:inline-block;padding:6px 10px;margin:4px;border:2px solid;border-radius:10px;"
+    "font-weight:700;font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Helvetica,Arial;"
+    "background:#fff;box-shadow:0 1px 2px rgba(0,0,0,.06);user-select:none}",
+    ".mm-red{color:#d00;border-color:#d00}.mm-black{color:#111;border-color:#111}",
+])
+
+def _card_div(card, cls):
+    r, s = CARDS[card]
+    tone = "mm-red" if s in ("♥", "♦") else "mm-black"
+    return f'<div class="{cls} {tone}">{html.escape(r)}{emoji_suit(s)}</div>'
+
+CARD_HTML = {size: [_card_div(c, f"mm-card mm-{size}") for c in range(32)] for size in SIZES}
+CHIP_HTML = [_card_div(c, "mm-chip") for c in range(32)]
+
+def css_html():
+    return f"<style>{CARD_CSS}</style>"
+
+def hand_html(cards, size="sm"):
+    """Mehrere Karten als EIN HTML-Block (ein st.markdown statt eines pro Karte)."""
+    row = CHIP_HTML if size == "chip" else CARD_HTML[size]
+    return "<div>" + "".join(row[c] for c in cards) + "</div>"
+
+
+# ---------- mau-mau.py ----------
+def card_html(card, size="md"):
+    return CARD_HTML[size][card]
+
+def suit_badge_html(s):
+    col = suit_color(s)
+    return f"<span style='border:2px solid {col};color:{col};padding:2px 10px;border-radius:10px;font-weight:900;background:#fff;margin-left:8px'>{emoji_suit(s)}</span>"
+
+def log_entry_html(speaker, msg, badge, bg, bd):
+    """Eine Verlaufszeile (farbig je Spieler), badge = fertiges HTML oder ""."""
+    line = f"{html.escape(speaker)}: {html.escape(msg)}"
+    return f"<div style='border:3px solid {bd};border-radius:14px;padding:10px 12px;margin-bottom:10px;background:{bg};font-size:1.15rem'>{line}{badge}</div>"
+
+
+# ---------- maumau.py ----------
+def chip_html(card):
+    """Gerahmte Card-UI mit Farbe (♥/♦ rot, ♣/♠ schwarz)."""
+    return CHIP_HTML[card]
+
+def bubble_html(speaker, line, wish_tag=""):
+    """Kleine Sprechblasen-Optik für den Spielverlauf."""
+    bubble_bg = "#f6f6f6" if speaker in ("System",) else "#fff"
+    speaker_tag = f"<strong>{speaker}:</strong> " if speaker not in ("System",) else ""
+    return f"""
+            <div style="
+                border:1px solid #e6e6e6;
+                border-radius:12px;
+                padding:8px 10px;
+                margin-bottom:8px;
+                background:{bubble_bg};
+                ">
+                {speaker_tag}{line}{wish_tag}
+            </div>
+            """
@@ -0,0 +1,174 @@
+"""Mau-Mau-Tischserver: viele Tische in einem asyncio-Prozess.
+
+Jeder Tisch ist ein engine-Zustand mit einem Menschen-Sitz (engine.HUMAN)
+und Bots; die Bots ziehen serverseitig sofort nach jedem Menschen-Zug. Das
+Protokoll ist JSON pro Zeile über TCP, eine Antwort pro Anfrage:
+
+    {"op": "join"}                              → neuer Tisch, Antwort mit "table"
+    {"op": "play", "table": 7, "card": 12}      Karte legen (ID wie engine.CARDS)
+    {"op": "wish", "table": 7, "suit": 2}       nach eigenem Buben
+    {"op": "draw", "table": 7}                  eine Karte ziehen
+    {"op": "take", "table": 7}                  +2-Strafkarten aufnehmen
+    {"op": "new" | "state" | "leave", "table": 7}
+    {"op": "stats"}                             Tische, Züge, CPU-Zeit
+
+Antwort auf Tisch-Anfragen ist die Sicht des Menschen (view()); Fehler als
+{"error": "..."}. Ein Prozess nutzt einen Kern — für mehr Kerne mehrere
+Server auf verschiedenen Ports starten (loadgen.py misst Tische pro Kern).
+
+    python server.py --port 8765
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+from engine import (
+    HUMAN, SUITS, start_game, current_player, hand_size, playable_mask,
+    must_take_pending, run_bots_until_human,
+    human_play, human_wish, human_take_pending, human_draw,
+)
+
+BOTS = ["Bot 1", "Bot 2"]
+TABLE_LOG = 16  # Server braucht keinen langen Verlauf → wenig Speicher pro Tisch
+
+
+class GameServer:
+    def __init__(self, bots=BOTS, log_limit=TABLE_LOG, decks=1):
+        self.players = [HUMAN, *bots]
+        self.log_limit = log_limit
+        self.decks = decks
+        self.tables = {}
+        self.ids = itertools.count(1)
+        self.moves = 0
+        self.t0 = time.perf_counter()
+        self.cpu0 = time.process_time()
+
+    # ---------- Tische ----------
+    def new_game(self, state):
+        start_game(state, self.players)
+        run_bots_until_human(state)  # falls die Bots schon vor dir dran sind
+
+    def join(self):
+        tid = next(self.ids)
+        state = self.tables[tid] = {"log_limit": self.log_limit, "decks": self.decks}
+        self.new_game(state)
+        return tid
+
+    def view(self, tid):
+        state = self.tables[tid]
+        mine = current_player(state) == HUMAN and not state["game_over"]
+        return {
+            "table": tid,
+            "hand": state["hands"][HUMAN],  # Bitmaske, Karte c = Bit c (+32·k für die k+1-te Kopie)
+            "playable": playable_mask(state, HUMAN) if mine else 0,
+            "top": state["discards"][-1],
+            "wished": state["wished_suit"],
+            "pending": state["pending_draw"],
+            "current": state["current"],
+            "sizes": [hand_size(state, p) for p in state["players"]],
+            "awaiting_wish": state["awaiting_wish"],
+            "must_take": mine and must_take_pending(state, HUMAN),
+            "game_over": state["game_over"],
+            "winner": state["winner"],
+        }
+
+    # ---------- Züge ----------
+    def move(self, tid, op, msg):
+        """Menschen-Zug prüfen und ausführen, danach Bots bis zum nächsten Menschen-Zug."""
+        state = self.tables[tid]
+        if state["game_over"]:
+            raise ValueError("Spiel ist vorbei")
+        if current_player(state) != HUMAN:
+            raise ValueError("nicht am Zug")
+        if state["awaiting_wish"] != (op == "wish"):
+            raise ValueError("erst Wunschfarbe wählen" if state["awaiting_wish"] else "kein Wunsch offen")
+
+        if op == "play":
+            card = int(msg["card"])
+            if not 0 <= card < 32 or not playable_mask(state, HUMAN) >> card & 1:
+                raise ValueError("Karte nicht spielbar")
+            human_play(state, card)
+        elif op == "wish":
+            suit = int(msg["suit"])
+            if not 0 <= suit < len(SUITS):
+                raise ValueError("unbekannte Farbe")
+            human_wish(state, suit)
+        elif op == "take":
+            if not state["pending_draw"]:
+                raise ValueError("nichts aufzunehmen")
+            human_take_pending(state)
+        else:  # draw
+            if state["pending_draw"]:
+                raise ValueError("erst Strafkarten aufnehmen oder 7 legen")
+            human_draw(state)
+        self.moves += 1
+        if not state["game_over"] and not state["awaiting_wish"]:
+            run_bots_until_human(state)
+
+    def handle(self, msg):
+        op = msg.get("op")
+        if op == "join":
+            return self.view(self.join())
+        if op == "stats":
+            return {"tables": len(self.tables), "moves": self.moves,
+                    "cpu_s": round(time.process_time() - self.cpu0, 4),
+                    "wall_s": round(time.perf_counter() - self.t0, 4)}
+        tid = msg.get("table")
+        if tid not in self.tables:
+            raise ValueError("unbekannter Tisch")
+        if op == "leave":
+            del self.tables[tid]
+            return {"table": tid, "left": True}
+        if op == "new":
+            self.new_game(self.tables[tid])
+        elif op in ("play", "wish", "draw", "take"):
+            self.move(tid, op, msg)
+        elif op != "state":
+            raise ValueError(f"unbekannte op: {op}")
+        return self.view(tid)
+
+    # ---------- Netzwerk ----------
+    async def client(self, reader, writer):
+        """Eine Verbindung: Zeile lesen, Antwort schreiben. Tische überleben die Verbindung."""
+        try:
+            while line := await reader.readline():
+                try:
+                    msg = json.loads(line)
+                    reply = self.handle(msg)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    reply = {"error": str(e) or type(e).__name__}
+                writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+                if writer.transport.get_write_buffer_size() > 1 << 16:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.client, host, port, limit=1 << 16)
+        print(f"Mau-Mau-Server auf {host}:{port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mau-Mau Tischserver (asyncio, JSON-Zeilen über TCP)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--bots", type=int, default=len(BOTS), help="Bots pro Tisch")
+    ap.add_argument("--decks", type=int, default=1)
+    args = ap.parse_args(argv)
+    server = GameServer([f"Bot {i + 1}" for i in range(args.bots)], decks=args.decks)
+    server.join()  # ungültige Tischgröße sofort melden
+    server.tables.clear()
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
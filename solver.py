@@ -0,0 +1,289 @@
+"""Exakter Endspiel-Löser: Max-n-Suche mit Transpositionstabelle.
+
+Sind nur noch wenige Karten auf den Händen, lässt sich die Partie bei
+bekannter Reihenfolge des Ziehstapels vollständig durchrechnen. Jeder Spieler
+maximiert seinen eigenen Wert (Sieg 1, sonst 0). Züge wie engine.bot_turn:
+Karte legen (Bube je Wunschfarbe), eine Karte ziehen (mit play_drawn wird
+eine passende gezogene Karte sofort gelegt) oder +2-Strafkarten nehmen.
+
+Grenzen des Modells:
+  * Neumischen (Stapel leer, Ablage > 1 Karte) ist Zufall → Horizont, geschätzt
+    nach Kartenzahl (Anteil 1/Karten).
+  * Können alle nur noch passen (nichts zu ziehen, nichts zu legen) → Patt, 0 für alle.
+
+Stellungen werden kanonisch abgelegt: Hände ab dem Spieler am Zug rotiert,
+Ablage nur als legal_key (oberste Karte bzw. Wunschfarbe), Werte relativ zum
+Spieler am Zug. Die Tabelle TT gilt für den ganzen Prozess und wird über
+Partien hinweg wiederverwendet; der Schlüssel enthält daher auch den Rest des
+Ziehstapels und play_drawn. Nach jeder Lösung fliegen die am längsten nicht
+getroffenen Einträge raus, bis höchstens TT_LIMIT übrig sind (LRU). Lösungen
+laufen nacheinander (_lock), Streamlit-Sessions teilen sich die Tabelle.
+
+Bots sehen fremde Hände nicht: endgame_choice löst SAMPLES zufällige
+Verteilungen der unbekannten Karten (ismcts.determinize) und nimmt den Zug
+mit dem besten Mittelwert. Beim Import registriert sich der Löser als
+engine.ENDGAME; Bots nutzen ihn, wenn state["endgame"] gesetzt ist (True oder
+Menge von Spielern) und höchstens ENDGAME_CARDS Karten auf den Händen sind.
+Die Apps setzen es für alle Bots; der Tipp für den Menschen (hint) ist optional.
+
+    python solver.py --games 300 --cards 8     # Löse-Rate, Knoten/s, Stärke
+"""
+import argparse
+import math
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import engine
+from engine import (
+    RJ, R7, R8, PLAY_MASK, SUITS, rank_of, iter_cards, add_card, remove_card,
+    legal_key, card_str, current_player, start_game, pending_playable,
+)
+from ismcts import determinize, apply_action, heuristic_action
+
+ENDGAME_CARDS = 8    # höchstens so viele Karten auf allen Händen zusammen
+NODE_LIMIT = 20_000  # Knoten pro Lösung, sonst Abbruch (→ normale Bot-Logik)
+SAMPLES = 6          # Verteilungen der unbekannten Karten pro Bot-Zug
+MARGIN = 0.1         # so viel Siegchance muss ein Zug mehr bringen als der Heuristik-Zug
+TT_LIMIT = 200_000   # Einträge (je einige 100 Byte) — bleibt im Server-Prozess
+
+TT = OrderedDict()
+_lock = threading.Lock()
+STATS = {"attempts": 0, "solved": 0, "nodes": 0, "hits": 0, "secs": 0.0}
+
+
+class _Budget(Exception):
+    pass
+
+
+# ---------- Suche ----------
+class Solver:
+    """Eine Lösung über einem festen Ziehstapel (pile[-1] wird zuerst gezogen)."""
+
+    def __init__(self, pile, n, play_drawn=True, node_limit=NODE_LIMIT):
+        self.pile, self.n, self.play_drawn = tuple(pile), n, play_drawn
+        self.limit, self.nodes, self.hits = node_limit, 0, 0
+        self.win = (1.0,) + (0.0,) * (n - 1)
+        self.stalemate = (0.0,) * n
+
+    def actions(self, hand, key, pending):
+        pm = pending_playable(hand & PLAY_MASK[key], pending)
+        if pending:
+            return [("play", c, None) for c in iter_cards(pm)] + [("take",)]
+        acts = []
+        for c in iter_cards(pm):
+            if rank_of(c) == RJ:
+                acts.extend(("play", c, s) for s in range(4))
+            else:
+                acts.append(("play", c, None))
+        acts.append(("draw",))
+        return acts
+
+    def turn(self, hands, plen, key, pending, passes, deep):
+        """Wert einer Stellung zu Zugbeginn (Tupel, Index 0 = Spieler am Zug)."""
+        tkey = (hands, self.pile[:plen], key, pending, passes, deep, self.play_drawn)
+        v = TT.get(tkey)
+        if v is not None:
+            TT.move_to_end(tkey)
+            self.hits += 1
+            return v
+        self.nodes += 1
+        if self.nodes > self.limit:
+            raise _Budget
+        best = None
+        for a in self.actions(hands[0], key, pending):  # Legen vor Ziehen: Siege zuerst
+            v = self.value(hands, plen, key, pending, passes, deep, a)
+            if best is None or v[0] > best[0] or v[0] == best[0] and max(v[1:]) < max(best[1:]):
+                best = v  # Gleichstand: stärksten Gegner klein halten
+                if v[0] >= 1.0:  # sicherer Sieg, besser geht es nicht
+                    break
+        TT[tkey] = v = best
+        return v
+
+    def value(self, hands, plen, key, pending, passes, deep, action):
+        kind = action[0]
+        if kind == "play":
+            return self.play(hands, hands[0], plen, pending, action[1], action[2])
+        if kind == "take":
+            if plen < pending and deep:
+                return self.horizon(hands)
+            hand, k = hands[0], min(pending, plen)
+            for i in range(k):
+                hand = add_card(hand, self.pile[plen - 1 - i])
+            return self.end((hand,) + hands[1:], plen - k, key, 0, 0, deep, 1)
+        if not plen:  # ziehen mit leerem Stapel
+            if deep:
+                return self.horizon(hands)
+            if passes + 1 >= self.n:
+                return self.stalemate
+            return self.end(hands, 0, key, 0, passes + 1, deep, 1)
+        c = self.pile[plen - 1]
+        hand = add_card(hands[0], c)
+        if self.play_drawn and PLAY_MASK[key] >> c & 1:
+            if rank_of(c) == RJ:
+                return max((self.play(hands, hand, plen - 1, 0, c, s) for s in range(4)), key=lambda v: v[0])
+            return self.play(hands, hand, plen - 1, 0, c, None)
+        return self.end((hand,) + hands[1:], plen - 1, key, 0, 0, deep, 1)
+
+    def play(self, hands, hand, plen, pending, card, wish):
+        hand = remove_card(hand, card)
+        if not hand:
+            return self.win
+        hands = (hand,) + hands[1:]
+        rank = rank_of(card)
+        if rank == RJ:
+            return self.end(hands, plen, 32 + wish, pending, 0, True, 1)
+        return self.end(hands, plen, card, pending + 2 if rank == R7 else pending, 0, True, 2 if rank == R8 else 1)
+
+    def horizon(self, hands):
+        """Neumischen: Siegchancen grob nach Kartenzahl (weniger Karten → besser)."""
+        w = [1 / h.bit_count() for h in hands]
+        total = sum(w)
+        return tuple(x / total for x in w)
+
+    def end(self, hands, plen, key, pending, passes, deep, offset):
+        """Zugende: nächster Spieler (offset 2 = Aussetzen), Werte zurückrotieren."""
+        k = offset % self.n
+        v = self.turn(hands[k:] + hands[:k], plen, key, pending, passes, deep)
+        return v[-k:] + v[:-k] if k else v
+
+
+# ---------- Einstieg ----------
+def endgame_cards(state):
+    return sum(h.bit_count() for h in state["hands"].values())
+
+def solve(state, play_drawn=True, node_limit=NODE_LIMIT):
+    """Exakte Werte aller Züge des Spielers am Zug ({Zug: Siegwert}) oder None (Knotenlimit).
+
+    Nimmt den Zustand als vollständig bekannt an (Hände und Stapelreihenfolge)."""
+    players = state["players"]
+    i = state["current"]
+    hands = tuple(state["hands"][p] for p in players[i:] + players[:i])
+    key = legal_key(state["discards"][-1], state["wished_suit"])
+    deep = len(state["discards"]) > 1
+    s = Solver(state["draw_pile"], len(players), play_drawn, node_limit)
+    t = time.perf_counter()
+    with _lock:
+        STATS["attempts"] += 1
+        try:
+            result = {a: s.value(hands, len(s.pile), key, state["pending_draw"], 0, deep, a)[0]
+                      for a in s.actions(hands[0], key, state["pending_draw"])}
+        except _Budget:
+            result = None
+        while len(TT) > TT_LIMIT:
+            TT.popitem(last=False)
+    STATS["solved"] += result is not None
+    STATS["nodes"] += s.nodes
+    STATS["hits"] += s.hits
+    STATS["secs"] += time.perf_counter() - t
+    return result
+
+def endgame_choice(state, me, samples=SAMPLES, rng=random, play_drawn=True, node_limit=NODE_LIMIT):
+    """Bester Zug für me ohne Blick in fremde Karten: Mittel über samples Verteilungen.
+
+    Gibt (Zug, {Zug: geschätzte Siegchance}) zurück oder None, wenn eine Lösung zu groß wird."""
+    totals = {}
+    for _ in range(samples):
+        vals = solve(determinize(state, me, rng), play_drawn, node_limit)
+        if vals is None:
+            return None
+        for a, v in vals.items():
+            totals[a] = totals.get(a, 0.0) + v
+    means = {a: v / samples for a, v in totals.items()}
+    return max(means, key=means.get), means
+
+def endgame_turn(state, player, play_drawn=True):
+    """engine.ENDGAME-Haken: im Endspiel exakt ziehen. False → normale Bot-Logik."""
+    enabled = state.get("endgame")
+    if not (enabled is True or player in enabled) or endgame_cards(state) > ENDGAME_CARDS:
+        return False
+    res = endgame_choice(state, player, rng=state["bot_rng"], play_drawn=play_drawn)
+    if res is None:
+        return False
+    action, means = res
+    h = heuristic_action(state, player)
+    if means.get(h, 0.0) + MARGIN >= means[action]:
+        action = h  # Stichproben sind verrauscht: nur bei deutlichem Vorteil abweichen
+    apply_action(state, player, action, play_drawn)  # gezogener Bube: Wunsch per Heuristik
+    return True
+
+engine.ENDGAME = endgame_turn
+
+def action_str(action):
+    if action[0] == "take":
+        return "Strafkarten nehmen"
+    if action[0] == "draw":
+        return "eine Karte ziehen"
+    text = f"{card_str(action[1])} legen"
+    return text if action[2] is None else f"{text}, {SUITS[action[2]]} wünschen"
+
+def hint(state, player, play_drawn):
+    """Tipp-Text für den Menschen im Endspiel (ohne fremde Karten) oder None.
+    play_drawn wie bei den Bots der aufrufenden App."""
+    if state["game_over"] or current_player(state) != player or endgame_cards(state) > ENDGAME_CARDS:
+        return None
+    res = endgame_choice(state, player, rng=random.Random(f"{state['seed']}:{len(state['moves'])}"),
+                         play_drawn=play_drawn)
+    if res is None:
+        return None
+    action, means = res
+    return f"{action_str(action)} · Siegchance ≈ {means[action]:.0%}"
+
+def stats_line():
+    s = STATS
+    return (f"Löse-Rate {s['solved'] / max(s['attempts'], 1):.1%} von {s['attempts']:,} · "
+            f"{s['nodes'] / max(s['secs'], 1e-9):,.0f} Knoten/s · TT {len(TT):,} Einträge, "
+            f"{s['hits'] / max(s['hits'] + s['nodes'], 1):.0%} Treffer")
+
+
+# ---------- CLI ----------
+def measure(games, seed, cards, node_limit, players=3):
+    """Heuristik-Partien; in jeder Endspielstellung exakt lösen (volle Information)."""
+    names = [f"Bot {i}" for i in range(players)]
+    for g in range(games):
+        state = {"quiet": True}
+        start_game(state, names, seed=f"{seed}:{g}")
+        while not state["game_over"]:
+            if endgame_cards(state) <= cards:
+                solve(state, True, node_limit)
+            engine.bot_turn(state, current_player(state))
+
+def strength(games, seed, players=3):
+    """Gepaarte Partien: Sitz g % players mit Endspiel-Löser gegen dieselbe Partie ohne."""
+    names = [f"Bot {i}" for i in range(players)]
+    wins = base = 0
+    for g in range(games):
+        seat = names[g % players]
+        for eg in ({seat}, None):
+            state = {"endgame": eg, "quiet": True}
+            start_game(state, names, seed=f"{seed}:{g}")
+            while not state["game_over"]:
+                engine.bot_turn(state, current_player(state))
+            if eg:
+                wins += state["winner"] == seat
+            else:
+                base += state["winner"] == seat
+    return wins / games, base / games
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Exakter Mau-Mau-Endspiel-Löser")
+    ap.add_argument("--games", type=int, default=300)
+    ap.add_argument("--cards", type=int, default=ENDGAME_CARDS, help="Karten auf allen Händen höchstens")
+    ap.add_argument("--limit", type=int, default=NODE_LIMIT, help="Knoten pro Lösung")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--strength", type=int, default=0, metavar="N", help="N gepaarte Partien gegen die Heuristik")
+    args = ap.parse_args(argv)
+
+    t = time.perf_counter()
+    measure(args.games, args.seed, args.cards, args.limit)
+    print(f"{args.games} Partien in {time.perf_counter() - t:.1f}s · {stats_line()}")
+    if args.strength:
+        w, b = strength(args.strength, args.seed)
+        se = math.sqrt(max(w * (1 - w), 1e-9) / args.strength)
+        print(f"Mit Löser {w:.1%} ± {1.96 * se:.1%} · dieselben Partien ohne {b:.1%}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
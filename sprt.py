@@ -0,0 +1,144 @@
+"""Sequenzieller Strategie-Vergleich: gepaarte Partien, Elo mit Konfidenzintervall, SPRT.
+
+Zwei Strategien spielen Kopf an Kopf (2 Spieler). Jedes Paar besteht aus
+zwei Partien mit demselben Seed (gleiches Geben, gleicher Stapel), einmal
+beginnt A, einmal B — Kartenglück und Anzugsvorteil heben sich weitgehend auf.
+Ein Paar zählt für A 0, ¼, ½, ¾ oder 1 (Sieg 1, Patt ½, je Partie halbiert).
+
+Nach jedem Block wird der Test (GSPRT auf den Paar-Werten, logistisches
+Elo-Modell) ausgewertet: H0 "A ist höchstens elo0 besser" gegen H1 "A ist
+mindestens elo1 besser". Sobald das Log-Likelihood-Verhältnis eine der
+Schranken log(β/(1-α)) bzw. log((1-β)/α) überschreitet, wird abgebrochen.
+Angenommenes H1 heißt: die Daten sprechen eher für elo1 als für elo0 — wie
+groß der Vorsprung ist, sagt die Elo-Schätzung mit Intervall daneben.
+
+    python sprt.py heuristic eights_first
+    python sprt.py heuristic:random heuristic --elo0 0 --elo1 10 --max-pairs 200000
+
+Strategien = "score[:wunsch]" wie in tournament.py.
+"""
+import argparse
+import math
+import multiprocessing as mp
+import os
+import sys
+import time
+
+from engine import start_game, strategy, play_headless
+
+PLAYERS = ["Bot 0", "Bot 1"]
+
+
+def play_pairs(task):
+    """Block von Paaren im Worker → (Paare, Summe, Quadratsumme, Pentanomial-Zählung)."""
+    start, n, a, b, seed, play_drawn = task
+    total = squares = 0.0
+    penta = [0] * 5
+    for g in range(start, start + n):
+        score = 0.0
+        for seat in (0, 1):  # gleiches Geben, A einmal vorne, einmal hinten
+            state = {"bots": dict(zip(PLAYERS, (a, b) if seat == 0 else (b, a))), "quiet": True}
+            start_game(state, PLAYERS, seed=f"{seed}:{g}")
+            play_headless(state, play_drawn)
+            score += 0.5 if state["winner"] is None else state["winner"] == PLAYERS[seat]
+        score /= 2
+        total += score
+        squares += score * score
+        penta[int(score * 4)] += 1
+    return n, total, squares, penta
+
+
+# ---------- Statistik ----------
+def elo_to_score(elo):
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def score_to_elo(score):
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+class Sprt:
+    """Laufende Summen und GSPRT (Näherung für Paar-Werte, wie bei Schach-Engine-Tests)."""
+
+    def __init__(self, elo0, elo1, alpha, beta):
+        self.s0, self.s1 = elo_to_score(elo0), elo_to_score(elo1)
+        self.lower, self.upper = math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+        self.n = 0
+        self.total = self.squares = 0.0
+        self.penta = [0] * 5
+
+    def add(self, n, total, squares, penta):
+        self.n += n
+        self.total += total
+        self.squares += squares
+        self.penta = [x + y for x, y in zip(self.penta, penta)]
+
+    def mean(self):
+        return self.total / max(self.n, 1)
+
+    def var(self):
+        m = self.mean()
+        return max(self.squares / max(self.n, 1) - m * m, 1e-9)
+
+    def llr(self):
+        if self.n < 2:
+            return 0.0
+        return self.n * (self.s1 - self.s0) * (2 * self.mean() - self.s0 - self.s1) / (2 * self.var())
+
+    def elo(self, z=1.96):
+        """(Elo, untere, obere Grenze) aus dem Paar-Mittel ± z Standardfehler."""
+        m, se = self.mean(), math.sqrt(self.var() / max(self.n, 1))
+        return score_to_elo(m), score_to_elo(m - z * se), score_to_elo(m + z * se)
+
+    def decision(self):
+        llr = self.llr()
+        return "H1" if llr >= self.upper else "H0" if llr <= self.lower else None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mau-Mau: zwei Bot-Strategien per SPRT vergleichen")
+    ap.add_argument("a", help="Kandidat, z. B. eights_first oder heuristic:random")
+    ap.add_argument("b", help="Referenz")
+    ap.add_argument("--elo0", type=float, default=0.0, help="H0: A höchstens so viel besser")
+    ap.add_argument("--elo1", type=float, default=20.0, help="H1: A mindestens so viel besser")
+    ap.add_argument("--alpha", type=float, default=0.05)
+    ap.add_argument("--beta", type=float, default=0.05)
+    ap.add_argument("--max-pairs", type=int, default=100_000, help="spätestens hier aufhören")
+    ap.add_argument("--chunk", type=int, default=200, help="Paare pro Worker-Auftrag (Testintervall)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--no-play-drawn", action="store_true",
+                    help="gezogene Karte nicht sofort legen (wie mau-mau.py)")
+    args = ap.parse_args(argv)
+    for s in (args.a, args.b):
+        strategy(s)  # unbekannte Namen früh melden
+
+    tasks = [(start, min(args.chunk, args.max_pairs - start), args.a, args.b, args.seed, not args.no_play_drawn)
+             for start in range(0, args.max_pairs, args.chunk)]
+    test = Sprt(args.elo0, args.elo1, args.alpha, args.beta)
+    t0 = time.perf_counter()
+    with mp.Pool(args.workers) as pool:  # Verlassen des with-Blocks beendet offene Aufträge
+        for result in pool.imap_unordered(play_pairs, tasks):
+            test.add(*result)
+            elo, lo, hi = test.elo()
+            print(f"\r{test.n:,} Paare · Elo {elo:+.1f} [{lo:+.1f}, {hi:+.1f}] · "
+                  f"LLR {test.llr():+.2f} ({test.lower:.2f}, {test.upper:.2f})",
+                  end="", file=sys.stderr, flush=True)
+            if test.decision():
+                break
+    print(file=sys.stderr)
+    dt = time.perf_counter() - t0
+    elo, lo, hi = test.elo()
+    # Annahme heißt nur: die Daten passen besser zu elo1 als zu elo0 (bzw. umgekehrt),
+    # nicht "A ist mindestens elo1 besser" — daher die Schätzung gleich daneben
+    verdict = {"H1": f"H1 angenommen ({args.elo1:+g} Elo gegenüber {args.elo0:+g} bevorzugt)",
+               "H0": f"H0 angenommen ({args.elo0:+g} Elo gegenüber {args.elo1:+g} bevorzugt)",
+               None: "unentschieden (max-pairs erreicht)"}[test.decision()]
+    print(f"{verdict} · {args.a} Elo {elo:+.1f} (95%: {lo:+.1f} … {hi:+.1f})")
+    print(f"  {test.n:,} Paare = {2 * test.n:,} Partien in {dt:.1f}s "
+          f"({test.n / args.max_pairs:.1%} von --max-pairs)")
+    print(f"  Punkte {test.mean():.2%} · Elo {elo:+.1f} (95%: {lo:+.1f} … {hi:+.1f}) · "
+          f"LLR {test.llr():+.2f} · Paare 0/¼/½/¾/1: {'/'.join(map(str, test.penta))}")
+
+
+if __name__ == "__main__":
+    main()
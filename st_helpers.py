@@ -0,0 +1,115 @@
+"""Streamlit-Hilfen für beide Front-ends: Rerun-/Fragment-Wrapper und Zeitmessung."""
+import functools
+import re
+import time
+import uuid
+
+import streamlit as st
+
+import profiler
+
+# st.fragment ab 1.37, davor st.experimental_fragment (1.33–1.36)
+_FRAGMENT = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+# --- Kompatibler Rerun-Wrapper (neu/alt Streamlit) ---
+def RERUN():
+    if hasattr(st, "rerun"):
+        st.rerun()
+    else:
+        st.experimental_rerun()
+
+
+def timed_fragment(name):
+    """Als Fragment ausführen (falls verfügbar) und die Laufzeit in ms merken.
+
+    Bricht ein Lauf per RERUN() ab, bleibt die Startzeit stehen: gemessen wird
+    dann die ganze Interaktion (Aktion + Neuzeichnen)."""
+    def deco(fn):
+        key = f"_t0_{name}"
+
+        pkey = f"_prof_{name}"
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            st.session_state.setdefault(key, time.perf_counter())
+            own = not profiler.active()  # Fragment-Rerun: eigene Messung, sonst zählt es zum App-Lauf
+            if own:
+                profiler.attach(st.session_state.setdefault(pkey, profiler.new()))
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                if own:
+                    profiler.attach(None)
+            _record(name, st.session_state.pop(key))
+            prof = st.session_state.pop(pkey, None)
+            if own:
+                _profiled(name, prof)
+            return result
+        return _FRAGMENT(run) if _FRAGMENT is not None else run
+    return deco
+
+
+def _record(name, t0):
+    st.session_state.setdefault("timings", {})[name] = (time.perf_counter() - t0) * 1000
+
+
+def _profiled(name, prof):
+    row = profiler.finish(prof, name)
+    if row:
+        st.session_state.setdefault("profile", {})[name] = row
+
+
+def timings_caption():
+    """Letzte Laufzeiten (App-Rerun gesamt und je Fragment) als Sidebar-Zeile."""
+    t = st.session_state.get("timings", {})
+    if t:
+        st.caption("Letzter Rerun: " + " · ".join(f"{k} {v:.0f} ms" for k, v in t.items()))
+    prof = st.session_state.get("profile")
+    if prof:
+        with st.expander("Profil (MAUMAU_PROFILE)"):
+            for row in prof.values():
+                st.caption("  \n".join(profiler.summary_lines(row)))
+
+
+def mark_run_start():
+    st.session_state.setdefault("_t0_App", time.perf_counter())
+    profiler.attach(st.session_state.setdefault("_prof_App", profiler.new()))
+
+
+def mark_run_end():
+    """Am Skriptende: Dauer des vollen App-Reruns (inkl. auslösender Aktion) festhalten."""
+    t0 = st.session_state.pop("_t0_App", None)
+    if t0 is not None:
+        _record("App", t0)
+    _profiled("App", st.session_state.pop("_prof_App", None))
+
+
+def session_id(persistent=False):
+    """Id für Archiv/Journal. persistent: aus der URL (?sid=…) bzw. dort hinterlegt,
+    damit Reload oder Server-Neustart dieselbe Partie wiederfinden."""
+    sid = st.query_params.get("sid", "") if persistent else ""
+    if not re.fullmatch(r"[0-9a-f]{32}", sid):  # landet im Dateinamen des Archivs
+        sid = uuid.uuid4().hex
+        if persistent:
+            st.query_params["sid"] = sid
+    return sid
+
+
+# ---------- Avatare ----------
+@st.cache_resource(show_spinner=False)
+def avatar_thumb(path, px=144):
+    """Bild einmal pro Prozess dekodieren und auf px (2× Anzeigegröße) verkleinern.
+
+    Gibt PNG-Bytes zurück (None, wenn die Datei fehlt). Gleiche Bytes → gleiche
+    Media-URL, der Browser lädt das Avatar also nur einmal."""
+    import io
+    from PIL import Image
+    try:
+        with Image.open(path) as im:
+            im.thumbnail((px, px), Image.LANCZOS)
+            buf = io.BytesIO()
+            im.save(buf, format="PNG", optimize=True)
+    except FileNotFoundError:
+        return None
+    return buf.getvalue()
@@ -0,0 +1,44 @@
+"""Regressionstests für die Engine (python -m pytest -q)."""
+import pytest
+
+from engine import RJ, rank_of, start_game, bot_turn, current_player, push_undo, undo, play_headless
+from records import RecordWriter, RecordReader
+
+
+def test_undo_in_a_row_trims_log_to_snapshot():
+    state = {}
+    start_game(state, ["Du", "Bot 1", "Bot 2"], seed=7)
+    marks = []
+    for _ in range(4):
+        push_undo(state)
+        marks.append((len(state["log"]), state["events"]))
+        for _ in range(2):  # ein Undo-Schritt über mehrere Züge, wie run_bots_until_human
+            bot_turn(state, current_player(state))
+    assert not state["game_over"]
+    while marks:
+        assert undo(state)
+        assert (len(state["log"]), state["events"]) == marks.pop()
+    assert not undo(state)
+
+
+def test_text_seed_round_trips_through_records(tmp_path):
+    state = {}
+    start_game(state, ["Bot 0", "Bot 1", "Bot 2"], seed="7:3")  # wie tournament/sprt
+    play_headless(state)
+    path = str(tmp_path / "g.mmr")
+    with RecordWriter(path) as w:
+        w.write_state(state)
+    with RecordReader(path) as r:
+        again = r.replay(0)
+    assert again["seed"] == state["seed"] and again["moves"] == state["moves"]
+    assert again["hands"] == state["hands"]
+
+
+def test_deal_always_leaves_a_non_jack_to_turn_up():
+    for seed in range(200, 300):  # 206, 213, 280, 298 hingen früher mit 6 Spielern
+        with pytest.raises(ValueError):
+            start_game({}, [f"Bot {i}" for i in range(6)], seed=seed)
+        state = {}
+        start_game(state, [f"Bot {i}" for i in range(5)], seed=seed)
+        assert rank_of(state["discards"][0]) != RJ
+    start_game({"decks": 2}, [f"Bot {i}" for i in range(6)], seed=206)
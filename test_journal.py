@@ -0,0 +1,27 @@
+"""Regressionstests für das Zug-Journal (python -m pytest -q)."""
+import journal
+from engine import start_game, bot_turn, current_player, push_undo, undo
+
+
+def test_sync_after_undo_matches_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "ENABLED", True)
+    monkeypatch.setattr(journal, "DB_PATH", str(tmp_path / "j.db"))
+    monkeypatch.setattr(journal, "_db", None)
+    state = {}
+    start_game(state, ["Du", "Bot 1", "Bot 2"], seed=32)
+    for _ in range(7):
+        push_undo(state)
+        bot_turn(state, current_player(state))
+    journal.sync(state, "s")
+    last = state["moves"][-1]
+    for _ in range(2):
+        assert undo(state)
+    for _ in range(2):  # andere Züge, gleich lang und mit demselben letzten Zug
+        push_undo(state)
+        bot_turn(state, current_player(state), play_drawn=False)
+    assert state["moves"][-1] == last
+    journal.sync(state, "s")
+    loaded = {}
+    assert journal.load("s", loaded)
+    assert loaded["moves"] == state["moves"]
+    assert loaded["hands"] == state["hands"] and loaded["draw_pile"] == state["draw_pile"]
@@ -0,0 +1,141 @@
+"""Headless-Turnier: M Partien zwischen Bot-Strategien auf allen CPU-Kernen.
+
+Die Worker (multiprocessing.Pool) bleiben für das ganze Turnier bestehen und
+spielen Partien in Blöcken (--chunk), damit der Prozess-Overhead bei kurzen
+Partien nicht dominiert. Pro fertigem Block wird eine Zeile als JSONL oder
+CSV geschrieben (Block- und Gesamtwerte); Fortschritt und Partien/s auf stderr.
+
+    python tournament.py -n 100000 --bots heuristic,eights_first,high_first:random
+    python tournament.py -n 1000000 --bots heuristic,jacks_early,heuristic --batch --format csv
+    python tournament.py -n 1000000 --bots linear:linear,heuristic,heuristic --batch
+
+Strategien = "score[:wunsch]" mit score aus engine.SCORES, wunsch aus engine.WISHES.
+"""
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+
+from engine import SCORES, WISHES, PLUGIN_STRATEGIES, start_game, strategy, play_headless
+
+
+def play_chunk(task):
+    """Ein Block Partien im Worker. Gibt nur Zählwerte zurück (klein zu pickeln)."""
+    chunk, start, n, bots, seed, play_drawn, batch, decks = task
+    if batch:
+        return play_chunk_batch(task)
+    players = [f"Bot {i}" for i in range(len(bots))]
+    wins = [0] * (len(bots) + 1)  # letzter Platz = Patt
+    turns = reshuffles = 0
+    for g in range(start, start + n):
+        state = {"bots": dict(zip(players, bots)), "decks": decks, "quiet": True}
+        start_game(state, players, seed=f"{seed}:{g}")  # Partie g unabhängig von Block/Worker
+        turns += play_headless(state, play_drawn)
+        reshuffles += state["reshuffles"]
+        wins[players.index(state["winner"]) if state["winner"] else -1] += 1
+    return chunk, n, wins, turns, reshuffles
+
+def play_chunk_batch(task):
+    """Wie play_chunk, aber mit batchsim (Score-Varianten und policy.py; Wunsch 'most' oder mit batch())."""
+    from batchsim import simulate
+    chunk, _, n, bots, seed, play_drawn, _, _ = task
+    res = simulate(n, seed=[seed, chunk], players=len(bots), play_drawn=play_drawn,
+                   orders=[strategy(b)[0] for b in bots], wishes=[strategy(b)[1] for b in bots])
+    wins = [int((res["winner"] == p).sum()) for p in range(len(bots))]
+    wins.append(int((res["winner"] < 0).sum()))
+    return chunk, n, wins, int(res["turns"].sum()), int(res["reshuffles"].sum())
+
+
+class Totals:
+    def __init__(self, seats):
+        self.games = self.turns = self.reshuffles = 0
+        self.wins = [0] * (seats + 1)
+
+    def add(self, n, wins, turns, reshuffles):
+        self.games += n
+        self.turns += turns
+        self.reshuffles += reshuffles
+        self.wins = [a + b for a, b in zip(self.wins, wins)]
+
+    def row(self, prefix):
+        g = max(self.games, 1)
+        row = {f"{prefix}games": self.games}
+        for i, w in enumerate(self.wins[:-1]):
+            row[f"{prefix}win_rate_{i}"] = round(w / g, 5)
+        row[f"{prefix}stalemate_rate"] = round(self.wins[-1] / g, 5)
+        row[f"{prefix}avg_turns"] = round(self.turns / g, 3)
+        row[f"{prefix}avg_reshuffles"] = round(self.reshuffles / g, 4)
+        return row
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mau-Mau Bot-Turnier (Multi-Prozess)")
+    ap.add_argument("-n", "--games", type=int, default=10_000)
+    ap.add_argument("--bots", default="heuristic,heuristic,heuristic",
+                    help="Strategie je Sitz, kommagetrennt (Sitz 0 beginnt)")
+    ap.add_argument("--chunk", type=int, default=500, help="Partien pro Worker-Auftrag")
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--decks", type=int, default=1, help="Decks à 32 Karten (große Tische)")
+    ap.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    ap.add_argument("-o", "--out", default="-", help="Ausgabedatei (Standard: stdout)")
+    ap.add_argument("--no-play-drawn", action="store_true",
+                    help="gezogene Karte nicht sofort legen (wie mau-mau.py)")
+    ap.add_argument("--batch", action="store_true",
+                    help="NumPy-Batchsimulator je Block (Wunsch nur 'most' oder 'linear')")
+    ap.add_argument("--list", action="store_true", help="verfügbare Strategien anzeigen")
+    args = ap.parse_args(argv)
+
+    if args.list:
+        print("score:", ", ".join(dict.fromkeys([*SCORES, *PLUGIN_STRATEGIES])))
+        print("wunsch:", ", ".join(dict.fromkeys([*WISHES, *PLUGIN_STRATEGIES])))
+        return
+    bots = args.bots.split(",")
+    if args.batch and args.decks != 1:
+        ap.error("--batch unterstützt nur ein Deck")
+    for b in bots:
+        wish = strategy(b)[1]  # unbekannte Namen früh melden
+        if args.batch and wish is not WISHES["most"] and not hasattr(wish, "batch"):
+            ap.error(f"--batch unterstützt nur Wunsch 'most' oder 'linear': {b}")
+
+    tasks = [(i, i * args.chunk, min(args.chunk, args.games - i * args.chunk), bots, args.seed,
+              not args.no_play_drawn, args.batch, args.decks)
+             for i in range((args.games + args.chunk - 1) // args.chunk)]
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="")
+    writer = None
+    total = Totals(len(bots))
+    t0 = time.perf_counter()
+    try:
+        with mp.Pool(args.workers) as pool:
+            for chunk, n, wins, turns, reshuffles in pool.imap_unordered(play_chunk, tasks):
+                block = Totals(len(bots))
+                block.add(n, wins, turns, reshuffles)
+                total.add(n, wins, turns, reshuffles)
+                dt = time.perf_counter() - t0
+                row = {"chunk": chunk, **block.row(""), **total.row("total_"),
+                       "games_per_sec": round(total.games / dt, 1)}
+                if args.format == "jsonl":
+                    out.write(json.dumps(row) + "\n")
+                else:
+                    if writer is None:
+                        writer = csv.DictWriter(out, fieldnames=list(row))
+                        writer.writeheader()
+                    writer.writerow(row)
+                out.flush()
+                print(f"\r{total.games}/{args.games} Partien · {total.games / dt:,.0f} Partien/s",
+                      end="", file=sys.stderr, flush=True)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(file=sys.stderr)
+    summary = total.row("")
+    print("  ".join(f"{b} (Sitz {i}): {summary[f'win_rate_{i}']:.2%}" for i, b in enumerate(bots)),
+          f"· Ø Züge {summary['avg_turns']:.1f} · Ø Mischen {summary['avg_reshuffles']:.2f}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()